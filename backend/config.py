@@ -1,23 +1,161 @@
 """MedInter Configuration."""
 
 import os
+from pathlib import Path
 
 
 # NVIDIA Riva endpoints
 RIVA_ASR_ENDPOINT = os.getenv("RIVA_ASR_ENDPOINT", "localhost:50051")
 RIVA_TTS_ENDPOINT = os.getenv("RIVA_TTS_ENDPOINT", "localhost:50051")
 
+# Max concurrent blocking Riva calls per service (each gets its own thread pool)
+RIVA_ASR_MAX_CONCURRENCY = int(os.getenv("RIVA_ASR_MAX_CONCURRENCY", "4"))
+RIVA_TTS_MAX_CONCURRENCY = int(os.getenv("RIVA_TTS_MAX_CONCURRENCY", "4"))
+
+# Riva gRPC channels per endpoint, shared by ASR and TTS and kept open with
+# HTTP/2 keep-alive pings every RIVA_KEEPALIVE_S seconds
+RIVA_CHANNEL_POOL_SIZE = int(os.getenv("RIVA_CHANNEL_POOL_SIZE", "2"))
+RIVA_KEEPALIVE_S = float(os.getenv("RIVA_KEEPALIVE_S", "30"))
+
+# Urgency-aware scheduling of the shared ASR / NIM / TTS capacity.
+# Routine work may use all but SCHEDULER_RESERVED_SLOTS slots per service;
+# every SCHEDULER_AGING_S seconds of waiting raises a request one class.
+NIM_MAX_CONCURRENCY = int(os.getenv("NIM_MAX_CONCURRENCY", "4"))
+SCHEDULER_RESERVED_SLOTS = int(os.getenv("SCHEDULER_RESERVED_SLOTS", "1"))
+SCHEDULER_AGING_S = float(os.getenv("SCHEDULER_AGING_S", "5"))
+
+# Streaming ASR: keep one Riva stream open per WebSocket (clients may also
+# opt in/out per connection with {"type": "config", "asr_mode": ...})
+ASR_STREAMING = os.getenv("ASR_STREAMING", "false").lower() in ("true", "1", "yes")
+
+# Per-connection pipeline: max pending items between ASR/translate/TTS stages
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "8"))
+
+# Flow control in front of ASR (see backlog.py): audio queued beyond
+# AUDIO_BUFFER_MAX_MS is dropped oldest first, and utterances that waited
+# longer than AUDIO_LAG_BUDGET_MS are merged with newer ones ("merge") or
+# dropped in favour of them ("drop"); the client gets a "lag" message
+AUDIO_LAG_BUDGET_MS = int(os.getenv("AUDIO_LAG_BUDGET_MS", "4000"))
+AUDIO_LAG_POLICY = os.getenv("AUDIO_LAG_POLICY", "merge")
+AUDIO_BUFFER_MAX_MS = int(os.getenv("AUDIO_BUFFER_MAX_MS", "30000"))
+
+# Server-side VAD endpointing for microphone audio
+VAD_ENABLED = os.getenv("VAD_ENABLED", "true").lower() in ("true", "1", "yes")
+VAD_FRAME_MS = int(os.getenv("VAD_FRAME_MS", "20"))
+VAD_ENERGY_THRESHOLD_DB = float(os.getenv("VAD_ENERGY_THRESHOLD_DB", "-45"))
+VAD_NOISE_MARGIN_DB = float(os.getenv("VAD_NOISE_MARGIN_DB", "10"))
+VAD_END_SILENCE_MS = int(os.getenv("VAD_END_SILENCE_MS", "600"))
+VAD_MIN_SPEECH_MS = int(os.getenv("VAD_MIN_SPEECH_MS", "200"))
+VAD_MAX_UTTERANCE_MS = int(os.getenv("VAD_MAX_UTTERANCE_MS", "15000"))
+VAD_PRE_ROLL_MS = int(os.getenv("VAD_PRE_ROLL_MS", "300"))
+
+# TTS: byte-bounded in-memory audio cache and optional startup warm-up.
+# Warm-up translates each phrase into every supported language, then
+# synthesizes it, so common provider prompts play with no TTS latency.
+TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+TTS_WARMUP = os.getenv("TTS_WARMUP", "false").lower() in ("true", "1", "yes")
+TTS_WARMUP_PHRASES = [
+    p.strip()
+    for p in os.getenv(
+        "TTS_WARMUP_PHRASES",
+        "Are you allergic to any medications?"
+        "|Where does it hurt?"
+        "|On a scale of 1 to 10, how bad is the pain?"
+        "|When did this start?"
+        "|Do you take any medications?"
+        "|Can you breathe normally?"
+        "|We are going to take you to the hospital."
+        "|Please stay still.",
+    ).split("|")
+    if p.strip()
+]
+
+# Compressed audio output for clients that negotiate Opus (see
+# audio_codec.py); needs an ffmpeg build with libopus, else μ-law is sent
+FFMPEG_PATH = os.getenv("FFMPEG_PATH", "ffmpeg")
+AUDIO_OPUS_BITRATE_KBPS = int(os.getenv("AUDIO_OPUS_BITRATE_KBPS", "24"))
+
+# Phrasebook: curated pre-translated intake phrases that bypass the LLM.
+# Typed text matches a phrase exactly or by token-set similarity >= threshold;
+# a close match must still contain every typed word (fillers aside) and any
+# typed negation, otherwise the text goes to the LLM.
+PHRASEBOOK_ENABLED = os.getenv("PHRASEBOOK_ENABLED", "true").lower() in ("true", "1", "yes")
+PHRASEBOOK_PATH = os.getenv(
+    "PHRASEBOOK_PATH", str(Path(__file__).parent / "data" / "phrasebook.json")
+)
+PHRASEBOOK_MATCH_THRESHOLD = float(os.getenv("PHRASEBOOK_MATCH_THRESHOLD", "0.85"))
+# Pre-synthesize every phrase at startup. The audio cache is per process,
+# so each worker synthesizes the whole phrasebook (see WORKERS).
+PHRASEBOOK_WARMUP = os.getenv("PHRASEBOOK_WARMUP", "true").lower() in ("true", "1", "yes")
+
+# Per-language lexicon for the local medical term extractor
+MEDICAL_LEXICON_PATH = os.getenv(
+    "MEDICAL_LEXICON_PATH", str(Path(__file__).parent / "data" / "medical_lexicon.json")
+)
+
+# Session eviction (all in memory): active sessions idle this long are ended
+# and purged, ended sessions are dropped after the TTL, and the least
+# recently active go first above the count or estimated transcript memory cap
+SESSION_IDLE_TIMEOUT_S = float(os.getenv("SESSION_IDLE_TIMEOUT_S", "1800"))
+SESSION_ENDED_TTL_S = float(os.getenv("SESSION_ENDED_TTL_S", "3600"))
+SESSION_MAX_COUNT = int(os.getenv("SESSION_MAX_COUNT", "1000"))
+SESSION_MAX_MEMORY_MB = int(os.getenv("SESSION_MAX_MEMORY_MB", "256"))
+SESSION_EVICTION_INTERVAL_S = float(os.getenv("SESSION_EVICTION_INTERVAL_S", "30"))
+
+# Session store: "local" (in this process) or "shared" (one store process
+# reached over a Unix socket, for multiple workers). Never persisted.
+# ``python -m backend.serve`` sets these for its workers.
+SESSION_STORE = os.getenv("SESSION_STORE", "local")
+SESSION_STORE_SOCKET = os.getenv("SESSION_STORE_SOCKET", "/tmp/medinter-sessions.sock")
+SESSION_STORE_AUTHKEY = os.getenv("SESSION_STORE_AUTHKEY", "").encode()
+
 # NVIDIA NIM endpoint (OpenAI-compatible)
 NIM_ENDPOINT = os.getenv("NIM_ENDPOINT", "http://localhost:8000")
 NIM_MODEL = os.getenv("NIM_MODEL", "meta/llama-4-maverick-17b-128e-instruct")
 
-# Server
+# Stream LLM output (SSE) and push the translation before terms/urgency finish
+NIM_STREAMING = os.getenv("NIM_STREAMING", "true").lower() in ("true", "1", "yes")
+
+# Split mode: a short translation-only call drives TTS; terms, flags and
+# urgency come from a parallel call and reach the client as an enrichment
+NIM_SPLIT_MODE = os.getenv("NIM_SPLIT_MODE", "true").lower() in ("true", "1", "yes")
+NIM_TRANSLATION_MAX_TOKENS = int(os.getenv("NIM_TRANSLATION_MAX_TOKENS", "256"))
+
+# In-memory translation cache (never persisted); size 0 disables it
+TRANSLATION_CACHE_SIZE = int(os.getenv("TRANSLATION_CACHE_SIZE", "512"))
+TRANSLATION_CACHE_TTL_S = float(os.getenv("TRANSLATION_CACHE_TTL_S", "3600"))
+
+# NIM health monitoring: background probe interval and circuit breaker
+NIM_HEALTH_INTERVAL_S = float(os.getenv("NIM_HEALTH_INTERVAL_S", "10"))
+NIM_BREAKER_FAILURE_THRESHOLD = int(os.getenv("NIM_BREAKER_FAILURE_THRESHOLD", "3"))
+NIM_BREAKER_RESET_S = float(os.getenv("NIM_BREAKER_RESET_S", "15"))
+
+# GPU telemetry sampled in the background for /api/health and /metrics.
+# Backend: auto (NVML, else nvidia-smi), nvml, nvidia-smi, fake or none
+GPU_TELEMETRY_BACKEND = os.getenv("GPU_TELEMETRY_BACKEND", "auto")
+GPU_TELEMETRY_INTERVAL_S = float(os.getenv("GPU_TELEMETRY_INTERVAL_S", "2"))
+GPU_TELEMETRY_HISTORY = int(os.getenv("GPU_TELEMETRY_HISTORY", "150"))
+
+# Server. WORKERS > 1 (with ``python -m backend.serve``) runs that many
+# processes sharing one session store. Everything else is per worker: the
+# ASR/NIM/TTS scheduler (so GPU concurrency caps multiply and urgency only
+# orders work within a worker), the NIM breaker, the caches, warm-up and
+# /metrics. Keep 1 unless the GPU backends are sized for it.
 HOST = os.getenv("HOST", "0.0.0.0")
 PORT = int(os.getenv("PORT", "3000"))
+WORKERS = int(os.getenv("WORKERS", "1"))
 
 # Demo/mock mode — set to "true" to run without Riva/NIM
 MOCK_MODE = os.getenv("MOCK_MODE", "false").lower() in ("true", "1", "yes")
 
+# Mock backend latency for load tests: a named profile ("none", "gb10",
+# "degraded") and/or per-service "asr=MEAN:JITTER,nim=...,tts=..." in ms
+MOCK_LATENCY_PROFILE = os.getenv("MOCK_LATENCY_PROFILE", "none")
+MOCK_LATENCY_SEED = int(os.environ["MOCK_LATENCY_SEED"]) if os.getenv("MOCK_LATENCY_SEED") else None
+
+# Transcript mock ASR returns for each utterance; empty returns no text
+MOCK_ASR_TRANSCRIPT = os.getenv("MOCK_ASR_TRANSCRIPT", "")
+
 # Supported languages: code → (display name, flag, Riva code, TTS voice)
 SUPPORTED_LANGUAGES = {
     "en-US": {"name": "English", "flag": "🇺🇸", "riva_asr": "en-US", "riva_tts": "en-US"},
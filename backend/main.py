@@ -3,24 +3,42 @@
 from __future__ import annotations
 
 import asyncio
-import base64
-import json
 import logging
 import os
 import time
 from contextlib import asynccontextmanager
 from pathlib import Path
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 
-from backend.config import HOST, MOCK_MODE, PORT, SUPPORTED_LANGUAGES
+from backend.config import (
+    HOST,
+    MOCK_MODE,
+    NIM_MAX_CONCURRENCY,
+    NIM_SPLIT_MODE,
+    PHRASEBOOK_ENABLED,
+    PHRASEBOOK_WARMUP,
+    PORT,
+    RIVA_ASR_MAX_CONCURRENCY,
+    RIVA_TTS_MAX_CONCURRENCY,
+    SUPPORTED_LANGUAGES,
+    TTS_WARMUP,
+    TTS_WARMUP_PHRASES,
+)
 from backend.services.asr import RivaASR
-from backend.services.medical_ner import validate_and_normalize
-from backend.services.session_manager import SessionManager, TranslationExchange
+from backend.services.audio_codec import available_codecs
+from backend.services.gpu_telemetry import GPUTelemetry, select_backend
+from backend.services.metrics import REGISTRY
+from backend.services.mock_latency import MOCK_LATENCY
+from backend.services.phrasebook import Phrasebook
+from backend.services.riva_client import RIVA_CHANNELS
+from backend.services.pipeline import ConnectionPipeline
+from backend.services.scheduler import Scheduler
+from backend.services.session_store import AsyncSessionStore, create_session_store
 from backend.services.translator import NIMTranslator
 from backend.services.tts import RivaTTS
 
@@ -28,10 +46,144 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Global services
-session_manager = SessionManager()
+session_manager = create_session_store()
+# For handlers: shared-store calls run off the event loop
+sessions = AsyncSessionStore(session_manager)
 translator = NIMTranslator()
+phrasebook = Phrasebook.load() if PHRASEBOOK_ENABLED else Phrasebook([])
+gpu_telemetry = GPUTelemetry(select_backend())
+scheduler = Scheduler({
+    "asr": RIVA_ASR_MAX_CONCURRENCY,
+    "translate": NIM_MAX_CONCURRENCY,
+    "tts": RIVA_TTS_MAX_CONCURRENCY,
+})
 asr_service: RivaASR | None = None
 tts_service: RivaTTS | None = None
+active_pipelines: set[ConnectionPipeline] = set()
+
+
+# ── Scrape-time metrics ──────────────────────────────────────────────────────
+
+# Session store stats, fetched by /metrics before rendering (callbacks are
+# synchronous and the store may be in another process)
+_session_stats: dict = {}
+
+
+def _cache_requests():
+    translation = translator.health()["cache"]
+    yield {"cache": "translation", "result": "hit"}, translation["hits"]
+    yield {"cache": "translation", "result": "miss"}, translation["misses"]
+    yield {"cache": "translation", "result": "coalesced"}, translation["coalesced"]
+    if tts_service is not None:
+        audio = tts_service.cache.stats()
+        yield {"cache": "tts", "result": "hit"}, audio["hits"]
+        yield {"cache": "tts", "result": "miss"}, audio["misses"]
+    yield {"cache": "phrasebook", "result": "hit"}, phrasebook.hits
+    yield {"cache": "phrasebook", "result": "miss"}, phrasebook.misses
+
+
+def _queue_depths():
+    totals = {"asr": 0, "translate": 0, "tts": 0, "send": 0}
+    for pipeline in active_pipelines:
+        for stage, depth in pipeline.queue_depths().items():
+            totals[stage] += depth
+    return [({"stage": stage}, depth) for stage, depth in totals.items()]
+
+
+def _backend_load(field: str):
+    def collect():
+        for name, service in (("riva_asr", asr_service), ("riva_tts", tts_service)):
+            if service is not None:
+                yield {"service": name}, service.executor.stats()[field]
+        translate = scheduler.stats()["translate"]
+        if field == "in_flight":
+            yield {"service": "nim"}, translate["in_flight"]
+        else:
+            yield {"service": "nim"}, sum(c["waiting"] for c in translate["classes"].values())
+    return collect
+
+
+def _scheduler_waiting():
+    for resource, stats in scheduler.stats().items():
+        for priority, c in stats["classes"].items():
+            yield {"resource": resource, "class": priority}, c["waiting"]
+
+
+def _gpu_gauge(field: str, scale: float = 1.0):
+    def collect():
+        sample = gpu_telemetry.latest
+        value = getattr(sample, field) if sample is not None else None
+        return [({}, round(value * scale))] if value is not None else []
+    return collect
+
+
+REGISTRY.callback(
+    "medinter_cache_requests_total", "Cache lookups by cache and result.", "counter", _cache_requests
+)
+REGISTRY.callback(
+    "medinter_active_websockets", "Open /ws/translate connections.", "gauge",
+    lambda: [({}, len(active_pipelines))],
+)
+REGISTRY.callback(
+    "medinter_active_sessions", "Active translation sessions.", "gauge",
+    lambda: [({}, _session_stats.get("active", 0))],
+)
+REGISTRY.callback(
+    "medinter_queue_depth", "Jobs waiting between pipeline stages, all connections.", "gauge",
+    _queue_depths,
+)
+REGISTRY.callback(
+    "medinter_backend_in_flight", "Backend calls in progress.", "gauge", _backend_load("in_flight")
+)
+REGISTRY.callback(
+    "medinter_backend_waiting", "Backend calls waiting for a slot.", "gauge", _backend_load("waiting")
+)
+REGISTRY.callback(
+    "medinter_scheduler_waiting", "Requests waiting per scheduler resource and class.", "gauge",
+    _scheduler_waiting,
+)
+REGISTRY.callback(
+    "medinter_session_memory_bytes", "Estimated memory held by session transcripts.", "gauge",
+    lambda: [({}, _session_stats.get("memory_bytes", 0))],
+)
+REGISTRY.callback(
+    "medinter_sessions_evicted_total", "Sessions ended or dropped by eviction, by reason.",
+    "counter",
+    lambda: [({"reason": r}, n) for r, n in _session_stats.get("evicted", {}).items()],
+)
+REGISTRY.callback(
+    "medinter_gpu_utilization_percent", "GPU utilization, last sample.", "gauge",
+    _gpu_gauge("usage_percent"),
+)
+REGISTRY.callback(
+    "medinter_gpu_memory_used_bytes", "GPU memory in use, last sample.", "gauge",
+    _gpu_gauge("memory_used_mb", 2**20),
+)
+
+
+async def _warm_up_phrasebook():
+    """Pre-synthesize every phrasebook phrase so phrase audio is a cache hit."""
+    started = time.perf_counter()
+    count = await tts_service.warm_up(phrasebook.texts_by_language())
+    logger.info(f"Phrasebook warm-up synthesized {count} phrases in {time.perf_counter() - started:.1f}s")
+
+
+async def _warm_up_tts():
+    """Translate the warm-up phrases into every language and pre-synthesize them."""
+    started = time.perf_counter()
+    phrases: dict[str, list[str]] = {"en-US": list(TTS_WARMUP_PHRASES)}
+    for lang in SUPPORTED_LANGUAGES:
+        if lang == "en-US":
+            continue
+        results = await asyncio.gather(*(
+            # Same mode as the pipeline, so the warmed cache entries and
+            # wording are the ones served at runtime
+            translator.translate(text, "en-US", lang, translation_only=NIM_SPLIT_MODE)
+            for text in TTS_WARMUP_PHRASES
+        ))
+        phrases[lang] = [r["translation"] for r in results]
+    count = await tts_service.warm_up(phrases)
+    logger.info(f"TTS warm-up synthesized {count} phrases in {time.perf_counter() - started:.1f}s")
 
 
 @asynccontextmanager
@@ -40,8 +192,25 @@ async def lifespan(app: FastAPI):
     logger.info(f"Starting MedInter server (mock_mode={MOCK_MODE})")
     asr_service = RivaASR()
     tts_service = RivaTTS()
+    # Probes for an Opus encoder once, off the event loop
+    logger.info(f"Audio codecs: {', '.join(await asyncio.to_thread(available_codecs))}")
+    translator.start_health_monitor()
+    gpu_telemetry.start()
+    session_manager.start_eviction()
+    warmup_tasks = []
+    if PHRASEBOOK_WARMUP:
+        warmup_tasks.append(asyncio.create_task(_warm_up_phrasebook()))
+    if TTS_WARMUP:
+        warmup_tasks.append(asyncio.create_task(_warm_up_tts()))
     yield
+    for task in warmup_tasks:
+        task.cancel()
+    await gpu_telemetry.stop()
+    await session_manager.stop_eviction()
     await translator.close()
+    asr_service.close()
+    tts_service.close()
+    RIVA_CHANNELS.close()
     logger.info("MedInter server stopped")
 
 
@@ -68,38 +237,48 @@ app.add_middleware(
 @app.get("/api/health")
 async def health():
     """System health check."""
-    gpu_info = {"available": False, "usage_percent": 0, "memory_used_gb": 0, "memory_total_gb": 0}
-    try:
-        import subprocess
-        result = subprocess.run(
-            ["nvidia-smi", "--query-gpu=utilization.gpu,memory.used,memory.total", "--format=csv,noheader,nounits"],
-            capture_output=True, text=True, timeout=5,
-        )
-        if result.returncode == 0:
-            parts = result.stdout.strip().split(", ")
-            gpu_info = {
-                "available": True,
-                "usage_percent": int(parts[0]),
-                "memory_used_gb": round(int(parts[1]) / 1024, 1),
-                "memory_total_gb": round(int(parts[2]) / 1024, 1),
-            }
-    except Exception:
-        pass
-
+    session_stats = await sessions.stats()
     return {
         "status": "healthy",
         "mock_mode": MOCK_MODE,
+        "mock_latency": MOCK_LATENCY.describe() if MOCK_MODE else None,
         "services": {
             "riva_asr": asr_service.is_available if asr_service else False,
             "riva_tts": tts_service.is_available if tts_service else False,
-            "nim_llm": not MOCK_MODE,
+            "nim_llm": translator.is_healthy,
         },
-        "gpu": gpu_info,
-        "active_sessions": len(session_manager.get_active_sessions()),
-        "daily_sessions": session_manager.daily_session_count,
+        "nim": translator.health(),
+        "tts_cache": tts_service.cache.stats() if tts_service else None,
+        "audio_codecs": available_codecs(),
+        "executors": {
+            "riva_asr": asr_service.executor.stats() if asr_service else None,
+            "riva_tts": tts_service.executor.stats() if tts_service else None,
+        },
+        "riva_channels": RIVA_CHANNELS.stats(),
+        "scheduler": scheduler.stats(),
+        "gpu": gpu_telemetry.snapshot(),
+        "active_sessions": session_stats["active"],
+        "daily_sessions": session_stats["daily_sessions"],
+    }
+
+
+@app.get("/api/gpu")
+async def gpu():
+    """Latest GPU reading plus the recent sample history."""
+    return {
+        **gpu_telemetry.stats(),
+        "latest": gpu_telemetry.snapshot(),
+        "history": gpu_telemetry.history(),
     }
 
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus text exposition format."""
+    _session_stats.update(await sessions.stats())
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/api/languages")
 async def languages():
     """List supported languages."""
@@ -110,6 +289,16 @@ async def languages():
     }
 
 
+@app.get("/api/phrasebook")
+async def phrasebook_phrases(source_lang: str = "en-US", target_lang: str = "es-US"):
+    """Pre-translated phrases available for a language pair."""
+    return {
+        "source_lang": source_lang,
+        "target_lang": target_lang,
+        "phrases": phrasebook.for_pair(source_lang, target_lang),
+    }
+
+
 class StartSessionRequest(BaseModel):
     source_lang: str = "es-US"
     target_lang: str = "en-US"
@@ -118,7 +307,7 @@ class StartSessionRequest(BaseModel):
 
 @app.post("/api/session/start")
 async def start_session(req: StartSessionRequest):
-    session = session_manager.create_session(req.source_lang, req.target_lang, req.mode)
+    session = await sessions.create_session(req.source_lang, req.target_lang, req.mode)
     return {
         "session_id": session.session_id,
         "source_lang": session.source_lang,
@@ -133,7 +322,7 @@ class EndSessionRequest(BaseModel):
 
 @app.post("/api/session/end")
 async def end_session(req: EndSessionRequest):
-    summary = session_manager.end_session(req.session_id)
+    summary = await sessions.end_session(req.session_id)
     if not summary:
         return JSONResponse(status_code=404, content={"error": "Session not found"})
     return summary
@@ -141,15 +330,26 @@ async def end_session(req: EndSessionRequest):
 
 @app.get("/api/session/{session_id}/summary")
 async def get_summary(session_id: str):
-    summary = session_manager.get_summary(session_id)
+    summary = await sessions.get_summary(session_id)
     if not summary:
         return JSONResponse(status_code=404, content={"error": "Session not found or still active"})
     return summary
 
 
+@app.get("/api/session/{session_id}/live-summary")
+async def get_live_summary(session_id: str):
+    summary = await sessions.get_live_summary(session_id)
+    if not summary:
+        return JSONResponse(status_code=404, content={"error": "Session not found or not active"})
+    return summary
+
+
 @app.get("/api/sessions/active")
 async def active_sessions():
-    return {"sessions": session_manager.get_active_sessions()}
+    return {
+        "sessions": await sessions.get_active_sessions(),
+        "stats": await sessions.stats(),
+    }
 
 
 # ── WebSocket Endpoint ────────────────────────────────────────────────────────
@@ -160,143 +360,20 @@ async def websocket_translate(websocket: WebSocket):
     await websocket.accept()
     logger.info("WebSocket client connected")
 
-    session_id: str | None = None
-    source_lang = "es-US"
-    target_lang = "en-US"
-
+    pipeline = ConnectionPipeline(
+        websocket,
+        asr=asr_service,
+        translator=translator,
+        tts=tts_service,
+        sessions=session_manager,
+        phrasebook=phrasebook,
+        scheduler=scheduler,
+    )
+    active_pipelines.add(pipeline)
     try:
-        while True:
-            raw = await websocket.receive_text()
-            msg = json.loads(raw)
-            msg_type = msg.get("type")
-
-            if msg_type == "config":
-                source_lang = msg.get("source_lang", source_lang)
-                target_lang = msg.get("target_lang", target_lang)
-                session_id = msg.get("session_id", session_id)
-                await websocket.send_json({"type": "config_ack", "source_lang": source_lang, "target_lang": target_lang})
-
-            elif msg_type == "audio_chunk":
-                session_id = msg.get("session_id", session_id)
-                source_lang = msg.get("source_lang", source_lang)
-                target_lang = msg.get("target_lang", target_lang)
-                audio_b64 = msg.get("audio", "")
-
-                # Step 1: ASR
-                asr_result = await asr_service.recognize_audio_bytes(audio_b64)
-
-                if asr_result["text"]:
-                    # Send partial transcript
-                    await websocket.send_json({
-                        "type": "partial_transcript",
-                        "text": asr_result["text"],
-                        "is_final": asr_result["is_final"],
-                    })
-
-                    if asr_result["is_final"]:
-                        # Step 2: Translate + NER
-                        result = await translator.translate(
-                            asr_result["text"], source_lang, target_lang
-                        )
-
-                        # Step 3: TTS
-                        audio_out = await tts_service.synthesize(
-                            result["translation"], target_lang
-                        )
-
-                        # Normalize medical terms
-                        terms = validate_and_normalize(result.get("medical_terms", []))
-
-                        # Store exchange
-                        if session_id:
-                            session = session_manager.get_session(session_id)
-                            if session:
-                                exchange = TranslationExchange(
-                                    speaker=session.current_speaker,
-                                    original=asr_result["text"],
-                                    translation=result["translation"],
-                                    medical_terms=terms,
-                                    flags=result.get("flags", []),
-                                    urgency=result.get("urgency", "medium"),
-                                )
-                                session_manager.add_exchange(session_id, exchange)
-
-                        await websocket.send_json({
-                            "type": "translation_result",
-                            "original": asr_result["text"],
-                            "translation": result["translation"],
-                            "medical_terms": [dict(t) for t in terms],
-                            "flags": result.get("flags", []),
-                            "urgency": result.get("urgency", "medium"),
-                            "audio": audio_out,
-                        })
-                else:
-                    # No speech detected, send empty partial
-                    await websocket.send_json({
-                        "type": "partial_transcript",
-                        "text": "",
-                        "is_final": False,
-                    })
-
-            elif msg_type == "text_input":
-                # Direct text input (no ASR needed)
-                text = msg.get("text", "")
-                session_id = msg.get("session_id", session_id)
-                source_lang = msg.get("source_lang", source_lang)
-                target_lang = msg.get("target_lang", target_lang)
-
-                if text:
-                    result = await translator.translate(text, source_lang, target_lang)
-                    audio_out = await tts_service.synthesize(result["translation"], target_lang)
-                    terms = validate_and_normalize(result.get("medical_terms", []))
-
-                    if session_id:
-                        session = session_manager.get_session(session_id)
-                        if session:
-                            exchange = TranslationExchange(
-                                speaker=session.current_speaker,
-                                original=text,
-                                translation=result["translation"],
-                                medical_terms=terms,
-                                flags=result.get("flags", []),
-                                urgency=result.get("urgency", "medium"),
-                            )
-                            session_manager.add_exchange(session_id, exchange)
-
-                    await websocket.send_json({
-                        "type": "translation_result",
-                        "original": text,
-                        "translation": result["translation"],
-                        "medical_terms": [dict(t) for t in terms],
-                        "flags": result.get("flags", []),
-                        "urgency": result.get("urgency", "medium"),
-                        "audio": audio_out,
-                    })
-
-            elif msg_type == "switch_speaker":
-                if session_id:
-                    new_speaker = session_manager.switch_speaker(session_id)
-                    await websocket.send_json({
-                        "type": "speaker_switched",
-                        "current_speaker": new_speaker,
-                    })
-
-            elif msg_type == "end_session":
-                if session_id:
-                    summary = session_manager.end_session(session_id)
-                    await websocket.send_json({
-                        "type": "session_ended",
-                        "summary": summary,
-                    })
-
-    except WebSocketDisconnect:
-        logger.info("WebSocket client disconnected")
-    except Exception as e:
-        logger.error(f"WebSocket error: {e}")
-        try:
-            await websocket.close()
-        except Exception:
-            pass
+        await pipeline.run()
+    finally:
+        active_pipelines.discard(pipeline)
 
 
 # ── Static Files (Frontend) ──────────────────────────────────────────────────
@@ -0,0 +1,94 @@
+"""Production launcher: N uvicorn workers, no reload.
+
+With more than one worker, a session store process is started first and
+every worker reaches it over a private Unix socket (see
+``backend/services/session_store.py``), so sessions are shared between
+workers while still living only in memory.
+
+    python -m backend.serve --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import multiprocessing
+import os
+import secrets
+import shutil
+import tempfile
+import time
+
+import uvicorn
+
+from backend.config import HOST, PORT, WORKERS
+
+logger = logging.getLogger("backend.serve")
+
+
+def _run_store(address: str, authkey: bytes) -> None:
+    logging.basicConfig(level=logging.INFO)
+    from backend.services.session_store import serve
+
+    serve(address, authkey)
+
+
+def start_session_store() -> tuple[multiprocessing.Process, str]:
+    """Start the store process; returns it and its private socket directory."""
+    socket_dir = tempfile.mkdtemp(prefix="medinter-")  # mode 0700
+    address = os.path.join(socket_dir, "sessions.sock")
+    authkey = secrets.token_hex(16)
+    process = multiprocessing.Process(
+        target=_run_store, args=(address, authkey.encode()), name="session-store", daemon=True
+    )
+    process.start()
+    deadline = time.monotonic() + 10
+    while not os.path.exists(address):
+        if not process.is_alive() or time.monotonic() > deadline:
+            process.terminate()
+            shutil.rmtree(socket_dir, ignore_errors=True)
+            raise SystemExit("Session store failed to start")
+        time.sleep(0.05)
+
+    # Inherited by the uvicorn workers
+    os.environ["SESSION_STORE"] = "shared"
+    os.environ["SESSION_STORE_SOCKET"] = address
+    os.environ["SESSION_STORE_AUTHKEY"] = authkey
+    return process, socket_dir
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    store, socket_dir = None, None
+    if args.workers > 1:
+        store, socket_dir = start_session_store()
+        logger.info(f"Session store running (pid {store.pid}) for {args.workers} workers")
+        logger.warning(
+            "Scheduler, caches and /metrics are per worker: GPU concurrency "
+            f"limits apply {args.workers} times over"
+        )
+    try:
+        uvicorn.run(
+            "backend.main:app",
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            reload=False,
+            log_level=args.log_level,
+        )
+    finally:
+        if store is not None:
+            store.terminate()
+            store.join(timeout=5)
+            shutil.rmtree(socket_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,11 +5,27 @@ from __future__ import annotations
 import asyncio
 import base64
 import logging
+import queue
+import threading
+import time
 from typing import AsyncGenerator
 
-import grpc
-
-from backend.config import MOCK_MODE, RIVA_ASR_ENDPOINT
+from backend.config import (
+    MOCK_ASR_TRANSCRIPT,
+    MOCK_MODE,
+    RIVA_ASR_ENDPOINT,
+    RIVA_ASR_MAX_CONCURRENCY,
+)
+from backend.services.executor import ServiceExecutor
+from backend.services.metrics import BACKEND_SECONDS, ERRORS
+from backend.services.mock_latency import mock_delay
+from backend.services.riva_client import (
+    RIVA_CHANNELS,
+    prebuild,
+    recognition_config,
+    riva_asr_code,
+    streaming_config,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -24,129 +40,236 @@ except ImportError:
     logger.warning("nvidia-riva-client not installed — ASR will use mock mode")
 
 
+_END = object()
+
+
+class StreamingASRSession:
+    """A Riva streaming recognition bridged between a worker thread and asyncio.
+
+    The Riva client consumes a blocking request iterator and returns a
+    blocking response iterator, so the whole stream runs on a dedicated
+    thread. Audio crosses into that thread through a thread-safe
+    ``queue.Queue``; results cross back with ``loop.call_soon_threadsafe``
+    into an ``asyncio.Queue`` read by ``results()``.
+
+    ``route`` is the caller's context at open time (session, languages), so
+    finals that arrive after the caller moved on are still attributed to
+    the stream they came from.
+    """
+
+    def __init__(
+        self,
+        asr: RivaASR,
+        language_code: str,
+        sample_rate: int = 16000,
+        route: dict | None = None,
+    ):
+        self.language_code = language_code
+        self.sample_rate = sample_rate
+        self.route = route or {}
+        self._asr = asr
+        self._audio: queue.Queue[bytes | object] = queue.Queue()
+        self._results: asyncio.Queue[dict | object] = asyncio.Queue()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._input_closed = False
+        # Set if Riva failed the stream
+        self.error: str | None = None
+
+    def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"medinter-asr-stream-{self.language_code}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    @property
+    def closed(self) -> bool:
+        """No more audio is accepted: input ended or the stream finished."""
+        return self._input_closed
+
+    def feed(self, pcm: bytes) -> None:
+        """Queue raw 16-bit PCM for recognition. Never blocks."""
+        if not self._input_closed:
+            self._audio.put(pcm)
+
+    def end_input(self) -> None:
+        if not self._input_closed:
+            self._input_closed = True
+            self._audio.put(_END)
+
+    async def results(self) -> AsyncGenerator[dict, None]:
+        """Yield interim and final results until the stream finishes."""
+        while True:
+            item = await self._results.get()
+            if item is _END:
+                return
+            yield item
+
+    async def close(self, timeout: float = 5.0) -> None:
+        """End the audio input and wait for the worker thread to finish."""
+        self.end_input()
+        if self._thread is not None:
+            await asyncio.to_thread(self._thread.join, timeout)
+
+    def _emit(self, item: dict | object) -> None:
+        self._loop.call_soon_threadsafe(self._results.put_nowait, item)
+
+    def _audio_iter(self):
+        while True:
+            chunk = self._audio.get()
+            if chunk is _END:
+                return
+            yield chunk
+
+    def _run(self) -> None:
+        try:
+            if not self._asr.is_available or MOCK_MODE:
+                # Mock: drain audio, produce no transcripts
+                for _ in self._audio_iter():
+                    pass
+                return
+
+            responses = self._asr.next_service().streaming_response_generator(
+                audio_chunks=self._audio_iter(),
+                streaming_config=streaming_config(self.language_code, self.sample_rate),
+            )
+            for response in responses:
+                for result in response.results:
+                    if not result.alternatives:
+                        continue
+                    alt = result.alternatives[0]
+                    words = [
+                        {
+                            "word": w.word,
+                            "start_time": w.start_time,
+                            "end_time": w.end_time,
+                        }
+                        for w in getattr(alt, "words", [])
+                    ]
+                    self._emit({
+                        "text": alt.transcript,
+                        "is_final": result.is_final,
+                        "confidence": alt.confidence,
+                        "words": words,
+                    })
+        except Exception as e:
+            self.error = str(e)
+            logger.error(f"Riva ASR streaming error: {e}")
+        finally:
+            self._input_closed = True
+            self._emit(_END)
+
+
 class RivaASR:
     """Streaming ASR via NVIDIA Riva."""
 
     def __init__(self, language_code: str = "en-US"):
         self.language_code = language_code
-        self._auth = None
-        self._service = None
+        self._services = None
+        self._executor = ServiceExecutor("riva-asr", RIVA_ASR_MAX_CONCURRENCY)
 
         if RIVA_AVAILABLE and not MOCK_MODE:
             try:
-                self._auth = riva.client.Auth(
-                    uri=RIVA_ASR_ENDPOINT, use_ssl=False
+                self._services = RIVA_CHANNELS.services(
+                    RIVA_ASR_ENDPOINT, riva.client.ASRService
                 )
-                self._service = riva.client.ASRService(self._auth)
+                prebuild()
                 logger.info(f"Riva ASR connected at {RIVA_ASR_ENDPOINT}")
             except Exception as e:
                 logger.error(f"Failed to connect to Riva ASR: {e}")
-                self._service = None
+                self._services = None
 
     @property
     def is_available(self) -> bool:
-        return self._service is not None
+        return self._services is not None
+
+    def next_service(self):
+        """ASR client on the next pooled channel."""
+        return next(self._services)
+
+    @property
+    def executor(self) -> ServiceExecutor:
+        return self._executor
+
+    def open_stream(
+        self,
+        language_code: str | None = None,
+        sample_rate: int = 16000,
+        route: dict | None = None,
+    ) -> StreamingASRSession:
+        """Open a long-lived streaming recognition (one per WebSocket)."""
+        return StreamingASRSession(
+            self, riva_asr_code(language_code or self.language_code), sample_rate, route
+        )
 
     async def streaming_recognize(
-        self, audio_chunks: AsyncGenerator[bytes, None], sample_rate: int = 16000
+        self,
+        audio_chunks: AsyncGenerator[bytes, None],
+        sample_rate: int = 16000,
+        language_code: str | None = None,
     ) -> AsyncGenerator[dict, None]:
         """Stream audio chunks and yield transcript results.
 
         Yields dicts with keys: text, is_final, confidence, words
         """
-        if not self.is_available or MOCK_MODE:
-            async for chunk in audio_chunks:
-                # Mock: yield fake partial then final
-                yield {
-                    "text": "",
-                    "is_final": False,
-                    "confidence": 0.0,
-                    "words": [],
-                }
-            return
-
-        # Build Riva streaming config
-        config = riva.client.StreamingRecognitionConfig(
-            config=riva.client.RecognitionConfig(
-                encoding=riva.client.AudioEncoding.LINEAR_PCM,
-                sample_rate_hertz=sample_rate,
-                language_code=self.language_code,
-                max_alternatives=1,
-                enable_automatic_punctuation=True,
-                enable_word_time_offsets=True,
-            ),
-            interim_results=True,
-        )
-
-        # Collect audio into a synchronous generator for Riva
-        audio_queue: asyncio.Queue[bytes | None] = asyncio.Queue()
+        stream = self.open_stream(language_code, sample_rate)
+        stream.start()
 
         async def _feed():
             async for chunk in audio_chunks:
-                await audio_queue.put(chunk)
-            await audio_queue.put(None)
-
-        def _sync_gen():
-            loop = asyncio.get_event_loop()
-            while True:
-                chunk = asyncio.run_coroutine_threadsafe(
-                    audio_queue.get(), loop
-                ).result()
-                if chunk is None:
-                    break
-                yield chunk
+                stream.feed(chunk)
+            stream.end_input()
 
         feed_task = asyncio.create_task(_feed())
-
         try:
-            responses = self._service.streaming_response_generator(
-                audio_chunks=_sync_gen(), streaming_config=config
-            )
-            for response in responses:
-                for result in response.results:
-                    words = []
-                    if result.alternatives:
-                        alt = result.alternatives[0]
-                        for w in getattr(alt, "words", []):
-                            words.append(
-                                {
-                                    "word": w.word,
-                                    "start_time": w.start_time,
-                                    "end_time": w.end_time,
-                                }
-                            )
-                        yield {
-                            "text": alt.transcript,
-                            "is_final": result.is_final,
-                            "confidence": alt.confidence,
-                            "words": words,
-                        }
-        except Exception as e:
-            logger.error(f"Riva ASR streaming error: {e}")
+            async for result in stream.results():
+                yield result
         finally:
             feed_task.cancel()
+            await stream.close()
 
     async def recognize_audio_bytes(
-        self, audio_b64: str, sample_rate: int = 16000
+        self, audio_b64: str, sample_rate: int = 16000, language_code: str | None = None
     ) -> dict:
         """Recognize a single audio chunk (base64 encoded).
 
         Returns dict with text, is_final, confidence.
         """
-        audio_bytes = base64.b64decode(audio_b64)
+        return await self.recognize_pcm(
+            base64.b64decode(audio_b64), sample_rate, language_code
+        )
 
+    async def recognize_pcm(
+        self, audio_bytes: bytes, sample_rate: int = 16000, language_code: str | None = None
+    ) -> dict:
+        """Recognize a complete utterance of raw 16-bit PCM.
+
+        ``language_code`` is an app or Riva code (default: the service's).
+        Returns dict with text, is_final, confidence.
+        """
         if not self.is_available or MOCK_MODE:
+            await mock_delay("asr")
+            if MOCK_ASR_TRANSCRIPT and audio_bytes:
+                return {
+                    "text": MOCK_ASR_TRANSCRIPT,
+                    "is_final": True,
+                    "confidence": 1.0,
+                    "words": [],
+                }
             return {"text": "", "is_final": False, "confidence": 0.0, "words": []}
 
         try:
-            config = riva.client.RecognitionConfig(
-                encoding=riva.client.AudioEncoding.LINEAR_PCM,
-                sample_rate_hertz=sample_rate,
-                language_code=self.language_code,
-                max_alternatives=1,
-                enable_automatic_punctuation=True,
+            config = recognition_config(language_code or self.language_code, sample_rate)
+            started = time.perf_counter()
+            response = await self._executor.run(
+                self.next_service().offline_recognize, audio_bytes, config
+            )
+            BACKEND_SECONDS.labels("riva_asr", "offline_recognize").observe(
+                time.perf_counter() - started
             )
-            response = self._service.offline_recognize(audio_bytes, config)
             if response.results:
                 alt = response.results[0].alternatives[0]
                 return {
@@ -156,6 +279,10 @@ class RivaASR:
                     "words": [],
                 }
         except Exception as e:
+            ERRORS.labels("riva_asr").inc()
             logger.error(f"Riva ASR recognition error: {e}")
 
         return {"text": "", "is_final": False, "confidence": 0.0, "words": []}
+
+    def close(self):
+        self._executor.shutdown()
@@ -0,0 +1,186 @@
+"""Output audio formats negotiated per connection for slow links.
+
+TTS produces 22.05 kHz 16-bit mono PCM, about 44 KB per second of speech
+before base64. Clients on a slow link (Bluetooth PAN) can ask for less in
+their ``config`` message, with ``audio_codec`` / ``audio_sample_rate`` or a
+``link_quality`` hint:
+
+    codec   sent as                     bytes/s at 16 kHz
+    wav     16-bit PCM WAV              32 000
+    mulaw   8-bit G.711 μ-law WAV       16 000
+    opus    Ogg Opus (needs ffmpeg)     ~3 000
+
+Opus falls back to μ-law when no encoder is available. Streamed audio is
+raw PCM or μ-law, synthesized by Riva at the negotiated rate.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import shutil
+import struct
+import subprocess
+from dataclasses import dataclass
+
+import numpy as np
+
+from backend.config import AUDIO_OPUS_BITRATE_KBPS, FFMPEG_PATH
+from backend.services.metrics import ERRORS, FALLBACKS
+from backend.services.tts import TTS_SAMPLE_RATE, pcm_to_wav
+
+logger = logging.getLogger(__name__)
+
+CODECS = ("wav", "mulaw", "opus")
+SAMPLE_RATES = (8000, 11025, 16000, 22050)
+
+
+@dataclass(frozen=True, slots=True)
+class OutputFormat:
+    codec: str = "wav"
+    sample_rate: int = TTS_SAMPLE_RATE
+
+    @property
+    def audio_format(self) -> str:
+        """``audio_format`` of whole clips."""
+        return {"wav": "wav", "mulaw": "wav_mulaw", "opus": "ogg_opus"}[self.codec]
+
+    @property
+    def stream_format(self) -> str:
+        """``audio_format`` of streamed chunks (no Opus when streaming)."""
+        return "pcm_mulaw" if self.codec in ("mulaw", "opus") else "pcm_s16le"
+
+
+DEFAULT_FORMAT = OutputFormat()
+
+LINK_PROFILES = {
+    "good": DEFAULT_FORMAT,
+    "fair": OutputFormat("wav", 16000),
+    "poor": OutputFormat("opus", 16000),
+}
+
+
+@functools.lru_cache(maxsize=1)
+def opus_available() -> bool:
+    """Whether ffmpeg with libopus is on this machine (probed once)."""
+    ffmpeg = shutil.which(FFMPEG_PATH)
+    if ffmpeg is None:
+        return False
+    try:
+        result = subprocess.run(
+            [ffmpeg, "-hide_banner", "-encoders"], capture_output=True, text=True, timeout=10
+        )
+    except (OSError, subprocess.SubprocessError):
+        return False
+    return "libopus" in result.stdout
+
+
+def available_codecs() -> list[str]:
+    return [c for c in CODECS if c != "opus" or opus_available()]
+
+
+def negotiate(msg: dict, current: OutputFormat = DEFAULT_FORMAT) -> OutputFormat:
+    """Output format for a ``config`` message; unknown values are ignored."""
+    fmt = LINK_PROFILES.get(msg.get("link_quality"), current)
+    codec = msg.get("audio_codec", fmt.codec)
+    if codec not in CODECS:
+        codec = fmt.codec
+    sample_rate = msg.get("audio_sample_rate", fmt.sample_rate)
+    if sample_rate not in SAMPLE_RATES:
+        sample_rate = fmt.sample_rate
+    if codec == "opus" and not opus_available():
+        codec = "mulaw"
+    return OutputFormat(codec, sample_rate)
+
+
+# ── Resampling ───────────────────────────────────────────────────────────────
+
+
+@functools.lru_cache(maxsize=16)
+def _lowpass(src_rate: int, dst_rate: int, taps: int = 63) -> np.ndarray:
+    """Blackman-windowed sinc just below the new Nyquist frequency."""
+    cutoff = 0.45 * dst_rate / src_rate  # cycles per input sample
+    n = np.arange(taps) - (taps - 1) / 2
+    kernel = 2 * cutoff * np.sinc(2 * cutoff * n) * np.blackman(taps)
+    return (kernel / kernel.sum()).astype(np.float32)
+
+
+def resample(pcm: bytes, src_rate: int, dst_rate: int) -> bytes:
+    """Resample 16-bit mono PCM: FIR anti-aliasing, then linear interpolation."""
+    if src_rate == dst_rate or not pcm:
+        return pcm
+    x = np.frombuffer(pcm, dtype=np.int16, count=len(pcm) // 2).astype(np.float32)
+    if dst_rate < src_rate:
+        x = np.convolve(x, _lowpass(src_rate, dst_rate), mode="same")
+    positions = np.arange(len(x) * dst_rate // src_rate) * (src_rate / dst_rate)
+    y = np.interp(positions, np.arange(len(x)), x)
+    return np.clip(np.rint(y), -32768, 32767).astype(np.int16).tobytes()
+
+
+# ── μ-law ────────────────────────────────────────────────────────────────────
+
+# On 14-bit magnitudes, as in the G.711 reference code
+_MULAW_BIAS = 0x21
+_MULAW_CLIP = 0x1FFF - _MULAW_BIAS  # top of segment 7
+
+
+def mulaw_encode(pcm: bytes) -> bytes:
+    """G.711 μ-law encode 16-bit PCM, one byte per sample."""
+    x = np.frombuffer(pcm, dtype=np.int16, count=len(pcm) // 2).astype(np.int32) >> 2
+    mask = np.where(x < 0, 0x7F, 0xFF)
+    magnitude = np.minimum(np.abs(x), _MULAW_CLIP) + _MULAW_BIAS
+    segment = np.floor(np.log2(magnitude)).astype(np.int32) - 5
+    value = (segment << 4) | ((magnitude >> (segment + 1)) & 0x0F)
+    return (value ^ mask).astype(np.uint8).tobytes()
+
+
+def mulaw_to_wav(data: bytes, sample_rate: int) -> bytes:
+    """Wrap μ-law bytes in a WAV container (the wave module only writes PCM)."""
+    # fmt chunk: WAVE_FORMAT_MULAW, mono, 8 bits, no extension
+    fmt = struct.pack("<4sIHHIIHHH", b"fmt ", 18, 7, 1, sample_rate, sample_rate, 1, 8, 0)
+    fact = struct.pack("<4sII", b"fact", 4, len(data))
+    body = b"WAVE" + fmt + fact + struct.pack("<4sI", b"data", len(data)) + data
+    if len(data) % 2:
+        body += b"\x00"
+    return struct.pack("<4sI", b"RIFF", len(body)) + body
+
+
+# ── Encoding ─────────────────────────────────────────────────────────────────
+
+
+async def _opus_encode(pcm: bytes, sample_rate: int) -> bytes:
+    proc = await asyncio.create_subprocess_exec(
+        shutil.which(FFMPEG_PATH), "-hide_banner", "-loglevel", "error",
+        "-f", "s16le", "-ar", str(sample_rate), "-ac", "1", "-i", "pipe:0",
+        "-c:a", "libopus", "-b:a", f"{AUDIO_OPUS_BITRATE_KBPS}k", "-application", "voip",
+        "-f", "ogg", "pipe:1",
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    out, err = await proc.communicate(pcm)
+    if proc.returncode:
+        raise RuntimeError(err.decode(errors="replace").strip() or f"ffmpeg exit {proc.returncode}")
+    return out
+
+
+async def encode_clip(pcm: bytes, sample_rate: int, fmt: OutputFormat) -> tuple[bytes, str]:
+    """Whole clip in ``fmt``; returns (audio, audio_format)."""
+    pcm = resample(pcm, sample_rate, fmt.sample_rate)
+    if fmt.codec == "opus":
+        try:
+            return await _opus_encode(pcm, fmt.sample_rate), fmt.audio_format
+        except Exception as e:
+            ERRORS.labels("audio_codec").inc()
+            FALLBACKS.labels("audio_codec", "error").inc()
+            logger.error(f"Opus encoding failed, sending μ-law: {e}")
+            fmt = OutputFormat("mulaw", fmt.sample_rate)
+    if fmt.codec == "mulaw":
+        return mulaw_to_wav(mulaw_encode(pcm), fmt.sample_rate), fmt.audio_format
+    return pcm_to_wav(pcm, fmt.sample_rate), fmt.audio_format
+
+
+def encode_chunk(pcm: bytes, fmt: OutputFormat) -> bytes:
+    """Streamed PCM chunk (already at ``fmt.sample_rate``) in ``fmt.stream_format``."""
+    return mulaw_encode(pcm) if fmt.stream_format == "pcm_mulaw" else pcm
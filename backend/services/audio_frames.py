@@ -0,0 +1,43 @@
+"""Binary WebSocket framing for audio on /ws/translate.
+
+Clients that send ``{"type": "config", "binary_audio": true}`` switch to raw
+binary frames in both directions:
+
+* client → server: each binary frame is raw 16-bit little-endian mono PCM at
+  16 kHz, equivalent to the ``audio`` field of an ``audio_chunk`` message.
+* server → client: JSON results carry an ``audio_id`` instead of a base64
+  ``audio`` field, and the audio follows as a binary frame whose first four
+  bytes are that id (big-endian uint32) followed by the encoded audio.
+
+With ``{"type": "config", "streaming_audio": true}`` the result message is a
+stream header (``audio_id``, ``audio_format: "pcm_s16le"``, ``sample_rate``,
+``channels``), followed by several frames with that id carrying raw PCM as
+it is synthesized (``audio_stream_chunk`` messages without binary audio),
+then an ``audio_stream_end`` message.
+"""
+
+from __future__ import annotations
+
+import itertools
+import struct
+
+_HEADER = struct.Struct(">I")
+HEADER_SIZE = _HEADER.size
+
+_audio_ids = itertools.count(1)
+
+
+def next_audio_id() -> int:
+    """Allocate an id that ties a JSON result to its binary audio frame."""
+    return next(_audio_ids) & 0xFFFFFFFF
+
+
+def pack_audio_frame(audio_id: int, payload: bytes) -> bytes:
+    return _HEADER.pack(audio_id) + payload
+
+
+def unpack_audio_frame(frame: bytes) -> tuple[int, bytes]:
+    if len(frame) < HEADER_SIZE:
+        raise ValueError("audio frame shorter than header")
+    (audio_id,) = _HEADER.unpack_from(frame)
+    return audio_id, frame[HEADER_SIZE:]
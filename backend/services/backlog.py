@@ -0,0 +1,187 @@
+"""Flow control for a connection's queue of utterances awaiting ASR.
+
+When ASR or the LLM slows down, complete utterances wait in front of the
+ASR stage and the conversation falls behind real time. ``AudioBacklog``
+replaces the stage's plain queue:
+
+* The receiver never waits on audio. Queued audio is bounded by duration
+  (``AUDIO_BUFFER_MAX_MS``); past it, the oldest queued audio is dropped.
+* Once the utterance at the head has waited longer than the lag budget
+  (``AUDIO_LAG_BUDGET_MS``), stale audio is shed before it reaches ASR:
+  ``merge`` joins it with the audio queued behind it (same session,
+  languages and speaker) into one utterance, so one ASR / LLM / TTS round
+  trip covers them all; ``drop`` discards it as long as newer audio is
+  queued behind it. The newest utterance is always recognized.
+* Typed text and phrases are never shed, and still queue by count.
+
+Every shed, and every change into or out of catching up (late work still
+queued), is reported through ``on_status``, which the pipeline turns into a
+``lag`` message.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Awaitable, Callable
+
+from backend.config import (
+    AUDIO_BUFFER_MAX_MS,
+    AUDIO_LAG_BUDGET_MS,
+    AUDIO_LAG_POLICY,
+    VAD_MAX_UTTERANCE_MS,
+)
+from backend.services.metrics import AUDIO_LAG_SECONDS, AUDIO_SHED, AUDIO_SHED_SECONDS
+from backend.services.scheduler import most_urgent
+
+if TYPE_CHECKING:
+    from backend.services.pipeline import PipelineJob
+
+# Inbound audio is 16 kHz 16-bit mono
+_BYTES_PER_MS = 32
+
+
+def _audio_bytes(job: PipelineJob) -> int:
+    return len(job.pcm) if job.pcm is not None else 0
+
+
+def _route(job: PipelineJob) -> tuple:
+    return (job.session_id, job.source_lang, job.target_lang, job.speaker)
+
+
+class AudioBacklog:
+    """FIFO of pipeline jobs for the ASR stage, with audio shedding."""
+
+    def __init__(
+        self,
+        maxsize: int,
+        lag_budget_ms: int = AUDIO_LAG_BUDGET_MS,
+        max_audio_ms: int = AUDIO_BUFFER_MAX_MS,
+        policy: str = AUDIO_LAG_POLICY,
+        max_merge_ms: int = VAD_MAX_UTTERANCE_MS,
+        on_status: Callable[[dict], Awaitable[None]] | None = None,
+    ):
+        if policy not in ("merge", "drop"):
+            raise ValueError(f"Unknown AUDIO_LAG_POLICY {policy!r} (expected merge or drop)")
+        self.maxsize = maxsize
+        self.lag_budget_ms = lag_budget_ms
+        self.max_audio_ms = max_audio_ms
+        self.policy = policy
+        self.max_merge_ms = max_merge_ms
+        self.on_status = on_status
+        self._jobs: deque[PipelineJob] = deque()
+        self._audio_bytes = 0
+        self._changed = asyncio.Condition()
+        self._catching_up = False
+
+    def qsize(self) -> int:
+        return len(self._jobs)
+
+    @property
+    def audio_ms(self) -> int:
+        """Duration of the audio waiting for ASR."""
+        return self._audio_bytes // _BYTES_PER_MS
+
+    async def put(self, job: PipelineJob) -> None:
+        dropped_ms = 0
+        async with self._changed:
+            if job.pcm is None:
+                await self._changed.wait_for(lambda: len(self._jobs) < self.maxsize)
+            else:
+                dropped_ms = self._make_room(len(job.pcm))
+                self._audio_bytes += len(job.pcm)
+            self._jobs.append(job)
+            self._changed.notify_all()
+        if dropped_ms:
+            lag_ms = self._lag_ms()
+            self._catching_up = lag_ms > self.lag_budget_ms
+            await self._report(lag_ms, dropped_ms=dropped_ms)
+
+    async def get(self) -> PipelineJob:
+        async with self._changed:
+            await self._changed.wait_for(lambda: self._jobs)
+            shed = self._shed() if self._lag_ms() > self.lag_budget_ms else {}
+            lag_ms = self._lag_ms()
+            job = self._jobs.popleft()
+            self._audio_bytes -= _audio_bytes(job)
+            self._changed.notify_all()
+            # Behind only while late work is still queued after this job
+            catching_up = lag_ms > self.lag_budget_ms and bool(self._jobs)
+        if job.pcm is not None:
+            AUDIO_LAG_SECONDS.observe(lag_ms / 1000)
+        if shed or catching_up != self._catching_up:
+            self._catching_up = catching_up
+            await self._report(lag_ms, **shed)
+        return job
+
+    def _lag_ms(self) -> int:
+        if not self._jobs:
+            return 0
+        return round((time.perf_counter() - self._jobs[0].started) * 1000)
+
+    def _remove(self, job: PipelineJob, action: str) -> int:
+        """Take a queued audio job out; returns its duration in ms."""
+        self._jobs.remove(job)
+        self._audio_bytes -= len(job.pcm)
+        ms = len(job.pcm) // _BYTES_PER_MS
+        AUDIO_SHED.labels(action).inc()
+        AUDIO_SHED_SECONDS.labels(action).inc(ms / 1000)
+        return ms
+
+    def _make_room(self, incoming_bytes: int) -> int:
+        """Drop the oldest queued audio until ``incoming_bytes`` fits."""
+        dropped_ms = 0
+        limit = self.max_audio_ms * _BYTES_PER_MS
+        for queued in [j for j in self._jobs if j.pcm is not None]:
+            if self._audio_bytes + incoming_bytes <= limit:
+                break
+            dropped_ms += self._remove(queued, "dropped")
+        return dropped_ms
+
+    def _shed(self) -> dict:
+        """Apply the lag policy at the head of the queue."""
+        head = self._jobs[0]
+        if head.pcm is None:
+            return {}
+        if self.policy == "drop":
+            dropped_ms = 0
+            # Stale audio goes while newer audio is queued behind it
+            while (
+                self._jobs[0].pcm is not None
+                and len(self._jobs) > 1
+                and self._jobs[1].pcm is not None
+            ):
+                dropped_ms += self._remove(self._jobs[0], "dropped")
+            return {"dropped_ms": dropped_ms} if dropped_ms else {}
+
+        merged = []
+        total = len(head.pcm)
+        for job in list(self._jobs)[1:]:
+            if job.pcm is None or _route(job) != _route(head):
+                break
+            if total + len(job.pcm) > self.max_merge_ms * _BYTES_PER_MS:
+                break
+            total += len(job.pcm)
+            merged.append(job)
+        if not merged:
+            return {}
+        for job in merged:
+            self._remove(job, "merged")
+        # Their audio stays queued, now as part of the head
+        self._audio_bytes += total - len(head.pcm)
+        head.pcm = b"".join([head.pcm, *(job.pcm for job in merged)])
+        head.priority = most_urgent(head.priority, *(job.priority for job in merged))
+        return {"merged": len(merged) + 1}
+
+    async def _report(self, lag_ms: int, dropped_ms: int = 0, merged: int = 0) -> None:
+        if self.on_status is None:
+            return
+        await self.on_status({
+            "type": "lag",
+            "lag_ms": lag_ms,
+            "queued_audio_ms": self.audio_ms,
+            "catching_up": self._catching_up,
+            "dropped_ms": dropped_ms,
+            "merged": merged,
+        })
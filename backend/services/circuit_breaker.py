@@ -0,0 +1,82 @@
+"""Circuit breaker for backend services (closed → open → half-open)."""
+
+from __future__ import annotations
+
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Stops calling a backend after consecutive failures.
+
+    After ``failure_threshold`` consecutive failures (timeouts included) the
+    circuit opens and callers go straight to their fallback. Once
+    ``reset_timeout`` seconds have passed, a single probe is let through
+    (half-open); its success closes the circuit, its failure re-opens it.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 3, reset_timeout: float = 15.0):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_started: float | None = None
+        self._total_failures = 0
+        self._times_opened = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            return HALF_OPEN
+        return self._state
+
+    def allow_request(self) -> bool:
+        """Whether a call may go to the backend right now."""
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == OPEN:
+            return False
+        # Half-open: one probe at a time (a stuck probe expires after reset_timeout)
+        now = time.monotonic()
+        if self._probe_started is None or now - self._probe_started >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self._probe_started = now
+            return True
+        return False
+
+    def record_success(self) -> None:
+        if self._state != CLOSED:
+            logger.info(f"{self.name} circuit closed")
+        self._state = CLOSED
+        self._failures = 0
+        self._probe_started = None
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._total_failures += 1
+        if self._state == HALF_OPEN or (
+            self._state == CLOSED and self._failures >= self.failure_threshold
+        ):
+            if self._state == CLOSED:
+                logger.warning(f"{self.name} circuit opened after {self._failures} failures")
+            self._state = OPEN
+            self._opened_at = time.monotonic()
+            self._probe_started = None
+            self._times_opened += 1
+
+    def snapshot(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "total_failures": self._total_failures,
+            "times_opened": self._times_opened,
+        }
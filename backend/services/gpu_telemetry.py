@@ -0,0 +1,251 @@
+"""Background GPU telemetry for /api/health and /metrics.
+
+A sampler task reads the GPU every ``GPU_TELEMETRY_INTERVAL_S`` seconds
+into a cached snapshot plus a short history ring buffer, so health checks
+are an in-memory read and never fork ``nvidia-smi`` on the event loop.
+
+Backends, in ``auto`` order: NVML bindings (``pynvml``, from the
+nvidia-ml-py package), then the ``nvidia-smi`` CLI. ``fake`` produces a
+plausible random walk for development and tests without a GPU.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import shutil
+import subprocess
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+
+from backend.config import (
+    GPU_TELEMETRY_BACKEND,
+    GPU_TELEMETRY_HISTORY,
+    GPU_TELEMETRY_INTERVAL_S,
+)
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pynvml
+
+    NVML_AVAILABLE = True
+except ImportError:
+    NVML_AVAILABLE = False
+
+
+@dataclass
+class GPUSample:
+    timestamp: float
+    usage_percent: int
+    # None where the GPU does not report it (e.g. unified memory on GB10)
+    memory_used_mb: float | None = None
+    memory_total_mb: float | None = None
+    temperature_c: float | None = None
+    power_w: float | None = None
+
+
+def _number(value: str) -> float | None:
+    """nvidia-smi field to a number; "[N/A]" and "[Not Supported]" become None."""
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+class NVMLBackend:
+    name = "nvml"
+
+    def __init__(self, index: int = 0):
+        pynvml.nvmlInit()
+        self._handle = pynvml.nvmlDeviceGetHandleByIndex(index)
+
+    def read(self) -> GPUSample:
+        sample = GPUSample(
+            timestamp=time.time(),
+            usage_percent=pynvml.nvmlDeviceGetUtilizationRates(self._handle).gpu,
+        )
+        try:
+            memory = pynvml.nvmlDeviceGetMemoryInfo(self._handle)
+            sample.memory_used_mb = memory.used / 2**20
+            sample.memory_total_mb = memory.total / 2**20
+        except pynvml.NVMLError:
+            pass
+        try:
+            sample.temperature_c = pynvml.nvmlDeviceGetTemperature(
+                self._handle, pynvml.NVML_TEMPERATURE_GPU
+            )
+        except pynvml.NVMLError:
+            pass
+        try:
+            sample.power_w = pynvml.nvmlDeviceGetPowerUsage(self._handle) / 1000
+        except pynvml.NVMLError:
+            pass
+        return sample
+
+    def close(self) -> None:
+        pynvml.nvmlShutdown()
+
+
+class NvidiaSMIBackend:
+    name = "nvidia-smi"
+
+    _QUERY = "utilization.gpu,memory.used,memory.total,temperature.gpu,power.draw"
+
+    def read(self) -> GPUSample:
+        result = subprocess.run(
+            ["nvidia-smi", f"--query-gpu={self._QUERY}", "--format=csv,noheader,nounits"],
+            capture_output=True, text=True, timeout=5, check=True,
+        )
+        usage, used, total, temperature, power = (
+            _number(v.strip()) for v in result.stdout.splitlines()[0].split(",")
+        )
+        if usage is None:
+            raise ValueError(f"Unexpected nvidia-smi output: {result.stdout!r}")
+        return GPUSample(time.time(), int(usage), used, total, temperature, power)
+
+    def close(self) -> None:
+        pass
+
+
+class FakeGPUBackend:
+    """Random-walk utilization on a 128 GB device; no GPU needed."""
+
+    name = "fake"
+
+    def __init__(self, memory_total_mb: float = 128 * 1024, seed: int | None = None):
+        self.memory_total_mb = memory_total_mb
+        self._rng = random.Random(seed)
+        self._usage = 20.0
+        self._memory = memory_total_mb * 0.6
+
+    def read(self) -> GPUSample:
+        self._usage = min(100.0, max(0.0, self._usage + self._rng.uniform(-10, 10)))
+        self._memory = min(
+            self.memory_total_mb,
+            max(0.0, self._memory + self._rng.uniform(-0.01, 0.01) * self.memory_total_mb),
+        )
+        return GPUSample(
+            timestamp=time.time(),
+            usage_percent=round(self._usage),
+            memory_used_mb=self._memory,
+            memory_total_mb=self.memory_total_mb,
+            temperature_c=round(40 + self._usage * 0.4, 1),
+            power_w=round(30 + self._usage * 1.2, 1),
+        )
+
+    def close(self) -> None:
+        pass
+
+
+def select_backend(name: str = GPU_TELEMETRY_BACKEND):
+    """Backend for ``name`` (auto, nvml, nvidia-smi, fake, none), or None."""
+    if name == "none":
+        return None
+    if name == "fake":
+        return FakeGPUBackend()
+    if name in ("auto", "nvml") and NVML_AVAILABLE:
+        try:
+            return NVMLBackend()
+        except Exception as e:
+            logger.warning(f"NVML unavailable: {e}")
+    if name in ("auto", "nvidia-smi") and shutil.which("nvidia-smi"):
+        return NvidiaSMIBackend()
+    if name not in ("auto", "nvml", "nvidia-smi"):
+        logger.warning(f"Unknown GPU telemetry backend {name!r}")
+    return None
+
+
+class GPUTelemetry:
+    """Samples a backend on an interval; readers only touch memory."""
+
+    def __init__(
+        self,
+        backend=None,
+        interval: float = GPU_TELEMETRY_INTERVAL_S,
+        history: int = GPU_TELEMETRY_HISTORY,
+    ):
+        self.backend = backend
+        self.interval = interval
+        self._history: deque[GPUSample] = deque(maxlen=history)
+        self._task: asyncio.Task | None = None
+        self._errors = 0
+        self._last_error: str | None = None
+
+    @property
+    def latest(self) -> GPUSample | None:
+        return self._history[-1] if self._history else None
+
+    def start(self) -> None:
+        if self.backend is None or self._task is not None:
+            return
+        logger.info(f"GPU telemetry: {self.backend.name} every {self.interval}s")
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.backend is not None:
+            self.backend.close()
+
+    async def sample(self) -> GPUSample | None:
+        """Take one sample now (off the event loop) and record it."""
+        try:
+            sample = await asyncio.to_thread(self.backend.read)
+        except Exception as e:
+            self._errors += 1
+            if self._last_error != str(e):
+                logger.warning(f"GPU telemetry read failed: {e}")
+            self._last_error = str(e)
+            return None
+        self._last_error = None
+        self._history.append(sample)
+        return sample
+
+    async def _run(self) -> None:
+        while True:
+            await self.sample()
+            await asyncio.sleep(self.interval)
+
+    def snapshot(self) -> dict:
+        """Latest reading in the /api/health ``gpu`` shape."""
+        sample = self.latest
+        # A reading older than a few intervals means the sampler is stuck
+        fresh = sample is not None and time.time() - sample.timestamp < self.interval * 3 + 5
+        if not fresh:
+            return {
+                "available": False,
+                "usage_percent": 0,
+                "memory_used_gb": 0,
+                "memory_total_gb": 0,
+                "backend": self.backend.name if self.backend else None,
+                "error": self._last_error,
+            }
+        return {
+            "available": True,
+            "usage_percent": sample.usage_percent,
+            "memory_used_gb": round((sample.memory_used_mb or 0) / 1024, 1),
+            "memory_total_gb": round((sample.memory_total_mb or 0) / 1024, 1),
+            "temperature_c": sample.temperature_c,
+            "power_w": sample.power_w,
+            "backend": self.backend.name,
+            "age_s": round(time.time() - sample.timestamp, 1),
+        }
+
+    def history(self) -> list[dict]:
+        return [asdict(s) for s in self._history]
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.backend.name if self.backend else None,
+            "interval_s": self.interval,
+            "samples": len(self._history),
+            "errors": self._errors,
+        }
@@ -1,8 +1,20 @@
-"""Medical Named Entity Recognition — post-processing of LLM output."""
+"""Medical Named Entity Recognition — post-processing of LLM output, plus a
+local lexicon extractor that finds terms without waiting for the LLM."""
 
 from __future__ import annotations
 
-from typing import TypedDict
+import functools
+import json
+import logging
+import re
+import unicodedata
+from collections import deque
+from pathlib import Path
+from typing import Iterator, TypedDict
+
+from backend.config import MEDICAL_LEXICON_PATH
+
+logger = logging.getLogger(__name__)
 
 
 class MedicalEntity(TypedDict):
@@ -54,6 +66,29 @@ def validate_and_normalize(terms: list[dict]) -> list[MedicalEntity]:
     return normalized
 
 
+def merge_terms(
+    primary: list[MedicalEntity], extra: list[MedicalEntity]
+) -> list[MedicalEntity]:
+    """``primary`` (LLM) terms, plus the ``extra`` (local) terms they miss.
+
+    An extra term is a duplicate if it has the same category and term, or
+    if its source text overlaps the source text of a primary term.
+    """
+    merged = list(primary)
+    seen = {(t["category"], t["term"].casefold()) for t in merged}
+    originals = [t["original"].casefold() for t in merged if t["original"]]
+    for t in extra:
+        key = (t["category"], t["term"].casefold())
+        original = t["original"].casefold()
+        if key in seen or any(original in o or o in original for o in originals if original):
+            continue
+        merged.append(t)
+        seen.add(key)
+        if original:
+            originals.append(original)
+    return merged
+
+
 def build_clinical_summary(terms: list[MedicalEntity]) -> dict:
     """Build a structured clinical summary from extracted terms."""
     summary: dict[str, list[str]] = {
@@ -95,6 +130,343 @@ def build_clinical_summary(terms: list[MedicalEntity]) -> dict:
     return summary
 
 
+# Summary field each category is listed under (as in build_clinical_summary)
+_SUMMARY_FIELD = {
+    "symptom": "symptoms",
+    "condition": "conditions",
+    "medication": "medications",
+    "dosage": "medications",
+    "allergy": "allergies",
+    "vital_sign": "vitals",
+    "onset": "onset_duration",
+    "severity": "severity",
+    "procedure": "procedures",
+}
+_SUMMARY_FIELDS = (
+    "symptoms", "conditions", "medications", "allergies", "vitals",
+    "onset_duration", "severity", "procedures",
+)
+
+URGENCY_LEVELS = ("low", "medium", "high", "critical")
+
+
+class ClinicalAggregate:
+    """Running, deduplicated clinical summary of one session.
+
+    Updated in O(terms) per exchange, so a live view never re-walks the
+    transcript. Terms are deduplicated by (category, casefolded term) and
+    keep their first-seen spelling and order; the chief complaint is the
+    first symptom. Urgency is counted per exchange so an enrichment can
+    replace a provisional rating; ``urgency`` is the highest present.
+    """
+
+    __slots__ = ("_terms", "_fields", "_chief_complaint", "_flags", "_urgency", "_snapshot")
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self) -> None:
+        self._terms: dict[tuple[str, str], MedicalEntity] = {}
+        self._fields: dict[str, dict[str, str]] = {f: {} for f in _SUMMARY_FIELDS}
+        self._chief_complaint: str | None = None
+        self._flags: dict[str, None] = {}
+        self._urgency = dict.fromkeys(URGENCY_LEVELS, 0)
+        self._snapshot: dict | None = None
+
+    def add(self, terms: list[MedicalEntity], flags: list[str], urgency: str) -> None:
+        """Fold in one exchange."""
+        self._add_terms(terms, flags)
+        if urgency in self._urgency:
+            self._urgency[urgency] += 1
+
+    def enrich(
+        self,
+        previous_urgency: str,
+        terms: list[MedicalEntity],
+        flags: list[str],
+        urgency: str,
+    ) -> None:
+        """Fold in a late enrichment of an exchange already added."""
+        self._add_terms(terms, flags)
+        if previous_urgency in self._urgency and self._urgency[previous_urgency]:
+            self._urgency[previous_urgency] -= 1
+        if urgency in self._urgency:
+            self._urgency[urgency] += 1
+
+    def _add_terms(self, terms: list[MedicalEntity], flags: list[str]) -> None:
+        for t in terms:
+            key = (t["category"], t["term"].casefold())
+            if key in self._terms:
+                continue
+            self._terms[key] = t
+            field = _SUMMARY_FIELD.get(t["category"])
+            if field is not None:
+                self._fields[field].setdefault(key[1], t["term"])
+            if t["category"] == "symptom" and self._chief_complaint is None:
+                self._chief_complaint = t["term"]
+        for flag in flags:
+            self._flags[flag] = None
+        self._snapshot = None
+
+    @property
+    def urgency(self) -> str | None:
+        for level in reversed(URGENCY_LEVELS):
+            if self._urgency[level]:
+                return level
+        return None
+
+    @property
+    def medical_terms(self) -> list[MedicalEntity]:
+        return list(self._terms.values())
+
+    def snapshot(self) -> dict:
+        """Summary dict; rebuilt only after a change, so repeat reads are O(1).
+
+        Shared between callers: treat it as read-only.
+        """
+        if self._snapshot is None:
+            clinical = {"chief_complaint": [self._chief_complaint] if self._chief_complaint else []}
+            clinical.update((f, list(v.values())) for f, v in self._fields.items())
+            self._snapshot = {
+                "clinical_summary": clinical,
+                "medical_terms": [dict(t) for t in self._terms.values()],
+                "flags": list(self._flags),
+                "urgency": self.urgency,
+            }
+        return self._snapshot
+
+
 def get_category_display(category: str) -> dict:
     """Get display properties for a category."""
     return CATEGORY_DISPLAY.get(category, CATEGORY_DISPLAY["symptom"])
+
+
+# ── Local lexicon extractor ──────────────────────────────────────────────────
+
+
+class _AhoCorasick:
+    """Multi-pattern matcher: one pass over the text finds every pattern."""
+
+    def __init__(self, patterns: dict[str, tuple[str, str]]):
+        self._goto: list[dict[str, int]] = [{}]
+        self._out: list[list[tuple[int, tuple[str, str]]]] = [[]]
+        for pattern, value in patterns.items():
+            node = 0
+            for ch in pattern:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._out.append([])
+                node = nxt
+            self._out[node].append((len(pattern), value))
+
+        # Failure links, breadth-first; outputs inherit those of their fail node
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def finditer(self, text: str) -> Iterator[tuple[int, int, tuple[str, str]]]:
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for length, value in out[node]:
+                yield i + 1 - length, i + 1, value
+
+
+def _fold(text: str) -> tuple[str, list[int] | None]:
+    """Casefolded, NFKC text and a map from its indices to ``text`` indices."""
+    if text.isascii():
+        return text.lower(), None
+    chars: list[str] = []
+    index: list[int] = []
+    for i, ch in enumerate(text):
+        folded = "'" if ch == "\u2019" else unicodedata.normalize("NFKC", ch).casefold()
+        chars.append(folded)
+        index.extend([i] * len(folded))
+    return "".join(chars), index
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or unicodedata.category(ch)[0] == "M"
+
+
+def _is_unspaced(ch: str) -> bool:
+    # CJK, kana and Hangul: words are not space-delimited (Korean attaches
+    # particles), so matches are not required to sit on word boundaries
+    return unicodedata.east_asian_width(ch) in "WF"
+
+
+def _alternation(words) -> str:
+    # Longest first, so "me duelen" is tried before "me duele"
+    return "|".join(re.escape(_fold(w)[0]) for w in sorted(words, key=len, reverse=True))
+
+
+def _compile_pain_frames(frames: dict) -> tuple[re.Pattern, dict[str, str]] | None:
+    """Regex for "<cue> [modifiers] [determiner] <body part>", e.g. "me duele
+    mucho el pecho", and the term each body part maps to."""
+    if not frames or not frames.get("cues") or not frames.get("body_parts"):
+        return None
+    parts = {_fold(k)[0]: v for k, v in frames["body_parts"].items()}
+    modifiers = _alternation(frames.get("modifiers", [])) or "(?!)"
+    determiners = _alternation(frames.get("determiners", [])) or "(?!)"
+    pattern = re.compile(
+        rf"(?<!\w)(?:{_alternation(frames['cues'])})\s+(?:(?:{modifiers})\s+)*"
+        rf"(?:(?:{determiners})\s+)?({_alternation(parts)})(?!\w)"
+    )
+    return pattern, parts
+
+
+class _LexiconMatcher:
+    """Compiled lexicon for one language (its own terms plus shared ones)."""
+
+    def __init__(
+        self,
+        terms: dict[str, list[str]],
+        allergy_cues: list[str],
+        pain_frames: dict | None = None,
+    ):
+        patterns = {_fold(k)[0]: (v[0], v[1]) for k, v in terms.items()}
+        self._automaton = _AhoCorasick(patterns)
+        self._allergy = (
+            re.compile("|".join(re.escape(_fold(c)[0]) for c in allergy_cues))
+            if allergy_cues
+            else None
+        )
+        self._pain_frames = _compile_pain_frames(pain_frames or {})
+
+    def extract(self, text: str) -> list[MedicalEntity]:
+        folded, index = _fold(text)
+        matches = []
+        for start, end, value in self._automaton.finditer(folded):
+            if not _is_unspaced(folded[start]) and start > 0 and _is_word_char(folded[start - 1]):
+                continue
+            if not _is_unspaced(folded[end - 1]) and end < len(folded) and _is_word_char(folded[end]):
+                continue
+            matches.append((start, end, value))
+        if self._pain_frames is not None:
+            pattern, parts = self._pain_frames
+            for m in pattern.finditer(folded):
+                matches.append((m.start(), m.end(), (parts[m.group(1)], "symptom")))
+
+        # Leftmost-longest, non-overlapping
+        matches.sort(key=lambda m: (m[0], m[0] - m[1]))
+        entities: list[MedicalEntity] = []
+        last_end = 0
+        for start, end, (term, category) in matches:
+            if start < last_end:
+                continue
+            last_end = end
+            if category == "medication" and self._allergy is not None and self._allergy.search(
+                folded, max(0, start - 30), min(len(folded), end + 15)
+            ):
+                term, category = f"{term} allergy", "allergy"
+            if index is not None:
+                original = text[index[start] : index[end - 1] + 1]
+            else:
+                original = text[start:end]
+            entities.append(MedicalEntity(term=term, category=category, original=original))
+        return entities
+
+
+@functools.lru_cache(maxsize=1)
+def _load_lexicon() -> dict:
+    try:
+        return json.loads(Path(MEDICAL_LEXICON_PATH).read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        logger.warning(f"Medical lexicon not loaded from {MEDICAL_LEXICON_PATH}: {e}")
+        return {}
+
+
+@functools.lru_cache(maxsize=None)
+def _matcher(language: str) -> _LexiconMatcher:
+    lexicon = _load_lexicon()
+    entry = lexicon.get("languages", {}).get(language, {})
+    terms = {**lexicon.get("shared", {}).get("terms", {}), **entry.get("terms", {})}
+    return _LexiconMatcher(terms, entry.get("allergy_cues", []), entry.get("pain_frames"))
+
+
+_NUM = r"(\d{2,3}(?:[.,]\d)?)"
+_BP = re.compile(r"(?<![\d/.])(\d{2,3})\s*/\s*(\d{2,3})(?![\d/])")
+_HR = re.compile(
+    r"(?:\b(?:hr|heart rate|pulse|pulso|puls|pouls|frecuencia card[ií]aca|пульс)|心率|脉搏|脈拍|맥박)"
+    r"\D{0,12}?(\d{2,3})(?!\d)|(?<!\d)(\d{2,3})\s*(?:bpm|lpm|уд/мин|次/分)",
+    re.IGNORECASE,
+)
+_SPO2 = re.compile(
+    r"(?:\b(?:spo2|sp02|o2 sat|sats?|saturation|saturaci[oó]n|satura[cç][aã]o|saturazione"
+    r"|sauerstoffs[aä]ttigung|сатурация)\b|血氧(?:饱和度)?)\D{0,12}?(\d{2,3})(?!\d)\s*%?",
+    re.IGNORECASE,
+)
+_TEMP = re.compile(
+    rf"(?<![\d.,]){_NUM}\s*(?:°\s*([cf])?|degrees|grados|graus|gradi|grad\b|градус\w*|度)"
+    rf"|(?:\b(?:temp|temperature|temperatura|température|температура)|体温|體溫)\D{{0,12}}?{_NUM}(?!\d)",
+    re.IGNORECASE,
+)
+_DOSAGE = re.compile(
+    r"(?<![\w.,])(\d+(?:[.,]\d+)?)\s*"
+    r"(?:(mg/kg|mg|mcg|µg|μg|g|ml|units?|unidades|iu|ui|мг|мл)(?![A-Za-zА-Яа-я])|(毫克|毫升|ミリグラム|밀리그램))",
+    re.IGNORECASE,
+)
+_PAIN_SCALE = re.compile(
+    r"(?<![\d/])(\d{1,2})\s*(?:/|out of|de|sobre|em|sur|su|von|из|trên)\s*10(?!\d)",
+    re.IGNORECASE,
+)
+
+
+def _number(raw: str) -> float:
+    return float(raw.replace(",", "."))
+
+
+def _extract_measurements(text: str) -> list[MedicalEntity]:
+    """Vitals (BP, HR, SpO2, temperature), dosages and 0-10 pain scores."""
+    found: list[MedicalEntity] = []
+
+    def add(term: str, category: str, match: re.Match) -> None:
+        found.append(MedicalEntity(term=term, category=category, original=match.group(0).strip()))
+
+    for m in _BP.finditer(text):
+        systolic, diastolic = int(m.group(1)), int(m.group(2))
+        if 60 <= systolic <= 260 and 30 <= diastolic <= 160 and systolic > diastolic:
+            add(f"BP {systolic}/{diastolic}", "vital_sign", m)
+    for m in _HR.finditer(text):
+        rate = int(m.group(1) or m.group(2))
+        if 20 <= rate <= 250:
+            add(f"HR {rate}", "vital_sign", m)
+    for m in _SPO2.finditer(text):
+        saturation = int(m.group(1))
+        if 50 <= saturation <= 100:
+            add(f"SpO2 {saturation}%", "vital_sign", m)
+    for m in _TEMP.finditer(text):
+        raw = m.group(1) or m.group(3)
+        value = _number(raw)
+        unit = (m.group(2) or ("F" if value > 50 else "C")).upper()
+        if (unit == "C" and 34 <= value <= 43) or (unit == "F" and 93 <= value <= 110):
+            add(f"Temperature {raw.replace(',', '.')} °{unit}", "vital_sign", m)
+    for m in _DOSAGE.finditer(text):
+        add(f"{m.group(1)} {m.group(2) or m.group(3)}", "dosage", m)
+    for m in _PAIN_SCALE.finditer(text):
+        score = int(m.group(1))
+        if score <= 10:
+            add(f"Pain scale {score}/10", "severity", m)
+    return found
+
+
+def extract_terms(text: str, language: str) -> list[MedicalEntity]:
+    """Local, LLM-free extraction: lexicon terms plus vitals and dosages."""
+    if not text:
+        return []
+    return _matcher(language).extract(text) + _extract_measurements(text)
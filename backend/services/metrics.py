@@ -0,0 +1,260 @@
+"""In-process metrics in the Prometheus text exposition format.
+
+Kept dependency-free and cheap on the hot path: a histogram observation is
+one bisect and two additions, a counter increment is one addition, and
+labelled children are created once and reused. Values that already live
+elsewhere (cache stats, queue depths, executor load) are read only when
+``/metrics`` is scraped, through callbacks.
+
+All updates happen on the event loop thread, so no locking is needed.
+"""
+
+from __future__ import annotations
+
+import bisect
+import math
+from typing import Callable, Iterable
+
+# Seconds; spans cache hits (sub-ms) to slow LLM calls
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+Samples = Iterable[tuple[dict[str, str], float]]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._children: dict[tuple[str, ...], object] = {}
+
+    def labels(self, *values: str):
+        child = self._children.get(values)
+        if child is None:
+            child = self._children[values] = self._new_child()
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _label_dict(self, values: tuple[str, ...]) -> dict[str, str]:
+        return dict(zip(self.labelnames, values))
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._render_samples())
+        return lines
+
+    def _render_samples(self) -> list[str]:
+        raise NotImplementedError
+
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def _render_samples(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self._label_dict(k))} {_format_value(c.value)}"
+            for k, c in self._children.items()
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.labels().dec(amount)
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def _render_samples(self) -> list[str]:
+        lines = []
+        for key, child in self._children.items():
+            labels = self._label_dict(key)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), child.counts):
+                cumulative += count
+                lines.append(
+                    f"{self.name}_bucket{_format_labels({**labels, 'le': _format_value(bound)})} {cumulative}"
+                )
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(child.sum)}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {cumulative}")
+        return lines
+
+
+class _Callback(_Metric):
+    """Counter or gauge whose samples are read from elsewhere at scrape time."""
+
+    def __init__(self, name: str, help: str, kind: str, collect: Callable[[], Samples]):
+        super().__init__(name, help)
+        self.kind = kind
+        self._collect = collect
+
+    def _render_samples(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(labels)} {_format_value(value)}"
+            for labels, value in self._collect()
+        ]
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def _add(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Duplicate metric {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._add(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        return self._add(Gauge(name, help, labelnames))
+
+    def histogram(
+        self, name: str, help: str, labelnames: tuple[str, ...] = (), buckets=DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._add(Histogram(name, help, labelnames, buckets))
+
+    def callback(self, name: str, help: str, kind: str, collect: Callable[[], Samples]) -> None:
+        """Register (or replace) a metric computed from ``collect()`` on scrape."""
+        self._metrics[name] = _Callback(name, help, kind, collect)
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# ── Hot-path metrics ─────────────────────────────────────────────────────────
+
+BACKEND_SECONDS = REGISTRY.histogram(
+    "medinter_backend_call_seconds",
+    "Latency of calls to Riva ASR, NIM and Riva TTS (cache misses only).",
+    ("service", "call"),
+)
+STAGE_SECONDS = REGISTRY.histogram(
+    "medinter_pipeline_stage_seconds",
+    "Time a job spends in each pipeline stage, including our own work.",
+    ("stage",),
+)
+TIME_TO_TRANSLATION = REGISTRY.histogram(
+    "medinter_time_to_translation_seconds",
+    "From utterance taken in to the first translated text sent.",
+)
+TIME_TO_FIRST_AUDIO = REGISTRY.histogram(
+    "medinter_time_to_first_audio_seconds",
+    "From utterance taken in to its first audio queued for the client.",
+)
+AUDIO_BYTES = REGISTRY.histogram(
+    "medinter_audio_bytes_per_exchange",
+    "Audio bytes sent for one exchange as they go on the wire (base64 included).",
+    ("format",),
+    buckets=(2_000, 5_000, 10_000, 20_000, 50_000, 100_000, 200_000, 500_000, 1_000_000),
+)
+AUDIO_LAG_SECONDS = REGISTRY.histogram(
+    "medinter_audio_lag_seconds",
+    "How long complete utterances waited in front of ASR.",
+)
+AUDIO_SHED = REGISTRY.counter(
+    "medinter_audio_shed_total",
+    "Queued utterances dropped, or merged into another, to catch up.",
+    ("action",),
+)
+AUDIO_SHED_SECONDS = REGISTRY.counter(
+    "medinter_audio_shed_seconds_total",
+    "Seconds of queued audio dropped or merged to catch up.",
+    ("action",),
+)
+FALLBACKS = REGISTRY.counter(
+    "medinter_fallbacks_total",
+    "Results served from a fallback because a backend was unavailable.",
+    ("service", "reason"),
+)
+ERRORS = REGISTRY.counter(
+    "medinter_errors_total",
+    "Errors by component.",
+    ("component",),
+)
+WS_MESSAGES = REGISTRY.counter(
+    "medinter_ws_messages_total",
+    "WebSocket messages by direction and type.",
+    ("direction", "type"),
+)
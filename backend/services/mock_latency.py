@@ -0,0 +1,83 @@
+"""Simulated backend latency for MOCK_MODE load tests.
+
+Mock ASR, NIM and TTS answer instantly, which hides queueing in the
+pipeline and the scheduler. A latency profile makes each mock call sleep
+for ``mean ± jitter`` milliseconds (normal, clipped at zero), so a load
+test against a mock server behaves like one against real backends.
+
+``MOCK_LATENCY_PROFILE`` is a named profile, explicit per-service values,
+or a profile with overrides::
+
+    gb10
+    asr=120:30,nim=350:120,tts=90:25
+    gb10,nim=900:300
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+
+from backend.config import MOCK_LATENCY_PROFILE, MOCK_LATENCY_SEED
+
+SERVICES = ("asr", "nim", "tts")
+
+# service -> (mean ms, jitter ms)
+PROFILES: dict[str, dict[str, tuple[float, float]]] = {
+    "none": {},
+    # Rough single-GB10 figures for one request with no contention
+    "gb10": {"asr": (120, 30), "nim": (350, 120), "tts": (90, 25)},
+    # A loaded or throttled GPU
+    "degraded": {"asr": (300, 120), "nim": (1200, 500), "tts": (250, 100)},
+}
+
+
+def parse_profile(spec: str) -> dict[str, tuple[float, float]]:
+    """Parse a profile spec (see module docstring) into per-service delays."""
+    delays: dict[str, tuple[float, float]] = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        if "=" not in part:
+            if part not in PROFILES:
+                raise ValueError(f"Unknown mock latency profile {part!r}")
+            delays.update(PROFILES[part])
+            continue
+        service, _, value = part.partition("=")
+        service = service.strip()
+        if service not in SERVICES:
+            raise ValueError(f"Unknown mock latency service {service!r}")
+        mean, _, jitter = value.partition(":")
+        delays[service] = (float(mean), float(jitter or 0))
+    return delays
+
+
+class MockLatency:
+    def __init__(self, delays: dict[str, tuple[float, float]], seed: int | None = None):
+        self.delays = delays
+        self._rng = random.Random(seed)
+
+    @classmethod
+    def from_spec(cls, spec: str, seed: int | None = None) -> MockLatency:
+        return cls(parse_profile(spec), seed)
+
+    def sample(self, service: str) -> float:
+        """One delay for ``service``, in seconds."""
+        mean, jitter = self.delays.get(service, (0.0, 0.0))
+        if jitter:
+            mean = self._rng.gauss(mean, jitter)
+        return max(0.0, mean) / 1000
+
+    async def wait(self, service: str) -> None:
+        delay = self.sample(service)
+        if delay:
+            await asyncio.sleep(delay)
+
+    def describe(self) -> dict:
+        return {s: {"mean_ms": m, "jitter_ms": j} for s, (m, j) in self.delays.items()}
+
+
+MOCK_LATENCY = MockLatency.from_spec(MOCK_LATENCY_PROFILE, MOCK_LATENCY_SEED)
+
+
+async def mock_delay(service: str) -> None:
+    """Sleep for the configured mock latency of ``service`` (no-op by default)."""
+    await MOCK_LATENCY.wait(service)
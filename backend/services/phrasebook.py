@@ -0,0 +1,239 @@
+"""Curated EMT phrasebook — pre-translated intake phrases that skip the LLM.
+
+Phrases are loaded once from ``backend/data/phrasebook.json``. A provider
+can trigger one by id, or by typing text that matches a phrase exactly
+(after normalization) or closely enough by token-set similarity.
+
+A stored translation is only served when it means what was typed. A close
+match is rejected, and the text goes to the LLM, when the text has any
+word the phrase lacks (other than a few filler words such as "please"),
+and always when it has a negation the phrase lacks.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import unicodedata
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from backend.config import PHRASEBOOK_MATCH_THRESHOLD, PHRASEBOOK_PATH
+
+logger = logging.getLogger(__name__)
+
+# Words a typed question may add to a phrase without changing its meaning,
+# per language (primary subtag)
+_FILLERS = {
+    "en": {"please", "ok", "okay", "so", "now", "and", "well", "sir", "ma'am", "um", "uh"},
+    "es": {"por", "favor", "señor", "señora", "bueno", "ahora", "y"},
+    "fr": {"s'il", "vous", "plaît", "monsieur", "madame", "bon", "alors", "et"},
+    "de": {"bitte", "also", "und", "jetzt"},
+    "pt": {"por", "favor", "senhor", "senhora", "bem", "agora", "e"},
+    "it": {"per", "favore", "signore", "signora", "bene", "allora", "e"},
+    "ru": {"пожалуйста", "итак", "и"},
+    "vi": {"vui", "lòng", "ạ", "dạ"},
+}
+
+# Negations, per language; a match must not add one the phrase lacks
+_NEGATIONS = {
+    "en": {"not", "no", "never", "none", "nothing", "without", "cannot", "can't", "don't",
+           "doesn't", "didn't", "isn't", "aren't", "wasn't", "weren't", "won't", "haven't",
+           "hasn't"},
+    "es": {"no", "nunca", "jamás", "sin", "ningún", "ninguno", "ninguna", "nada", "tampoco"},
+    "fr": {"ne", "pas", "jamais", "sans", "aucun", "aucune", "rien", "non"},
+    "de": {"nicht", "kein", "keine", "keinen", "keinem", "keiner", "nie", "niemals", "ohne",
+           "nein"},
+    "pt": {"não", "nunca", "sem", "nenhum", "nenhuma", "nada"},
+    "it": {"non", "mai", "senza", "nessun", "nessuno", "nessuna", "niente"},
+    "ru": {"не", "нет", "никогда", "без", "ни"},
+    "hi": {"नहीं", "न", "मत", "बिना"},
+    "ar": {"لا", "لم", "لن", "ليس", "ليست", "بدون", "غير", "ما"},
+    "vi": {"không", "chưa", "chẳng", "đừng"},
+}
+
+# Scripts written without spaces, or with negation inside the word:
+# checked as substrings of the text
+_NEGATION_MARKS = {
+    "zh": ("不", "没", "沒", "别", "無", "无", "未"),
+    "ja": ("ない", "ません", "無", "未", "いいえ"),
+    "ko": ("안 ", "않", "없", "못", "아니"),
+}
+
+
+def _primary(lang: str) -> str:
+    return lang.split("-")[0].lower()
+
+
+def _strip_punctuation(word: str) -> str:
+    start, end = 0, len(word)
+    while start < end and unicodedata.category(word[start])[0] in "PS":
+        start += 1
+    while end > start and unicodedata.category(word[end - 1])[0] in "PS":
+        end -= 1
+    return word[start:end]
+
+
+def normalize(text: str) -> str:
+    """NFC, casefold, split on whitespace and strip punctuation around words.
+
+    Words are never split inside, so combining marks (Devanagari vowel
+    signs and virama) and apostrophes stay in their word.
+    """
+    text = unicodedata.normalize("NFC", text).casefold()
+    return " ".join(w for w in map(_strip_punctuation, text.split()) if w)
+
+
+def _is_unspaced(ch: str) -> bool:
+    # CJK ideographs and kana are written without spaces between words
+    return unicodedata.east_asian_width(ch) in "WF" and ch.isalpha()
+
+
+def tokens(text: str) -> frozenset[str]:
+    """Word tokens; runs of CJK characters become character bigrams."""
+    out: set[str] = set()
+    for word in normalize(text).split():
+        if len(word) > 1 and all(_is_unspaced(ch) for ch in word):
+            out.update(word[i : i + 2] for i in range(len(word) - 1))
+        else:
+            out.add(word)
+    return frozenset(out)
+
+
+def _negations(text: str, toks: frozenset[str], lang: str) -> frozenset[str]:
+    """Negation words (or marks) in ``text``."""
+    primary = _primary(lang)
+    found = {t for t in toks if t in _NEGATIONS.get(primary, ())}
+    if primary == "fr":
+        # Elided "n'" as in "n'êtes"
+        found.update("n'" for t in toks if t.startswith(("n'", "n’")))
+    normalized = normalize(text) + " "
+    found.update(m for m in _NEGATION_MARKS.get(primary, ()) if m in normalized)
+    return frozenset(found)
+
+
+@dataclass
+class Phrase:
+    """One phrase with its text in every language it has been translated to."""
+    id: str
+    category: str
+    text: dict[str, str]
+    medical_terms: list[dict] = field(default_factory=list)
+
+    def covers(self, source_lang: str, target_lang: str) -> bool:
+        return source_lang in self.text and target_lang in self.text
+
+    def result(self, target_lang: str) -> dict:
+        """Translation result in the same shape ``NIMTranslator`` returns."""
+        return {
+            "translation": self.text[target_lang],
+            "medical_terms": [dict(t) for t in self.medical_terms],
+            "flags": [],
+            "urgency": "low",
+        }
+
+
+class Phrasebook:
+    """Phrases indexed per language by normalized text and by token."""
+
+    def __init__(self, phrases: list[Phrase], threshold: float = PHRASEBOOK_MATCH_THRESHOLD):
+        self.threshold = threshold
+        self.hits = 0
+        self.misses = 0
+        self._phrases: dict[str, Phrase] = {p.id: p for p in phrases}
+        self._exact: dict[str, dict[str, Phrase]] = {}
+        # lang -> [(tokens, negations, phrase)]
+        self._tokens: dict[str, list[tuple[frozenset[str], frozenset[str], Phrase]]] = {}
+        self._inverted: dict[str, dict[str, set[int]]] = {}
+        for phrase in phrases:
+            for lang, text in phrase.text.items():
+                self._exact.setdefault(lang, {})[normalize(text)] = phrase
+                entries = self._tokens.setdefault(lang, [])
+                index = self._inverted.setdefault(lang, {})
+                toks = tokens(text)
+                for tok in toks:
+                    index.setdefault(tok, set()).add(len(entries))
+                entries.append((toks, _negations(text, toks, lang), phrase))
+
+    @classmethod
+    def load(cls, path: str | Path = PHRASEBOOK_PATH) -> Phrasebook:
+        try:
+            data = json.loads(Path(path).read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Phrasebook not loaded from {path}: {e}")
+            return cls([])
+        phrases = [
+            Phrase(
+                id=p["id"],
+                category=p.get("category", "general"),
+                text=p["text"],
+                medical_terms=p.get("medical_terms", []),
+            )
+            for p in data.get("phrases", [])
+        ]
+        logger.info(f"Loaded {len(phrases)} phrasebook phrases from {path}")
+        return cls(phrases)
+
+    def __len__(self) -> int:
+        return len(self._phrases)
+
+    def get(self, phrase_id: str) -> Phrase | None:
+        return self._phrases.get(phrase_id)
+
+    def match(self, text: str, lang: str) -> Phrase | None:
+        """Exact normalized match, else the best safe token-set match.
+
+        A close match must contain every typed word except fillers, must
+        not leave out a negation that was typed, and must reach the
+        threshold by Jaccard similarity of the non-filler words.
+        """
+        exact = self._exact.get(lang, {}).get(normalize(text))
+        if exact is not None:
+            self.hits += 1
+            return exact
+
+        query = tokens(text)
+        entries = self._tokens.get(lang)
+        if not query or not entries:
+            self.misses += 1
+            return None
+        fillers = _FILLERS.get(_primary(lang), frozenset())
+        negations = _negations(text, query, lang)
+        content = query - fillers
+        index = self._inverted[lang]
+        candidates = set().union(*(index.get(tok, ()) for tok in query))
+        best, best_score = None, 0.0
+        for i in candidates:
+            toks, phrase_negations, phrase = entries[i]
+            if not content <= toks or not negations <= phrase_negations:
+                continue
+            phrase_content = toks - fillers
+            score = len(content) / len(phrase_content) if phrase_content else 0.0
+            if score > best_score:
+                best, best_score = phrase, score
+        if best_score >= self.threshold:
+            self.hits += 1
+            return best
+        self.misses += 1
+        return None
+
+    def for_pair(self, source_lang: str, target_lang: str) -> list[dict]:
+        """Phrases available for a language pair, for the provider's picker."""
+        return [
+            {
+                "id": p.id,
+                "category": p.category,
+                "original": p.text[source_lang],
+                "translation": p.text[target_lang],
+            }
+            for p in self._phrases.values()
+            if p.covers(source_lang, target_lang)
+        ]
+
+    def texts_by_language(self) -> dict[str, list[str]]:
+        """Every phrase text grouped by language, for TTS warm-up."""
+        out: dict[str, list[str]] = {}
+        for phrase in self._phrases.values():
+            for lang, text in phrase.text.items():
+                out.setdefault(lang, []).append(text)
+        return out
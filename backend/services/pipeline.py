@@ -0,0 +1,812 @@
+"""Per-connection staged pipeline for /ws/translate.
+
+A connection runs five tasks joined by bounded queues:
+
+    receiver ─▶ ASR ─▶ translate ─▶ TTS ─▶ sender
+
+The receiver only parses frames, runs VAD and handles control messages, so
+``config``, ``switch_speaker`` and ``end_session`` never wait behind a slow
+LLM call. Each stage has a single worker, which keeps results in order per
+connection while different utterances overlap across stages. The sender is
+the only task that writes to the socket.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import itertools
+import json
+import logging
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+from backend.config import (
+    ASR_STREAMING,
+    NIM_SPLIT_MODE,
+    NIM_STREAMING,
+    PIPELINE_QUEUE_SIZE,
+    VAD_ENABLED,
+)
+from backend.services.asr import RivaASR, StreamingASRSession
+from backend.services.audio_codec import (
+    DEFAULT_FORMAT,
+    OutputFormat,
+    encode_chunk,
+    encode_clip,
+    negotiate,
+)
+from backend.services.audio_frames import next_audio_id, pack_audio_frame
+from backend.services.backlog import AudioBacklog
+from backend.services.medical_ner import (
+    MedicalEntity,
+    extract_terms,
+    merge_terms,
+    validate_and_normalize,
+)
+from backend.services.metrics import (
+    AUDIO_BYTES,
+    ERRORS,
+    STAGE_SECONDS,
+    TIME_TO_FIRST_AUDIO,
+    TIME_TO_TRANSLATION,
+    WS_MESSAGES,
+)
+from backend.services.phrasebook import Phrase, Phrasebook
+from backend.services.scheduler import (
+    BACKGROUND,
+    ROUTINE,
+    Scheduler,
+    classify_text,
+    most_urgent,
+    urgency_class,
+)
+from backend.services.segmenter import SentenceSegmenter, split_sentences
+from backend.services.session_manager import TranslationExchange
+from backend.services.session_store import AsyncSessionStore, SessionStore
+from backend.services.translator import NIMTranslator
+from backend.services.tts import TTS_SAMPLE_RATE, RivaTTS, wav_to_pcm
+from backend.services.vad import UtteranceBuffer
+
+logger = logging.getLogger(__name__)
+
+
+# Known client message types; anything else is counted as "unknown" so a
+# misbehaving client cannot create unbounded metric labels
+_INBOUND_TYPES = {
+    "config", "audio_chunk", "text_input", "phrase_id", "switch_speaker", "end_session",
+}
+
+
+@dataclass
+class PipelineJob:
+    """One utterance moving through the stages.
+
+    Session, languages and speaker are snapshotted when the utterance is
+    taken in, so a later ``switch_speaker`` or ``config`` does not change
+    how an in-flight exchange is attributed.
+    """
+    exchange_id: int
+    session_id: str | None
+    source_lang: str
+    target_lang: str
+    speaker: str
+    binary_audio: bool
+    segmented_audio: bool
+    streaming_audio: bool = False
+    output_format: OutputFormat = DEFAULT_FORMAT
+    priority: str = ROUTINE
+    started: float = field(default_factory=time.perf_counter)
+    translation_sent: bool = False
+    pcm: bytes | None = None
+    original: str = ""
+    phrase: Phrase | None = None
+    result: dict = field(default_factory=dict)
+    terms: list[MedicalEntity] = field(default_factory=list)
+    local_terms: list[MedicalEntity] = field(default_factory=list)
+    segment_count: int = 0
+    # Split mode: set once translation_result is queued, so the enrichment
+    # never reaches the client before the bubble it updates
+    enrichment_pending: bool = False
+    # Position of the stored exchange in its session, for the enrichment
+    exchange_index: int | None = None
+    delivered: asyncio.Event = field(default_factory=asyncio.Event)
+    enrichment: asyncio.Task | None = None
+
+
+@dataclass
+class AudioSegmentJob:
+    """One sentence of a translation, synthesized ahead of the full result."""
+    exchange_id: int
+    index: int
+    text: str
+    target_lang: str
+    binary_audio: bool
+    streaming_audio: bool = False
+    output_format: OutputFormat = DEFAULT_FORMAT
+    priority: str = ROUTINE
+    started: float = 0.0
+
+
+class ConnectionPipeline:
+    """Receiver, ASR / translation / TTS stages and sender for one WebSocket."""
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        asr: RivaASR,
+        translator: NIMTranslator,
+        tts: RivaTTS,
+        sessions: SessionStore,
+        phrasebook: Phrasebook | None = None,
+        scheduler: Scheduler | None = None,
+        queue_size: int = PIPELINE_QUEUE_SIZE,
+    ):
+        self.websocket = websocket
+        self.asr = asr
+        self.translator = translator
+        self.tts = tts
+        # Shared-store calls are socket round trips, kept off the event loop
+        self.sessions = AsyncSessionStore(sessions)
+        self.phrasebook = phrasebook
+        self.scheduler = scheduler
+
+        # Connection state, updated by the receiver
+        self.session_id: str | None = None
+        self.source_lang = "es-US"
+        self.target_lang = "en-US"
+        self.asr_streaming = ASR_STREAMING
+        self.binary_audio = False
+        self.segmented_audio = False
+        self.streaming_audio = False
+        self.output_format = DEFAULT_FORMAT
+
+        self._utterances = UtteranceBuffer()
+        self._stream: StreamingASRSession | None = None
+        # Bounded by audio duration, with stale audio shed past the lag budget
+        self._asr_q = AudioBacklog(queue_size, on_status=self._send)
+        self._translate_q: asyncio.Queue[PipelineJob] = asyncio.Queue(queue_size)
+        self._tts_q: asyncio.Queue[PipelineJob | AudioSegmentJob] = asyncio.Queue(
+            queue_size * 4
+        )
+        self._out_q: asyncio.Queue[dict | bytes] = asyncio.Queue(queue_size * 4)
+        self._tasks: set[asyncio.Task] = set()
+        self._exchange_ids = itertools.count(1)
+        # exchange_id -> [audio_format, bytes sent], observed with the result
+        self._audio_bytes: dict[int, list] = {}
+
+    # ── Lifecycle ────────────────────────────────────────────────────────────
+
+    def _spawn(self, coro, name: str) -> asyncio.Task:
+        task = asyncio.create_task(coro, name=name)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def queue_depths(self) -> dict:
+        return {
+            "asr": self._asr_q.qsize(),
+            "translate": self._translate_q.qsize(),
+            "tts": self._tts_q.qsize(),
+            "send": self._out_q.qsize(),
+        }
+
+    async def run(self) -> None:
+        """Serve the connection until the client disconnects."""
+        self._spawn(self._stage("asr", self._asr_q, self._recognize), "asr")
+        self._spawn(self._stage("translate", self._translate_q, self._translate), "translate")
+        self._spawn(self._stage("tts", self._tts_q, self._synthesize), "tts")
+        sender = self._spawn(self._sender(), "sender")
+
+        try:
+            receiver = self._spawn(self._receiver(), "receiver")
+            # A dead sender means the socket is gone; stop receiving too
+            done, _ = await asyncio.wait(
+                {receiver, sender}, return_when=asyncio.FIRST_COMPLETED
+            )
+            receiver.cancel()
+            for task in done:
+                if not task.cancelled() and task.exception():
+                    raise task.exception()
+        except WebSocketDisconnect:
+            logger.info("WebSocket client disconnected")
+        except Exception as e:
+            logger.error(f"WebSocket error: {e}")
+            try:
+                await self.websocket.close()
+            except Exception:
+                pass
+        finally:
+            await self._shutdown()
+
+    async def _shutdown(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._stream is not None:
+            await self._stream.close()
+            self._stream = None
+
+    def _send(self, message: dict | bytes):
+        return self._out_q.put(message)
+
+    def _slot(self, resource: str, priority: str):
+        if self.scheduler is None:
+            return nullcontext()
+        return self.scheduler.slot(resource, priority)
+
+    # ── Receiver ─────────────────────────────────────────────────────────────
+
+    def _route(self) -> dict:
+        return {
+            "session_id": self.session_id,
+            "source_lang": self.source_lang,
+            "target_lang": self.target_lang,
+        }
+
+    async def _turn(self, session_id: str | None) -> tuple[str, str]:
+        """Current speaker of the session and the priority of its turn."""
+        speaker = "patient"
+        priority = ROUTINE
+        if session_id:
+            context = await self.sessions.turn_context(session_id)
+            if context:
+                speaker, recent = context
+                # Most urgent of the last few exchanges, so one routine
+                # provider question does not demote a critical patient
+                if recent:
+                    priority = most_urgent(*(urgency_class(u) for u in recent))
+        return speaker, priority
+
+    async def _new_job(self, route: dict | None = None, **kwargs) -> PipelineJob:
+        """Job for the connection's current route and turn, or ``route``.
+
+        A ``route`` snapshotted with a speaker (a streaming recognition's)
+        keeps that speaker, so finals arriving after ``switch_speaker`` stay
+        attributed to whoever said them.
+        """
+        route = dict(route or self._route())
+        speaker, priority = await self._turn(route["session_id"])
+        if "speaker" in route:
+            speaker = route.pop("speaker")
+            priority = most_urgent(priority, route.pop("priority", ROUTINE))
+        return PipelineJob(
+            exchange_id=next(self._exchange_ids),
+            speaker=speaker,
+            binary_audio=self.binary_audio,
+            segmented_audio=self.segmented_audio,
+            streaming_audio=self.streaming_audio,
+            output_format=self.output_format,
+            priority=priority,
+            **route,
+            **kwargs,
+        )
+
+    def _update_route(self, msg: dict) -> None:
+        self.session_id = msg.get("session_id", self.session_id)
+        self.source_lang = msg.get("source_lang", self.source_lang)
+        self.target_lang = msg.get("target_lang", self.target_lang)
+
+    async def _receiver(self) -> None:
+        while True:
+            frame = await self.websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(frame.get("code", 1000))
+            if frame.get("bytes") is not None:
+                # Binary protocol: raw PCM for the current session/language
+                WS_MESSAGES.labels("in", "audio_binary").inc()
+                await self._handle_audio(frame["bytes"])
+                continue
+
+            msg = json.loads(frame["text"])
+            msg_type = msg.get("type")
+            WS_MESSAGES.labels("in", msg_type if msg_type in _INBOUND_TYPES else "unknown").inc()
+
+            if msg_type == "config":
+                await self._handle_config(msg)
+
+            elif msg_type == "audio_chunk":
+                self._update_route(msg)
+                await self._handle_audio(base64.b64decode(msg.get("audio", "")))
+
+            elif msg_type == "text_input":
+                # Direct text input (no ASR needed)
+                self._update_route(msg)
+                text = msg.get("text", "")
+                if text:
+                    # Routed through the ASR queue (as a pass-through) so it
+                    # cannot overtake audio received before it
+                    await self._asr_q.put(await self._new_job(
+                        original=text, phrase=self._match_phrase(text)
+                    ))
+
+            elif msg_type == "phrase_id":
+                self._update_route(msg)
+                await self._handle_phrase(msg.get("phrase_id", ""))
+
+            elif msg_type == "switch_speaker":
+                await self._handle_switch_speaker()
+
+            elif msg_type == "end_session":
+                await self._handle_end_session()
+
+    async def _handle_config(self, msg: dict) -> None:
+        self.source_lang = msg.get("source_lang", self.source_lang)
+        self.target_lang = msg.get("target_lang", self.target_lang)
+        self.session_id = msg.get("session_id", self.session_id)
+        if "asr_mode" in msg:
+            self.asr_streaming = msg["asr_mode"] == "streaming"
+        if "binary_audio" in msg:
+            self.binary_audio = bool(msg["binary_audio"])
+        if "segmented_audio" in msg:
+            self.segmented_audio = bool(msg["segmented_audio"])
+        if "streaming_audio" in msg:
+            self.streaming_audio = bool(msg["streaming_audio"])
+        self.output_format = negotiate(msg, self.output_format)
+        if self._stream is not None and (not self.asr_streaming or self._stream_stale()):
+            await self._close_stream()
+        await self._send({
+            "type": "config_ack",
+            "source_lang": self.source_lang,
+            "target_lang": self.target_lang,
+            "asr_mode": "streaming" if self.asr_streaming else "offline",
+            "binary_audio": self.binary_audio,
+            "segmented_audio": self.segmented_audio,
+            "streaming_audio": self.streaming_audio,
+            "audio_codec": self.output_format.codec,
+            "audio_sample_rate": self.output_format.sample_rate,
+        })
+
+    async def _handle_audio(self, pcm: bytes) -> None:
+        if self.asr_streaming:
+            (await self._ensure_stream()).feed(pcm)
+            return
+
+        if VAD_ENABLED:
+            # Only complete utterances reach ASR; silence is dropped here
+            utterance = self._utterances.push(pcm)
+        else:
+            utterance = pcm
+        if utterance:
+            await self._asr_q.put(await self._new_job(pcm=utterance))
+
+    def _match_phrase(self, text: str) -> Phrase | None:
+        if self.phrasebook is None:
+            return None
+        phrase = self.phrasebook.match(text, self.source_lang)
+        if phrase is None or not phrase.covers(self.source_lang, self.target_lang):
+            return None
+        return phrase
+
+    async def _handle_phrase(self, phrase_id: str) -> None:
+        phrase = self.phrasebook.get(phrase_id) if self.phrasebook else None
+        if phrase is None or not phrase.covers(self.source_lang, self.target_lang):
+            logger.warning(
+                f"Phrase {phrase_id!r} not available for {self.source_lang} -> {self.target_lang}"
+            )
+            return
+        await self._asr_q.put(await self._new_job(
+            original=phrase.text[self.source_lang], phrase=phrase
+        ))
+
+    async def _handle_switch_speaker(self) -> None:
+        # Whatever the previous speaker said is queued under their name first
+        if self._stream is not None:
+            await self._close_stream()
+        utterance = self._utterances.flush()
+        if utterance:
+            await self._asr_q.put(await self._new_job(pcm=utterance))
+        if self.session_id:
+            new_speaker = await self.sessions.switch_speaker(self.session_id)
+            await self._send({
+                "type": "speaker_switched",
+                "current_speaker": new_speaker,
+            })
+
+    async def _handle_end_session(self) -> None:
+        self._utterances.reset()
+        if self._stream is not None:
+            await self._close_stream()
+        if self.session_id:
+            summary = await self.sessions.end_session(self.session_id)
+            await self._send({
+                "type": "session_ended",
+                "summary": summary,
+            })
+
+    # ── Streaming ASR ────────────────────────────────────────────────────────
+
+    def _stream_stale(self) -> bool:
+        """The open stream finished, or was opened for another language,
+        session or target."""
+        route = self._stream.route
+        return self._stream.closed or any(route[k] != v for k, v in self._route().items())
+
+    async def _ensure_stream(self) -> StreamingASRSession:
+        if self._stream is not None and self._stream_stale():
+            await self._close_stream()
+        if self._stream is None:
+            route = self._route()
+            route["speaker"], route["priority"] = await self._turn(self.session_id)
+            self._stream = self.asr.open_stream(self.source_lang, route=route)
+            self._stream.start()
+            self._spawn(self._forward_stream(self._stream), "asr-stream")
+        return self._stream
+
+    async def _close_stream(self) -> None:
+        # Only ends the input: the old forwarder keeps running until Riva
+        # delivers its last finals, so the receiver never waits on it
+        if self._stream is not None:
+            self._stream.end_input()
+        self._stream = None
+
+    async def _forward_stream(self, stream: StreamingASRSession) -> None:
+        # Interim and final results are sent as they arrive; finals are translated
+        async for result in stream.results():
+            await self._send({
+                "type": "partial_transcript",
+                "text": result["text"],
+                "is_final": result["is_final"],
+            })
+            if result["is_final"] and result["text"].strip():
+                # Route of the stream, not the connection: after a language
+                # switch this stream's trailing finals are still in its language
+                await self._asr_q.put(
+                    await self._new_job(stream.route, original=result["text"])
+                )
+        await stream.close()
+        if self._stream is stream:
+            # Failed under us: the next audio opens a new stream
+            self._stream = None
+        if stream.error is not None:
+            await self._send({
+                "type": "error",
+                "stage": "asr",
+                "message": "Speech recognition stream failed; reconnecting",
+            })
+
+    # ── Stages ───────────────────────────────────────────────────────────────
+
+    async def _stage(
+        self, name: str, queue: asyncio.Queue[PipelineJob] | AudioBacklog, handler
+    ) -> None:
+        seconds = STAGE_SECONDS.labels(name)
+        errors = ERRORS.labels(f"pipeline_{name}")
+        while True:
+            job = await queue.get()
+            started = time.perf_counter()
+            try:
+                await handler(job)
+            except Exception as e:
+                errors.inc()
+                logger.error(f"Pipeline stage {handler.__name__} error: {e}")
+            seconds.observe(time.perf_counter() - started)
+
+    async def _recognize(self, job: PipelineJob) -> None:
+        if job.pcm is None:
+            # Already text (text_input or a streaming final)
+            await self._translate_q.put(job)
+            return
+
+        async with self._slot("asr", job.priority):
+            asr_result = await self.asr.recognize_pcm(job.pcm, language_code=job.source_lang)
+        job.pcm = None
+        await self._send({
+            "type": "partial_transcript",
+            "text": asr_result["text"],
+            "is_final": asr_result["is_final"],
+        })
+        if asr_result["text"] and asr_result["is_final"]:
+            job.original = asr_result["text"]
+            await self._translate_q.put(job)
+
+    async def _queue_segment(self, job: PipelineJob, text: str) -> None:
+        await self._tts_q.put(AudioSegmentJob(
+            exchange_id=job.exchange_id,
+            index=job.segment_count,
+            text=text,
+            target_lang=job.target_lang,
+            binary_audio=job.binary_audio,
+            streaming_audio=job.streaming_audio,
+            output_format=job.output_format,
+            priority=job.priority,
+            started=job.started,
+        ))
+        job.segment_count += 1
+
+    async def _translate(self, job: PipelineJob) -> None:
+        if job.phrase is not None:
+            # Pre-translated: no LLM call, and the whole phrase is one
+            # (usually pre-synthesized) audio clip
+            job.result = job.phrase.result(job.target_lang)
+            job.segmented_audio = False
+            await self._finish_translation(job)
+            return
+
+        job.priority = most_urgent(job.priority, classify_text(job.original))
+        # Lexicon terms and vitals take well under a millisecond; the LLM's
+        # terms are merged in when they arrive
+        job.local_terms = extract_terms(job.original, job.source_lang)
+        if NIM_SPLIT_MODE:
+            job.enrichment_pending = True
+            job.enrichment = self._spawn(self._enrich(job), f"enrich-{job.exchange_id}")
+        try:
+            async with self._slot("translate", job.priority):
+                await self._translate_llm(job)
+            await self._finish_translation(job)
+        except BaseException:
+            # No translation_result will be delivered for it to follow
+            self._cancel_enrichment(job)
+            raise
+
+    async def _enrich(self, job: PipelineJob) -> None:
+        """Second half of split mode: terms, flags and urgency, sent when ready.
+
+        Queued behind every first translation, so it never delays another
+        session's fast call; cancelled if the exchange fails.
+        """
+        try:
+            async with self._slot("translate", BACKGROUND):
+                enrichment = await self.translator.enrich(
+                    job.original, job.source_lang, job.target_lang
+                )
+            await job.delivered.wait()
+        except Exception as e:
+            logger.error(f"Enrichment error: {e}")
+            return
+        terms = merge_terms(
+            validate_and_normalize(enrichment.get("medical_terms", [])), job.local_terms
+        )
+        flags = enrichment.get("flags", [])
+        urgency = enrichment.get("urgency", "medium")
+        if job.session_id and job.exchange_index is not None:
+            await self.sessions.enrich_exchange(
+                job.session_id, job.exchange_index, terms, flags, urgency
+            )
+        await self._send({
+            "type": "translation_enrichment",
+            "exchange_id": job.exchange_id,
+            "medical_terms": [dict(t) for t in terms],
+            "flags": flags,
+            "urgency": urgency,
+        })
+
+    @staticmethod
+    def _cancel_enrichment(job: PipelineJob) -> None:
+        if job.enrichment is not None:
+            job.enrichment.cancel()
+
+    async def _translate_llm(self, job: PipelineJob) -> None:
+        # With segmented audio, each sentence goes to TTS as soon as it is
+        # complete, while the LLM is still generating the rest
+        segmenter = SentenceSegmenter() if job.segmented_audio else None
+
+        if NIM_STREAMING:
+            async for key, value in self.translator.translate_stream(
+                job.original, job.source_lang, job.target_lang,
+                translation_only=job.enrichment_pending,
+            ):
+                if key == "translation_delta" and segmenter is not None:
+                    for sentence in segmenter.feed(value):
+                        await self._queue_segment(job, sentence)
+                elif key == "translation":
+                    # Shown (and spoken, once TTS catches up) before NER finishes
+                    self._translation_sent(job)
+                    await self._send({
+                        "type": "translation_partial",
+                        "exchange_id": job.exchange_id,
+                        "original": job.original,
+                        "translation": value,
+                    })
+                elif key == "result":
+                    job.result = value
+        else:
+            job.result = await self.translator.translate(
+                job.original, job.source_lang, job.target_lang,
+                translation_only=job.enrichment_pending,
+            )
+            if segmenter is not None:
+                for sentence in split_sentences(job.result["translation"]):
+                    await self._queue_segment(job, sentence)
+
+        if segmenter is not None:
+            for sentence in segmenter.flush():
+                await self._queue_segment(job, sentence)
+
+    async def _finish_translation(self, job: PipelineJob) -> None:
+        job.terms = merge_terms(
+            validate_and_normalize(job.result.get("medical_terms", [])), job.local_terms
+        )
+        job.priority = most_urgent(job.priority, urgency_class(job.result.get("urgency")))
+
+        if job.session_id:
+            exchange = TranslationExchange(
+                speaker=job.speaker,
+                original=job.original,
+                translation=job.result["translation"],
+                medical_terms=job.terms,
+                flags=job.result.get("flags", []),
+                urgency=job.result.get("urgency", "medium"),
+            )
+            job.exchange_index = await self.sessions.add_exchange(job.session_id, exchange)
+
+        await self._tts_q.put(job)
+
+    @staticmethod
+    def _translation_sent(job: PipelineJob) -> None:
+        if not job.translation_sent:
+            job.translation_sent = True
+            TIME_TO_TRANSLATION.observe(time.perf_counter() - job.started)
+
+    async def _send_audio(
+        self, message: dict, job: PipelineJob | AudioSegmentJob, text: str
+    ) -> float:
+        """Attach ``text``'s audio to ``message`` inline (base64) or as a
+        binary frame, or stream it after the message.
+
+        Returns when the first audio was queued for the client.
+        """
+        if job.streaming_audio:
+            return await self._stream_audio(message, job, text)
+        async with self._tts_slot(job, text, TTS_SAMPLE_RATE):
+            audio_out = await self.tts.synthesize_wav(text, job.target_lang)
+        audio_format = "wav"
+        if job.output_format != DEFAULT_FORMAT:
+            audio_out, audio_format = await encode_clip(
+                wav_to_pcm(audio_out), TTS_SAMPLE_RATE, job.output_format
+            )
+        message["audio_format"] = audio_format
+        if job.binary_audio:
+            audio_id = next_audio_id()
+            message["audio_id"] = audio_id
+            frame = pack_audio_frame(audio_id, audio_out)
+            self._count_audio(job.exchange_id, audio_format, len(frame))
+            await self._send(message)
+            await self._send(frame)
+        else:
+            message["audio"] = base64.b64encode(audio_out).decode("utf-8")
+            self._count_audio(job.exchange_id, audio_format, len(message["audio"]))
+            await self._send(message)
+        return time.perf_counter()
+
+    def _tts_slot(self, job: PipelineJob | AudioSegmentJob, text: str, sample_rate: int):
+        # Cache hits make no Riva call, so they take no slot
+        if self.tts.is_cached(text, job.target_lang, sample_rate):
+            return nullcontext()
+        return self._slot("tts", job.priority)
+
+    def _count_audio(self, exchange_id: int, audio_format: str, size: int) -> None:
+        self._audio_bytes.setdefault(exchange_id, [audio_format, 0])[1] += size
+
+    async def _stream_audio(
+        self, message: dict, job: PipelineJob | AudioSegmentJob, text: str
+    ) -> float:
+        """Send ``message`` as the stream header, then PCM chunks as Riva
+        produces them (binary frames or ``audio_stream_chunk``), then
+        ``audio_stream_end``."""
+        fmt = job.output_format
+        audio_id = next_audio_id()
+        message.update(
+            audio_id=audio_id,
+            audio_format=fmt.stream_format,
+            sample_rate=fmt.sample_rate,
+            channels=1,
+            audio_stream=True,
+        )
+        await self._send(message)
+
+        # The TTS slot covers only the Riva calls: chunks are buffered here,
+        # so a slow client's full out queue never holds a slot other
+        # sessions are waiting for
+        chunks: asyncio.Queue[bytes | None] = asyncio.Queue()
+
+        async def synthesize() -> None:
+            try:
+                async with self._tts_slot(job, text, fmt.sample_rate):
+                    async for pcm in self.tts.synthesize_online(
+                        text, job.target_lang, fmt.sample_rate
+                    ):
+                        chunks.put_nowait(pcm)
+            finally:
+                chunks.put_nowait(None)
+
+        producer = asyncio.create_task(synthesize(), name=f"tts-{audio_id}")
+        first_audio = None
+        count = 0
+        try:
+            while (pcm := await chunks.get()) is not None:
+                chunk = encode_chunk(pcm, fmt)
+                if job.binary_audio:
+                    frame = pack_audio_frame(audio_id, chunk)
+                    self._count_audio(job.exchange_id, fmt.stream_format, len(frame))
+                    await self._send(frame)
+                else:
+                    encoded = base64.b64encode(chunk).decode("ascii")
+                    self._count_audio(job.exchange_id, fmt.stream_format, len(encoded))
+                    await self._send({
+                        "type": "audio_stream_chunk",
+                        "audio_id": audio_id,
+                        "index": count,
+                        "audio": encoded,
+                    })
+                count += 1
+                if first_audio is None:
+                    first_audio = time.perf_counter()
+            await producer
+        finally:
+            # Stops synthesis (and the Riva stream) if sending failed
+            producer.cancel()
+        await self._send({"type": "audio_stream_end", "audio_id": audio_id, "chunks": count})
+        return first_audio or time.perf_counter()
+
+    async def _synthesize(self, job: PipelineJob | AudioSegmentJob) -> None:
+        if isinstance(job, AudioSegmentJob):
+            first_audio = await self._send_audio(
+                {
+                    "type": "audio_segment",
+                    "exchange_id": job.exchange_id,
+                    "index": job.index,
+                    "text": job.text,
+                },
+                job,
+                job.text,
+            )
+            if job.index == 0:
+                TIME_TO_FIRST_AUDIO.observe(first_audio - job.started)
+            return
+
+        result = job.result
+        message = {
+            "type": "translation_result",
+            "exchange_id": job.exchange_id,
+            "original": job.original,
+            "translation": result["translation"],
+            "medical_terms": [dict(t) for t in job.terms],
+            "flags": result.get("flags", []),
+            "urgency": result.get("urgency", "medium"),
+        }
+        if job.phrase is not None:
+            message["phrase_id"] = job.phrase.id
+        if job.enrichment_pending:
+            # Terms, flags and urgency follow in a translation_enrichment
+            message["enrichment_pending"] = True
+        try:
+            if job.segmented_audio:
+                # Audio already went out sentence by sentence
+                message["audio_segments"] = job.segment_count
+                self._translation_sent(job)
+                await self._send(message)
+            else:
+                if job.streaming_audio:
+                    # The result is the stream header and goes out first
+                    self._translation_sent(job)
+                first_audio = await self._send_audio(message, job, result["translation"])
+                self._translation_sent(job)
+                TIME_TO_FIRST_AUDIO.observe(first_audio - job.started)
+        except BaseException:
+            self._cancel_enrichment(job)
+            raise
+        finally:
+            job.delivered.set()
+            audio_format, size = self._audio_bytes.pop(job.exchange_id, (None, 0))
+            if size:
+                AUDIO_BYTES.labels(audio_format).observe(size)
+
+    # ── Sender ───────────────────────────────────────────────────────────────
+
+    async def _sender(self) -> None:
+        seconds = STAGE_SECONDS.labels("send")
+        while True:
+            message = await self._out_q.get()
+            started = time.perf_counter()
+            if isinstance(message, bytes):
+                WS_MESSAGES.labels("out", "audio_binary").inc()
+                await self.websocket.send_bytes(message)
+            else:
+                WS_MESSAGES.labels("out", message["type"]).inc()
+                await self.websocket.send_json(message)
+            seconds.observe(time.perf_counter() - started)
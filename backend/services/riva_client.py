@@ -0,0 +1,142 @@
+"""Shared Riva gRPC channels and per-language request configs.
+
+ASR and TTS reach Riva through a small pool of long-lived channels per
+endpoint, kept open across idle periods by HTTP/2 keep-alive pings, and
+both services share them when they point at the same server. Recognition
+configs and synthesis parameters are built once per (language, sample
+rate) and reused, so a call only picks a channel and sends.
+"""
+
+from __future__ import annotations
+
+import functools
+import itertools
+import logging
+import threading
+
+from backend.config import (
+    RIVA_CHANNEL_POOL_SIZE,
+    RIVA_KEEPALIVE_S,
+    SUPPORTED_LANGUAGES,
+)
+
+logger = logging.getLogger(__name__)
+
+try:
+    import riva.client
+
+    RIVA_AVAILABLE = True
+except ImportError:
+    RIVA_AVAILABLE = False
+
+
+def riva_asr_code(lang: str) -> str:
+    """App language code to the Riva ASR language code."""
+    return SUPPORTED_LANGUAGES.get(lang, {}).get("riva_asr", lang)
+
+
+def riva_tts_code(lang: str) -> str:
+    """App language code to the Riva TTS language code."""
+    return SUPPORTED_LANGUAGES.get(lang, {}).get("riva_tts", lang)
+
+
+# ── Channels ─────────────────────────────────────────────────────────────────
+
+
+class ChannelPool:
+    """``size`` keep-alive channels per endpoint, handed out round-robin.
+
+    Each channel gets its own subchannel pool; by default gRPC would
+    collapse identical channels onto one TCP connection.
+    """
+
+    def __init__(self, size: int = RIVA_CHANNEL_POOL_SIZE, keepalive_s: float = RIVA_KEEPALIVE_S):
+        self.size = max(1, size)
+        self.options = [
+            ("grpc.keepalive_time_ms", int(keepalive_s * 1000)),
+            ("grpc.keepalive_timeout_ms", 10_000),
+            ("grpc.keepalive_permit_without_calls", 1),
+            ("grpc.http2.max_pings_without_data", 0),
+            ("grpc.use_local_subchannel_pool", 1),
+        ]
+        self._auths: dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def auths(self, endpoint: str) -> list:
+        """The endpoint's ``riva.client.Auth`` objects, one per channel."""
+        with self._lock:
+            if endpoint not in self._auths:
+                self._auths[endpoint] = [
+                    riva.client.Auth(uri=endpoint, use_ssl=False, options=self.options)
+                    for _ in range(self.size)
+                ]
+                logger.info(f"Opened {self.size} Riva channels to {endpoint}")
+            return self._auths[endpoint]
+
+    def services(self, endpoint: str, service_cls) -> itertools.cycle:
+        """Round-robin over one ``service_cls`` client per pooled channel."""
+        return itertools.cycle([service_cls(auth) for auth in self.auths(endpoint)])
+
+    def stats(self) -> dict:
+        return {endpoint: len(auths) for endpoint, auths in self._auths.items()}
+
+    def close(self) -> None:
+        with self._lock:
+            for auths in self._auths.values():
+                for auth in auths:
+                    auth.channel.close()
+            self._auths.clear()
+
+
+RIVA_CHANNELS = ChannelPool()
+
+
+# ── Per-language configs ─────────────────────────────────────────────────────
+# Shared between calls and threads; never mutate a returned config.
+
+
+@functools.lru_cache(maxsize=64)
+def recognition_config(lang: str, sample_rate: int = 16000):
+    """Offline ``RecognitionConfig`` for an app or Riva language code."""
+    return riva.client.RecognitionConfig(
+        encoding=riva.client.AudioEncoding.LINEAR_PCM,
+        sample_rate_hertz=sample_rate,
+        language_code=riva_asr_code(lang),
+        max_alternatives=1,
+        enable_automatic_punctuation=True,
+    )
+
+
+@functools.lru_cache(maxsize=64)
+def streaming_config(lang: str, sample_rate: int = 16000):
+    """``StreamingRecognitionConfig`` with interim results and word times."""
+    return riva.client.StreamingRecognitionConfig(
+        config=riva.client.RecognitionConfig(
+            encoding=riva.client.AudioEncoding.LINEAR_PCM,
+            sample_rate_hertz=sample_rate,
+            language_code=riva_asr_code(lang),
+            max_alternatives=1,
+            enable_automatic_punctuation=True,
+            enable_word_time_offsets=True,
+        ),
+        interim_results=True,
+    )
+
+
+@functools.lru_cache(maxsize=64)
+def synthesis_params(lang: str, sample_rate: int = 22050) -> dict:
+    """Keyword arguments for ``SpeechSynthesisService.synthesize``."""
+    return {
+        "voice_name": None,  # Default voice for the language
+        "language_code": riva_tts_code(lang),
+        "encoding": riva.client.AudioEncoding.LINEAR_PCM,
+        "sample_rate_hz": sample_rate,
+    }
+
+
+def prebuild(asr_rate: int = 16000, tts_rate: int = 22050) -> None:
+    """Build every supported language's configs up front."""
+    for lang in SUPPORTED_LANGUAGES:
+        recognition_config(lang, asr_rate)
+        streaming_config(lang, asr_rate)
+        synthesis_params(lang, tts_rate)
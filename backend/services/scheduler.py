@@ -0,0 +1,200 @@
+"""Urgency-aware scheduling of shared ASR / translation / TTS capacity.
+
+All connections share one GPU. Each backend gets a fixed number of slots,
+handed out by priority class rather than arrival order, so a critical
+exchange does not queue behind routine intakes:
+
+* ``critical`` and ``high`` may use every slot; ``routine`` work is capped
+  below capacity so a slot is normally free when something urgent arrives.
+* ``background`` is follow-up work nobody is waiting on (split-mode
+  enrichment): it shares the routine cap and is served after routine.
+* Waiters age: every ``aging_s`` seconds spent waiting is worth one class,
+  so routine work is delayed under load but never starved.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import re
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from backend.config import SCHEDULER_AGING_S, SCHEDULER_RESERVED_SLOTS
+
+CRITICAL = "critical"
+HIGH = "high"
+ROUTINE = "routine"
+BACKGROUND = "background"
+
+PRIORITY_CLASSES = (CRITICAL, HIGH, ROUTINE, BACKGROUND)
+_RANK = {c: i for i, c in enumerate(PRIORITY_CLASSES)}
+
+_URGENCY_CLASS = {"critical": CRITICAL, "high": HIGH, "medium": ROUTINE, "low": ROUTINE}
+
+# Red-flag phrases for a cheap pre-classification before the LLM has rated
+# urgency. Deliberately short: a miss only means the normal queue position.
+_RED_FLAGS = re.compile(
+    "|".join([
+        # en
+        r"chest pain", r"pain in (?:my|the) chest", r"can'?t breathe", r"cannot breathe",
+        r"not breathing", r"unconscious", r"unresponsive", r"stroke", r"seizure",
+        r"overdose", r"bleeding (?:a lot|heavily|badly)", r"anaphyla", r"suicid",
+        # es / pt / it / fr
+        r"dolor (?:de|en el) pecho", r"no puedo respirar", r"inconsciente", r"convulsi",
+        r"dor no peito", r"não consigo respirar", r"dolore al petto",
+        r"douleur (?:à la|thoracique)", r"je ne peux pas respirer",
+        # de / ru
+        r"brustschmerz", r"keine luft", r"боль в груди", r"не могу дышать",
+        # zh / ja / ko / ar / hi / vi
+        r"胸痛", r"胸口痛", r"胸口很痛", r"喘不过气", r"呼吸困难", r"昏迷",
+        r"胸が痛", r"息ができない", r"가슴 통증", r"숨을 쉴 수",
+        r"ألم في الصدر", r"لا أستطيع التنفس",
+        r"सीने में दर्द", r"सांस नहीं", r"đau ngực", r"không thở được",
+    ]),
+    re.IGNORECASE,
+)
+
+
+def urgency_class(urgency: str | None) -> str:
+    """Map an LLM urgency rating to a priority class."""
+    return _URGENCY_CLASS.get((urgency or "").lower(), ROUTINE)
+
+
+def classify_text(text: str) -> str:
+    """Local pre-classification of an utterance, before translation."""
+    return CRITICAL if _RED_FLAGS.search(text) else ROUTINE
+
+
+def most_urgent(*classes: str) -> str:
+    return min(classes, key=_RANK.__getitem__)
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 1)
+
+
+class _Waiter:
+    __slots__ = ("priority", "enqueued", "seq", "future")
+
+    def __init__(self, priority: str, seq: int, future: asyncio.Future):
+        self.priority = priority
+        self.enqueued = time.monotonic()
+        self.seq = seq
+        self.future = future
+
+
+class ResourceScheduler:
+    """Priority-ordered slots for one backend service."""
+
+    def __init__(
+        self,
+        name: str,
+        capacity: int,
+        reserved: int = SCHEDULER_RESERVED_SLOTS,
+        aging_s: float = SCHEDULER_AGING_S,
+        history: int = 256,
+    ):
+        self.name = name
+        self.capacity = max(1, capacity)
+        self.aging_s = aging_s
+        self.limits = {
+            CRITICAL: self.capacity,
+            HIGH: self.capacity,
+            ROUTINE: max(1, self.capacity - reserved),
+            BACKGROUND: max(1, self.capacity - reserved),
+        }
+        self._in_flight = {c: 0 for c in PRIORITY_CLASSES}
+        self._waiters: list[_Waiter] = []
+        self._seq = itertools.count()
+        self._waits = {c: deque(maxlen=history) for c in PRIORITY_CLASSES}
+        self._granted = {c: 0 for c in PRIORITY_CLASSES}
+
+    @property
+    def in_flight(self) -> int:
+        return sum(self._in_flight.values())
+
+    async def acquire(self, priority: str) -> None:
+        future = asyncio.get_running_loop().create_future()
+        waiter = _Waiter(priority, next(self._seq), future)
+        self._waiters.append(waiter)
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just as we were cancelled: hand the slot back
+                self.release(priority)
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self, priority: str) -> None:
+        self._in_flight[priority] -= 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, priority: str) -> AsyncIterator[None]:
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release(priority)
+
+    def _load(self, priority: str) -> int:
+        """Slots counted against ``priority``'s limit."""
+        if priority in (ROUTINE, BACKGROUND):
+            return self._in_flight[ROUTINE] + self._in_flight[BACKGROUND]
+        return self._in_flight[priority]
+
+    def _dispatch(self) -> None:
+        now = time.monotonic()
+        while self._waiters and self.in_flight < self.capacity:
+            eligible = [
+                w for w in self._waiters
+                if self._load(w.priority) < self.limits[w.priority]
+            ]
+            if not eligible:
+                return
+            # Lower is better; waiting time is credited against the class rank
+            waiter = min(
+                eligible,
+                key=lambda w: (_RANK[w.priority] - (now - w.enqueued) / self.aging_s, w.seq),
+            )
+            self._waiters.remove(waiter)
+            self._in_flight[waiter.priority] += 1
+            self._granted[waiter.priority] += 1
+            self._waits[waiter.priority].append(now - waiter.enqueued)
+            waiter.future.set_result(None)
+
+    def stats(self) -> dict:
+        classes = {}
+        for c in PRIORITY_CLASSES:
+            waits = sorted(self._waits[c])
+            classes[c] = {
+                "limit": self.limits[c],
+                "in_flight": self._in_flight[c],
+                "waiting": sum(1 for w in self._waiters if w.priority == c),
+                "granted": self._granted[c],
+                "wait_ms_avg": _ms(sum(waits) / len(waits)) if waits else 0.0,
+                "wait_ms_p95": _ms(waits[min(len(waits) - 1, int(len(waits) * 0.95))]) if waits else 0.0,
+                "wait_ms_max": _ms(waits[-1]) if waits else 0.0,
+            }
+        return {"capacity": self.capacity, "in_flight": self.in_flight, "classes": classes}
+
+
+class Scheduler:
+    """One ``ResourceScheduler`` per shared backend (asr, translate, tts)."""
+
+    def __init__(self, capacities: dict[str, int]):
+        self._resources = {
+            name: ResourceScheduler(name, capacity) for name, capacity in capacities.items()
+        }
+
+    def slot(self, resource: str, priority: str):
+        return self._resources[resource].slot(priority)
+
+    def stats(self) -> dict:
+        return {name: r.stats() for name, r in self._resources.items()}
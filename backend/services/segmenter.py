@@ -0,0 +1,102 @@
+"""Sentence segmentation for pipelined TTS, across the supported scripts."""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+
+# Terminators that end a sentence only when followed by whitespace (or the
+# end of the text): Latin/Cyrillic/Vietnamese ". ! ?", Arabic "؟ ؛ ۔" and the
+# ellipsis. Requiring whitespace keeps "1.5 mg" and "180/110." intact.
+_SPACED_TERMINATORS = ".!?;…؟؛۔"
+
+# Terminators that end a sentence on their own: CJK full-width punctuation
+# (zh-CN, ja-JP; Korean uses Latin punctuation) and the Devanagari danda.
+_UNSPACED_TERMINATORS = "。！？；｡।॥"
+
+_CLOSERS = "\"'”’»)]）」』"
+
+_ABBREVIATIONS = {
+    "dr", "mr", "mrs", "ms", "st", "vs", "no", "approx", "e.g", "i.e",
+    "etc", "sr", "sra", "dra", "nr", "z.b", "p.ex", "ca",
+}
+
+_BOUNDARY = re.compile(
+    rf"[{re.escape(_UNSPACED_TERMINATORS)}]+[{re.escape(_CLOSERS)}]*"
+    rf"|[{re.escape(_SPACED_TERMINATORS)}]+[{re.escape(_CLOSERS)}]*(?=\s)"
+)
+
+
+def _weight(text: str) -> int:
+    """Length where full-width (CJK) characters count double."""
+    return sum(2 if unicodedata.east_asian_width(ch) in "WF" else 1 for ch in text)
+
+
+def _is_abbreviation(text: str, end: int) -> bool:
+    if text[end - 1] != ".":
+        return False
+    start = end - 1
+    while start > 0 and not text[start - 1].isspace():
+        start -= 1
+    return text[start : end - 1].lower() in _ABBREVIATIONS
+
+
+class SentenceSegmenter:
+    """Incrementally cuts text into sentences as it streams in.
+
+    ``feed`` returns the sentences completed so far; ``flush`` returns the
+    remainder. Sentences shorter than ``min_chars`` (full-width characters
+    count double) are held back and joined with the next one so TTS is not
+    fed single words like "Yes."
+    """
+
+    def __init__(self, min_chars: int = 12):
+        self.min_chars = min_chars
+        self._buf = ""
+        self._pending = ""
+        self._joiner = " "
+
+    def feed(self, text: str) -> list[str]:
+        self._buf += text
+        sentences: list[str] = []
+        cut = 0
+        for match in _BOUNDARY.finditer(self._buf):
+            end = match.end()
+            if _is_abbreviation(self._buf, match.start() + 1):
+                continue
+            self._emit(self._buf[cut:end], sentences)
+            cut = end
+        self._buf = self._buf[cut:]
+        return sentences
+
+    def flush(self) -> list[str]:
+        rest = self._join(self._buf.strip())
+        self._pending = ""
+        self._buf = ""
+        return [rest] if rest else []
+
+    def _join(self, piece: str) -> str:
+        if not self._pending:
+            return piece
+        if not piece:
+            return self._pending
+        return f"{self._pending}{self._joiner}{piece}"
+
+    def _emit(self, piece: str, out: list[str]) -> None:
+        piece = piece.strip()
+        if not piece:
+            return
+        sentence = self._join(piece)
+        if _weight(sentence) < self.min_chars:
+            # CJK and Devanagari sentences are joined without a space
+            self._pending = sentence
+            self._joiner = "" if piece.rstrip(_CLOSERS)[-1:] in _UNSPACED_TERMINATORS else " "
+            return
+        self._pending = ""
+        out.append(sentence)
+
+
+def split_sentences(text: str, min_chars: int = 12) -> list[str]:
+    """Split a complete text into TTS-sized sentences."""
+    segmenter = SentenceSegmenter(min_chars)
+    return segmenter.feed(text) + segmenter.flush()
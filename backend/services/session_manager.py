@@ -1,15 +1,40 @@
-"""Session lifecycle management. No persistent storage — all in-memory."""
+"""Session lifecycle management. No persistent storage — all in-memory.
+
+Sessions are evicted in the background: active sessions idle for longer
+than ``SESSION_IDLE_TIMEOUT_S`` (a phone that dropped mid-call) are ended
+and purged, ended sessions are dropped after ``SESSION_ENDED_TTL_S``, and
+the least recently used sessions go first when the count or estimated
+memory exceeds its cap.
+"""
 
 from __future__ import annotations
 
+import asyncio
+import logging
+import sys
 import time
 import uuid
+from collections import Counter, OrderedDict
 from dataclasses import dataclass, field
+from typing import Callable
+
+from backend.config import (
+    SESSION_ENDED_TTL_S,
+    SESSION_EVICTION_INTERVAL_S,
+    SESSION_IDLE_TIMEOUT_S,
+    SESSION_MAX_COUNT,
+    SESSION_MAX_MEMORY_MB,
+)
+from backend.services.medical_ner import (
+    ClinicalAggregate,
+    MedicalEntity,
+    build_clinical_summary,
+)
 
-from backend.services.medical_ner import MedicalEntity, build_clinical_summary
+logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class TranslationExchange:
     """A single translation exchange within a session."""
     speaker: str  # "patient" or "provider"
@@ -21,7 +46,26 @@ class TranslationExchange:
     timestamp: float = field(default_factory=time.time)
 
 
-@dataclass
+def _terms_bytes(terms: list[MedicalEntity]) -> int:
+    size = sys.getsizeof(terms)
+    for t in terms:
+        size += sys.getsizeof(t) + sum(sys.getsizeof(v) for v in t.values())
+    return size
+
+
+def exchange_bytes(exchange: TranslationExchange) -> int:
+    """Approximate memory held by one exchange (object, text, terms, flags)."""
+    return (
+        sys.getsizeof(exchange)
+        + sys.getsizeof(exchange.original)
+        + sys.getsizeof(exchange.translation)
+        + _terms_bytes(exchange.medical_terms)
+        + sys.getsizeof(exchange.flags)
+        + sum(sys.getsizeof(f) for f in exchange.flags)
+    )
+
+
+@dataclass(slots=True)
 class Session:
     """An active translation session."""
     session_id: str
@@ -32,6 +76,12 @@ class Session:
     exchanges: list[TranslationExchange] = field(default_factory=list)
     current_speaker: str = "patient"
     active: bool = True
+    last_activity: float = field(default_factory=time.time)
+    ended_at: float | None = None
+    # Estimated bytes held by ``exchanges``, kept current on every change
+    exchange_bytes: int = 0
+    # Deduplicated terms, flags and urgency, maintained as exchanges arrive
+    clinical: ClinicalAggregate = field(default_factory=ClinicalAggregate)
 
     @property
     def exchange_count(self) -> int:
@@ -39,7 +89,11 @@ class Session:
 
     @property
     def duration_seconds(self) -> float:
-        return time.time() - self.start_time
+        return (self.ended_at or time.time()) - self.start_time
+
+    @property
+    def memory_bytes(self) -> int:
+        return sys.getsizeof(self) + sys.getsizeof(self.exchanges) + self.exchange_bytes
 
     @property
     def all_medical_terms(self) -> list[MedicalEntity]:
@@ -52,21 +106,42 @@ class Session:
 class SessionManager:
     """Manages translation sessions. CRITICAL: No audio stored. No transcripts persisted."""
 
-    def __init__(self):
-        self._sessions: dict[str, Session] = {}
+    def __init__(
+        self,
+        idle_timeout: float = SESSION_IDLE_TIMEOUT_S,
+        ended_ttl: float = SESSION_ENDED_TTL_S,
+        max_sessions: int = SESSION_MAX_COUNT,
+        max_memory_bytes: int = SESSION_MAX_MEMORY_MB * 1024 * 1024,
+        clock: Callable[[], float] = time.time,
+    ):
+        # Least recently active first, so eviction scans start at the front
+        self._sessions: OrderedDict[str, Session] = OrderedDict()
         self._daily_count: int = 0
         self._day_start: float = time.time()
+        self.idle_timeout = idle_timeout
+        self.ended_ttl = ended_ttl
+        self.max_sessions = max(1, max_sessions)
+        self.max_memory_bytes = max_memory_bytes
+        self._clock = clock
+        self._memory_bytes = 0
+        self._evicted: Counter[str] = Counter()
+        self._eviction_task: asyncio.Task | None = None
 
     def create_session(
         self, source_lang: str, target_lang: str, mode: str = "conversation"
     ) -> Session:
         session_id = str(uuid.uuid4())[:8]
+        now = self._clock()
         session = Session(
             session_id=session_id,
             source_lang=source_lang,
             target_lang=target_lang,
             mode=mode,
+            start_time=now,
+            last_activity=now,
         )
+        if len(self._sessions) >= self.max_sessions:
+            self._enforce_caps(self.max_sessions - 1)
         self._sessions[session_id] = session
         self._daily_count += 1
         return session
@@ -74,11 +149,55 @@ class SessionManager:
     def get_session(self, session_id: str) -> Session | None:
         return self._sessions.get(session_id)
 
-    def add_exchange(self, session_id: str, exchange: TranslationExchange) -> bool:
+    def _touch(self, session: Session) -> None:
+        session.last_activity = self._clock()
+        self._sessions.move_to_end(session.session_id)
+
+    def _resize(self, session: Session, delta: int) -> None:
+        session.exchange_bytes += delta
+        self._memory_bytes += delta
+
+    def turn_context(self, session_id: str, recent: int = 3) -> tuple[str, list[str]] | None:
+        """Current speaker and the urgency of the last ``recent`` exchanges."""
+        session = self._sessions.get(session_id)
+        if not session:
+            return None
+        return session.current_speaker, [ex.urgency for ex in session.exchanges[-recent:]]
+
+    def add_exchange(self, session_id: str, exchange: TranslationExchange) -> int | None:
+        """Store an exchange; returns its index in the session, or None if not active."""
         session = self._sessions.get(session_id)
         if not session or not session.active:
-            return False
+            return None
         session.exchanges.append(exchange)
+        session.clinical.add(exchange.medical_terms, exchange.flags, exchange.urgency)
+        self._resize(session, exchange_bytes(exchange))
+        self._touch(session)
+        return len(session.exchanges) - 1
+
+    def enrich_exchange(
+        self,
+        session_id: str,
+        index: int,
+        medical_terms: list[MedicalEntity],
+        flags: list[str],
+        urgency: str,
+    ) -> bool:
+        """Merge late-arriving terms, flags and urgency into a stored exchange.
+
+        ``index`` is what ``add_exchange`` returned; exchanges are addressed
+        by index so this also works through a process-shared store.
+        """
+        session = self._sessions.get(session_id)
+        if not session or not session.active or not 0 <= index < len(session.exchanges):
+            return False
+        exchange = session.exchanges[index]
+        before = exchange_bytes(exchange)
+        session.clinical.enrich(exchange.urgency, medical_terms, flags, urgency)
+        exchange.medical_terms = medical_terms
+        exchange.flags = flags
+        exchange.urgency = urgency
+        self._resize(session, exchange_bytes(exchange) - before)
         return True
 
     def switch_speaker(self, session_id: str) -> str | None:
@@ -88,6 +207,7 @@ class SessionManager:
         session.current_speaker = (
             "provider" if session.current_speaker == "patient" else "patient"
         )
+        self._touch(session)
         return session.current_speaker
 
     def end_session(self, session_id: str) -> dict | None:
@@ -97,8 +217,8 @@ class SessionManager:
             return None
 
         session.active = False
-        all_terms = session.all_medical_terms
-        clinical = build_clinical_summary(all_terms)
+        session.ended_at = self._clock()
+        clinical = session.clinical.snapshot()
 
         summary = {
             "session_id": session.session_id,
@@ -106,21 +226,31 @@ class SessionManager:
             "source_lang": session.source_lang,
             "target_lang": session.target_lang,
             "exchange_count": session.exchange_count,
-            "medical_terms": [dict(t) for t in all_terms],
-            "clinical_summary": clinical,
-            "flags": [],
+            "medical_terms": clinical["medical_terms"],
+            "clinical_summary": clinical["clinical_summary"],
+            "flags": clinical["flags"],
+            "urgency": clinical["urgency"],
             "mode": session.mode,
         }
 
-        # Collect all flags
-        for ex in session.exchanges:
-            summary["flags"].extend(ex.flags)
-
         # CRITICAL: Purge exchange data — no transcripts stored
-        session.exchanges.clear()
+        self._purge(session)
 
         return summary
 
+    def get_live_summary(self, session_id: str) -> dict | None:
+        """Running clinical summary of an active session, without walking it."""
+        session = self._sessions.get(session_id)
+        if not session or not session.active:
+            return None
+        return {
+            "session_id": session.session_id,
+            "duration_seconds": session.duration_seconds,
+            "exchange_count": session.exchange_count,
+            "current_speaker": session.current_speaker,
+            **session.clinical.snapshot(),
+        }
+
     def get_summary(self, session_id: str) -> dict | None:
         """Get summary for an ended session."""
         session = self._sessions.get(session_id)
@@ -152,6 +282,7 @@ class SessionManager:
                 "duration_seconds": s.duration_seconds,
                 "current_speaker": s.current_speaker,
                 "mode": s.mode,
+                "memory_bytes": s.memory_bytes,
             }
             for s in self._sessions.values()
             if s.active
@@ -167,13 +298,95 @@ class SessionManager:
             self._day_start = now
         return self._daily_count
 
-    def cleanup_old_sessions(self, max_age_seconds: int = 3600):
-        """Remove ended sessions older than max_age."""
-        now = time.time()
-        to_remove = [
-            sid
-            for sid, s in self._sessions.items()
-            if not s.active and (now - s.start_time) > max_age_seconds
-        ]
-        for sid in to_remove:
-            del self._sessions[sid]
+    # ── Eviction ─────────────────────────────────────────────────────────────
+
+    @property
+    def memory_bytes(self) -> int:
+        """Estimated bytes held by all sessions' exchanges."""
+        return self._memory_bytes
+
+    def _purge(self, session: Session) -> None:
+        session.exchanges.clear()
+        session.clinical.clear()
+        self._resize(session, -session.exchange_bytes)
+
+    def _remove(self, session_id: str, reason: str) -> None:
+        session = self._sessions.pop(session_id)
+        self._memory_bytes -= session.exchange_bytes
+        self._evicted[reason] += 1
+
+    def _enforce_caps(self, max_sessions: int) -> None:
+        """Drop least recently active sessions (ended ones first) until under the caps."""
+        if len(self._sessions) <= max_sessions and self._memory_bytes <= self.max_memory_bytes:
+            return
+        order = [sid for sid, s in self._sessions.items() if not s.active]
+        order += [sid for sid, s in self._sessions.items() if s.active]
+        dropped_active = 0
+        for sid in order:
+            session = self._sessions[sid]
+            if len(self._sessions) > max_sessions:
+                reason = "max_sessions"
+            elif self._memory_bytes > self.max_memory_bytes:
+                if not session.exchange_bytes:
+                    continue  # already purged; dropping it frees nothing
+                reason = "max_memory"
+            else:
+                break
+            dropped_active += session.active
+            self._remove(sid, reason)
+        if dropped_active:
+            logger.warning(f"Evicted {dropped_active} active sessions over the session caps")
+
+    def evict(self) -> int:
+        """One eviction pass; returns the number of sessions dropped or ended."""
+        before = sum(self._evicted.values())
+        now = self._clock()
+        for sid, session in list(self._sessions.items()):
+            if session.active:
+                if now - session.last_activity > self.idle_timeout:
+                    # Abandoned mid-call: purge now, drop once the TTL passes
+                    session.active = False
+                    session.ended_at = now
+                    self._purge(session)
+                    self._evicted["idle"] += 1
+            elif now - (session.ended_at or session.start_time) > self.ended_ttl:
+                self._remove(sid, "ended_ttl")
+        self._enforce_caps(self.max_sessions)
+        return sum(self._evicted.values()) - before
+
+    def start_eviction(self, interval: float = SESSION_EVICTION_INTERVAL_S) -> None:
+        if self._eviction_task is None:
+            self._eviction_task = asyncio.create_task(self._evict_loop(interval))
+
+    async def _evict_loop(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                evicted = self.evict()
+            except Exception as e:
+                logger.error(f"Session eviction error: {e}")
+                continue
+            if evicted:
+                logger.info(f"Evicted {evicted} sessions, {len(self._sessions)} remain")
+
+    async def stop_eviction(self) -> None:
+        if self._eviction_task is not None:
+            self._eviction_task.cancel()
+            try:
+                await self._eviction_task
+            except asyncio.CancelledError:
+                pass
+            self._eviction_task = None
+
+    def stats(self) -> dict:
+        active = sum(1 for s in self._sessions.values() if s.active)
+        return {
+            "sessions": len(self._sessions),
+            "active": active,
+            "ended": len(self._sessions) - active,
+            "memory_bytes": self._memory_bytes,
+            "daily_sessions": self.daily_session_count,
+            "max_sessions": self.max_sessions,
+            "max_memory_bytes": self.max_memory_bytes,
+            "evicted": dict(self._evicted),
+        }
@@ -0,0 +1,173 @@
+"""Session store backends: in-process or shared between worker processes.
+
+``local`` is a plain ``SessionManager`` in the worker's own memory, which
+only works with one worker. ``shared`` keeps a single ``SessionManager``
+in a store process and reaches it over a Unix socket, so a session created
+through ``/api/session/start`` on one worker is visible to the worker that
+handles its ``/ws/translate`` connection. Nothing is persisted in either
+case; the store process holds sessions in memory exactly as a single
+worker would, and evicts them the same way.
+
+The store process is started by the production launcher
+(``python -m backend.serve``), which passes the socket path and auth key
+to the workers through ``SESSION_STORE_SOCKET`` and
+``SESSION_STORE_AUTHKEY``.
+
+Code on the event loop goes through ``AsyncSessionStore``: a shared
+store call is a blocking socket round trip, so it runs on a thread.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from multiprocessing.managers import BaseManager
+from typing import Protocol
+
+from backend.config import (
+    SESSION_EVICTION_INTERVAL_S,
+    SESSION_STORE,
+    SESSION_STORE_AUTHKEY,
+    SESSION_STORE_SOCKET,
+)
+from backend.services.medical_ner import MedicalEntity
+from backend.services.session_manager import Session, SessionManager, TranslationExchange
+
+logger = logging.getLogger(__name__)
+
+
+class SessionStore(Protocol):
+    """What the server and the pipeline need from a session store."""
+
+    def create_session(self, source_lang: str, target_lang: str, mode: str = ...) -> Session: ...
+    def turn_context(self, session_id: str, recent: int = ...) -> tuple[str, list[str]] | None: ...
+    def add_exchange(self, session_id: str, exchange: TranslationExchange) -> int | None: ...
+    def enrich_exchange(
+        self, session_id: str, index: int, medical_terms: list[MedicalEntity],
+        flags: list[str], urgency: str,
+    ) -> bool: ...
+    def switch_speaker(self, session_id: str) -> str | None: ...
+    def end_session(self, session_id: str) -> dict | None: ...
+    def get_live_summary(self, session_id: str) -> dict | None: ...
+    def get_summary(self, session_id: str) -> dict | None: ...
+    def get_active_sessions(self) -> list[dict]: ...
+    def stats(self) -> dict: ...
+    def start_eviction(self) -> None: ...
+    async def stop_eviction(self) -> None: ...
+
+
+# Methods callable through the shared store's proxy
+_EXPOSED = (
+    "create_session", "turn_context", "add_exchange", "enrich_exchange", "switch_speaker",
+    "end_session", "get_live_summary", "get_summary", "get_active_sessions", "stats",
+)
+
+
+class _Synchronized:
+    """Serializes calls: the manager server runs each client on its own thread."""
+
+    def __init__(self, target: SessionManager):
+        self._target = target
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name: str):
+        method = getattr(self._target, name)
+
+        def call(*args, **kwargs):
+            with self._lock:
+                return method(*args, **kwargs)
+        return call
+
+
+class _StoreManager(BaseManager):
+    pass
+
+
+# ── Store process ────────────────────────────────────────────────────────────
+
+
+def serve(
+    address: str = SESSION_STORE_SOCKET,
+    authkey: bytes = SESSION_STORE_AUTHKEY,
+    eviction_interval: float = SESSION_EVICTION_INTERVAL_S,
+) -> None:
+    """Run the shared store until killed (the launcher's store process)."""
+    sessions = _Synchronized(SessionManager())
+    _StoreManager.register("sessions", callable=lambda: sessions, exposed=_EXPOSED)
+    server = _StoreManager(address=address, authkey=authkey).get_server()
+
+    def evict_forever():
+        while True:
+            time.sleep(eviction_interval)
+            try:
+                evicted = sessions.evict()
+            except Exception as e:
+                logger.error(f"Session eviction error: {e}")
+                continue
+            if evicted:
+                logger.info(f"Evicted {evicted} sessions")
+
+    threading.Thread(target=evict_forever, name="session-eviction", daemon=True).start()
+    logger.info(f"Session store listening on {address}")
+    server.serve_forever()
+
+
+# ── Worker side ──────────────────────────────────────────────────────────────
+
+
+class SharedSessionStore:
+    """Client of the store process; each call is one Unix-socket round trip."""
+
+    def __init__(self, address: str = SESSION_STORE_SOCKET, authkey: bytes = SESSION_STORE_AUTHKEY):
+        _StoreManager.register("sessions", exposed=_EXPOSED)
+        manager = _StoreManager(address=address, authkey=authkey)
+        manager.connect()
+        self._proxy = manager.sessions()
+        self.address = address
+
+    def __getattr__(self, name: str):
+        if name not in _EXPOSED:
+            raise AttributeError(name)
+        return getattr(self._proxy, name)
+
+    def start_eviction(self) -> None:
+        """No-op: the store process evicts."""
+
+    async def stop_eviction(self) -> None:
+        pass
+
+
+class AsyncSessionStore:
+    """Awaitable calls into a store, for the event loop.
+
+    Local calls are in-memory and run inline. Shared calls block on the
+    store socket and run on the default thread pool (the manager proxy
+    opens one connection per thread).
+    """
+
+    def __init__(self, store: SessionStore):
+        self.store = store
+        self._blocking = isinstance(store, SharedSessionStore)
+
+    def __getattr__(self, name: str):
+        if name not in _EXPOSED:
+            raise AttributeError(name)
+        method = getattr(self.store, name)
+
+        async def call(*args, **kwargs):
+            if self._blocking:
+                return await asyncio.to_thread(method, *args, **kwargs)
+            return method(*args, **kwargs)
+        return call
+
+
+def create_session_store(backend: str = SESSION_STORE) -> SessionStore:
+    if backend == "shared":
+        store = SharedSessionStore()
+        logger.info(f"Using shared session store at {store.address}")
+        return store
+    if backend != "local":
+        raise ValueError(f"Unknown SESSION_STORE {backend!r} (expected local or shared)")
+    return SessionManager()
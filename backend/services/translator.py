@@ -2,14 +2,32 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import random
 import time
+import unicodedata
+from collections import OrderedDict
+from typing import AsyncGenerator
 
 import httpx
 
-from backend.config import MOCK_MODE, NIM_ENDPOINT, NIM_MODEL
+from backend.config import (
+    MOCK_MODE,
+    NIM_BREAKER_FAILURE_THRESHOLD,
+    NIM_BREAKER_RESET_S,
+    NIM_ENDPOINT,
+    NIM_HEALTH_INTERVAL_S,
+    NIM_MODEL,
+    NIM_TRANSLATION_MAX_TOKENS,
+    TRANSLATION_CACHE_SIZE,
+    TRANSLATION_CACHE_TTL_S,
+)
+from backend.services.circuit_breaker import CLOSED, CircuitBreaker
+from backend.services.medical_ner import extract_terms
+from backend.services.metrics import BACKEND_SECONDS, ERRORS, FALLBACKS
+from backend.services.mock_latency import mock_delay
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +53,38 @@ Respond ONLY with valid JSON in this exact format:
 
 Do NOT include any text outside the JSON object."""
 
+# Split mode: a minimal translation-only call drives TTS, while entities,
+# flags and urgency come from a second call made in parallel.
+TRANSLATION_PROMPT = """You are a medical interpreter. Translate the user's text from {source_lang} to {target_lang} with perfect medical accuracy. Preserve the meaning, tone, and urgency of the original.
+
+Respond ONLY with valid JSON: {{"translation": "translated text here"}}"""
+
+ENRICHMENT_PROMPT = """You are a medical interpreter AI. The user's text is in {source_lang} and is being translated to {target_lang} separately; do NOT translate it. Your task is to:
+
+1. **Extract medical entities** from the text. Categorize each as one of: symptom, condition, medication, allergy, vital_sign, procedure, dosage, onset, severity.
+
+2. **Flag ambiguities** — if a word or phrase could have multiple medical interpretations, note them.
+
+3. **Assess urgency** — rate as "low", "medium", "high", or "critical" based on the medical content.
+
+Respond ONLY with valid JSON in this exact format:
+{{
+  "medical_terms": [
+    {{"term": "English medical term", "category": "symptom|condition|medication|allergy|vital_sign|procedure|dosage|onset|severity", "original": "term in source language"}}
+  ],
+  "flags": ["any ambiguity or warning notes"],
+  "urgency": "low|medium|high|critical"
+}}
+
+Do NOT include any text outside the JSON object."""
+
+# Prompt and max_tokens for each kind of NIM call
+_CALLS = {
+    "full": (SYSTEM_PROMPT, 1024),
+    "translation": (TRANSLATION_PROMPT, NIM_TRANSLATION_MAX_TOKENS),
+    "enrichment": (ENRICHMENT_PROMPT, 768),
+}
+
 # Mock translations for demo mode
 MOCK_TRANSLATIONS = {
     "zh-CN": {
@@ -106,6 +156,224 @@ MOCK_RESPONSES_POOL = [
 ]
 
 
+class IncrementalJSONObjectParser:
+    """Emits the top-level fields of a JSON object as soon as each completes.
+
+    Fed with LLM output chunks as they stream in. A string field such as
+    ``translation`` is emitted the moment its closing quote arrives, long
+    before the rest of the object (terms, flags, urgency) is generated.
+    """
+
+    def __init__(self):
+        self._buf = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._state = "start"
+        self._key = ""
+        self._token_start = 0
+        self.fields: dict = {}
+
+    def feed(self, text: str) -> list[tuple[str, object]]:
+        """Consume a chunk; return the (key, value) pairs completed by it."""
+        self._buf += text
+        completed: list[tuple[str, object]] = []
+        buf = self._buf
+        for i in range(self._pos, len(buf)):
+            c = buf[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._state == "key_string":
+                        self._key = self._decode(buf[self._token_start : i + 1])
+                        self._state = "colon"
+                    elif self._depth == 1 and self._state == "value_string":
+                        self._complete(buf[self._token_start : i + 1], completed)
+                continue
+
+            if c == '"':
+                self._in_string = True
+                if self._depth == 1 and self._state == "key":
+                    self._token_start = i
+                    self._state = "key_string"
+                elif self._depth == 1 and self._state == "value":
+                    self._token_start = i
+                    self._state = "value_string"
+            elif c in "{[":
+                if self._depth == 0:
+                    if c == "{":
+                        self._state = "key"
+                elif self._depth == 1 and self._state == "value":
+                    self._token_start = i
+                    self._state = "value_nested"
+                self._depth += 1
+            elif c in "}]":
+                self._depth -= 1
+                if self._depth == 1 and self._state == "value_nested":
+                    self._complete(buf[self._token_start : i + 1], completed)
+                elif self._depth == 0:
+                    if self._state == "value_scalar":
+                        self._complete(buf[self._token_start : i], completed)
+                    self._state = "done"
+            elif self._depth == 1:
+                if self._state == "colon" and c == ":":
+                    self._state = "value"
+                elif self._state == "value" and not c.isspace():
+                    self._token_start = i
+                    self._state = "value_scalar"
+                elif self._state == "value_scalar" and c == ",":
+                    self._complete(buf[self._token_start : i], completed)
+                    self._state = "key"
+                elif self._state == "after_value" and c == ",":
+                    self._state = "key"
+        self._pos = len(buf)
+        return completed
+
+    def partial_string(self) -> tuple[str, str] | None:
+        """The key and decoded-so-far text of a top-level string still streaming."""
+        if not (self._in_string and self._depth == 1 and self._state == "value_string"):
+            return None
+        raw = self._buf[self._token_start :]
+        # Trim a trailing partial escape sequence (at most 6 chars, e.g. "\u00e")
+        for trim in range(0, min(7, len(raw))):
+            try:
+                return self._key, json.loads(raw[: len(raw) - trim] + '"')
+            except ValueError:
+                continue
+        return None
+
+    @staticmethod
+    def _decode(raw: str):
+        return json.loads(raw.strip())
+
+    def _complete(self, raw: str, completed: list) -> None:
+        self._state = "after_value"
+        try:
+            value = self._decode(raw)
+        except ValueError:
+            return
+        self.fields[self._key] = value
+        completed.append((self._key, value))
+
+    @property
+    def text(self) -> str:
+        return self._buf
+
+
+CacheKey = tuple[str, str, str, str]
+
+
+class TranslationCache:
+    """Bounded in-memory LRU/TTL cache of translations with single-flight.
+
+    Keyed on normalized text plus language pair. Nothing is ever written to
+    disk, in keeping with the no-persistence rule in ``SessionManager``.
+    Concurrent identical requests share one in-flight LLM call.
+    """
+
+    def __init__(self, max_entries: int = TRANSLATION_CACHE_SIZE, ttl: float = TRANSLATION_CACHE_TTL_S):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[CacheKey, tuple[float, dict]] = OrderedDict()
+        self._inflight: dict[CacheKey, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl > 0
+
+    @staticmethod
+    def key(text: str, source_lang: str, target_lang: str, kind: str = "full") -> CacheKey:
+        normalized = " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+        return normalized, source_lang, target_lang, kind
+
+    def lookup(self, key: CacheKey) -> dict | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+            self.evictions += 1
+        self.misses += 1
+        return None
+
+    def store(self, key: CacheKey, value: dict) -> None:
+        if not self.enabled:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def join(self, key: CacheKey) -> asyncio.Future | None:
+        """The in-flight call for ``key``, if another request is already making it."""
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+        return future
+
+    def lead(self, key: CacheKey) -> asyncio.Future:
+        """Register the caller as the one making the call for ``key``."""
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        return future
+
+    def finish(self, key: CacheKey, result: dict | None, cacheable: bool) -> None:
+        """Publish the leader's result to followers (None if it was abandoned)."""
+        future = self._inflight.pop(key, None)
+        if future is not None and not future.done():
+            future.set_result(result)
+        if cacheable and result is not None:
+            self.store(key, result)
+
+    async def get_or_compute(self, key, compute) -> dict:
+        """``compute()`` returns ``(result, cacheable)``; only one runs per key."""
+        if not self.enabled:
+            result, _ = await compute()
+            return result
+        cached = self.lookup(key)
+        if cached is not None:
+            return cached
+        pending = self.join(key)
+        if pending is not None:
+            result = await asyncio.shield(pending)
+            if result is not None:
+                return result
+        self.lead(key)
+        result = None
+        cacheable = False
+        try:
+            result, cacheable = await compute()
+            return result
+        finally:
+            self.finish(key, result, cacheable)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "in_flight": len(self._inflight),
+        }
+
+
 class NIMTranslator:
     """Medical translation via NVIDIA NIM LLM."""
 
@@ -115,57 +383,289 @@ class NIMTranslator:
             timeout=httpx.Timeout(30.0, connect=5.0),
         )
         self._mock_index = 0
+        self._mock_recent: OrderedDict[tuple[str, str, str], dict] = OrderedDict()
+        self._breaker = CircuitBreaker(
+            "nim-llm", NIM_BREAKER_FAILURE_THRESHOLD, NIM_BREAKER_RESET_S
+        )
+        self._healthy: bool | None = None  # None until the first probe
+        self._last_check: float | None = None
+        self._monitor_task: asyncio.Task | None = None
+        self._cache = TranslationCache()
+
+    @property
+    def is_healthy(self) -> bool:
+        """Cached NIM availability from the background monitor."""
+        return bool(self._healthy) and self._breaker.state == CLOSED
+
+    def health(self) -> dict:
+        return {
+            "healthy": self.is_healthy,
+            "last_check_age_s": (
+                round(time.monotonic() - self._last_check, 1)
+                if self._last_check is not None
+                else None
+            ),
+            "circuit": self._breaker.snapshot(),
+            "cache": self._cache.stats(),
+        }
+
+    def start_health_monitor(self, interval: float = NIM_HEALTH_INTERVAL_S) -> None:
+        """Probe NIM in the background so translations never pay for it."""
+        if MOCK_MODE or self._monitor_task is not None:
+            return
+        self._monitor_task = asyncio.create_task(self._monitor(interval))
+
+    async def _monitor(self, interval: float):
+        while True:
+            self._healthy = await self._check_nim()
+            self._last_check = time.monotonic()
+            if self._healthy:
+                self._breaker.record_success()
+            else:
+                self._breaker.record_failure()
+            await asyncio.sleep(interval)
+
+    def _request_body(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        stream: bool = False,
+        kind: str = "full",
+    ) -> dict:
+        template, max_tokens = _CALLS[kind]
+        prompt = template.format(
+            source_lang=source_lang, target_lang=target_lang
+        )
+        body = {
+            "model": NIM_MODEL,
+            "messages": [
+                {"role": "system", "content": prompt},
+                {"role": "user", "content": text},
+            ],
+            "temperature": 0.1,
+            "max_tokens": max_tokens,
+            "response_format": {"type": "json_object"},
+        }
+        if stream:
+            body["stream"] = True
+        return body
+
+    @staticmethod
+    def _validated(result: dict, text: str, kind: str = "full") -> dict:
+        validated = {
+            "translation": result.get("translation", text),
+            "medical_terms": result.get("medical_terms", []),
+            "flags": result.get("flags", []),
+            "urgency": result.get("urgency", "medium"),
+        }
+        if kind == "enrichment":
+            del validated["translation"]
+        return validated
 
     async def translate(
         self,
         text: str,
         source_lang: str,
         target_lang: str,
+        translation_only: bool = False,
     ) -> dict:
         """Translate text and extract medical entities.
 
-        Returns dict with: translation, medical_terms, flags, urgency
+        Returns dict with: translation, medical_terms, flags, urgency. With
+        ``translation_only`` the model is only asked to translate; terms and
+        flags are empty and urgency is the default (see ``enrich``).
         """
-        if MOCK_MODE or not await self._check_nim():
-            return self._mock_translate(text, source_lang, target_lang)
+        kind = "translation" if translation_only else "full"
+        if MOCK_MODE:
+            await mock_delay("nim")
+            return self._mock(kind, text, source_lang, target_lang)
 
-        prompt = SYSTEM_PROMPT.format(
-            source_lang=source_lang, target_lang=target_lang
+        return await self._cache.get_or_compute(
+            TranslationCache.key(text, source_lang, target_lang, kind),
+            lambda: self._translate_uncached(text, source_lang, target_lang, kind),
         )
 
+    async def enrich(self, text: str, source_lang: str, target_lang: str) -> dict:
+        """Medical terms, flags and urgency for ``text``, without translating it.
+
+        The second half of split mode; safe to run alongside the
+        translation-only call. Returns dict with: medical_terms, flags, urgency
+        """
+        if MOCK_MODE:
+            await mock_delay("nim")
+            return self._mock("enrichment", text, source_lang, target_lang)
+
+        return await self._cache.get_or_compute(
+            TranslationCache.key(text, source_lang, target_lang, "enrichment"),
+            lambda: self._translate_uncached(text, source_lang, target_lang, "enrichment"),
+        )
+
+    async def _translate_uncached(
+        self, text: str, source_lang: str, target_lang: str, kind: str = "full"
+    ) -> tuple[dict, bool]:
+        """One NIM call. Returns (result, cacheable); fallbacks are not cacheable."""
+        if not self._breaker.allow_request():
+            return self._fallback(kind, text, source_lang, target_lang, "circuit_open"), False
+
+        reason = "error"
         try:
+            started = time.perf_counter()
             response = await self._client.post(
                 "/v1/chat/completions",
-                json={
-                    "model": NIM_MODEL,
-                    "messages": [
-                        {"role": "system", "content": prompt},
-                        {"role": "user", "content": text},
-                    ],
-                    "temperature": 0.1,
-                    "max_tokens": 1024,
-                    "response_format": {"type": "json_object"},
-                },
+                json=self._request_body(text, source_lang, target_lang, kind=kind),
             )
             response.raise_for_status()
+            BACKEND_SECONDS.labels("nim", kind).observe(time.perf_counter() - started)
+            self._breaker.record_success()
             data = response.json()
             content = data["choices"][0]["message"]["content"]
             result = json.loads(content)
 
             # Validate structure
-            return {
-                "translation": result.get("translation", text),
-                "medical_terms": result.get("medical_terms", []),
-                "flags": result.get("flags", []),
-                "urgency": result.get("urgency", "medium"),
-            }
+            return self._validated(result, text, kind), True
 
         except httpx.TimeoutException:
+            reason = "timeout"
             logger.error("NIM LLM request timed out")
-            return self._mock_translate(text, source_lang, target_lang)
+            self._breaker.record_failure()
+        except httpx.HTTPError as e:
+            reason = "http_error"
+            logger.error(f"NIM LLM error: {e}")
+            self._breaker.record_failure()
         except Exception as e:
             logger.error(f"NIM LLM error: {e}")
-            return self._mock_translate(text, source_lang, target_lang)
+        ERRORS.labels("nim").inc()
+        return self._fallback(kind, text, source_lang, target_lang, reason), False
+
+    async def translate_stream(
+        self,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+        translation_only: bool = False,
+    ) -> AsyncGenerator[tuple[str, object], None]:
+        """Streamed translation yielding fields as soon as each is generated.
+
+        Yields ``("translation_delta", str)`` as the translation text grows,
+        ``(field, value)`` pairs for top-level fields of the model's JSON
+        (``translation`` first, then ``medical_terms``, ``flags``,
+        ``urgency``), and always finishes with ``("result", dict)`` holding
+        the same validated dict ``translate`` returns.
+        """
+        kind = "translation" if translation_only else "full"
+        if MOCK_MODE:
+            await mock_delay("nim")
+            result = self._mock(kind, text, source_lang, target_lang)
+            async for item in self._replay(result):
+                yield item
+            return
+
+        key = TranslationCache.key(text, source_lang, target_lang, kind)
+        if self._cache.enabled:
+            result = self._cache.lookup(key)
+            pending = self._cache.join(key) if result is None else None
+            if pending is not None:
+                result = await asyncio.shield(pending)
+            if result is not None:
+                async for item in self._replay(result):
+                    yield item
+                return
+            self._cache.lead(key)
+
+        result = None
+        cacheable = False
+        try:
+            async for name, value in self._stream_uncached(text, source_lang, target_lang, kind):
+                if name == "result":
+                    result, cacheable = value
+                    yield "result", result
+                else:
+                    yield name, value
+        finally:
+            if self._cache.enabled:
+                self._cache.finish(key, result, cacheable)
+
+    @staticmethod
+    async def _replay(result: dict) -> AsyncGenerator[tuple[str, object], None]:
+        """Yield a finished result in the same shape as a live stream."""
+        yield "translation_delta", result["translation"]
+        yield "translation", result["translation"]
+        yield "result", result
+
+    async def _stream_uncached(
+        self, text: str, source_lang: str, target_lang: str, kind: str = "full"
+    ) -> AsyncGenerator[tuple[str, object], None]:
+        """One streamed NIM call; ends with ("result", (result, cacheable))."""
+        if not self._breaker.allow_request():
+            result = self._fallback(kind, text, source_lang, target_lang, "circuit_open")
+            yield "translation_delta", result["translation"]
+            yield "translation", result["translation"]
+            yield "result", (result, False)
+            return
+
+        parser = IncrementalJSONObjectParser()
+        sent = 0  # characters of the translation already yielded as deltas
+        reason = "error"
+        started = time.perf_counter()
+        try:
+            async with self._client.stream(
+                "POST",
+                "/v1/chat/completions",
+                json=self._request_body(text, source_lang, target_lang, stream=True, kind=kind),
+            ) as response:
+                response.raise_for_status()
+                self._breaker.record_success()
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        break
+                    chunk = json.loads(data)
+                    choices = chunk.get("choices") or [{}]
+                    delta = choices[0].get("delta", {}).get("content") or ""
+                    for key, value in parser.feed(delta):
+                        if key == "translation" and isinstance(value, str):
+                            if len(value) > sent:
+                                yield "translation_delta", value[sent:]
+                                sent = len(value)
+                        yield key, value
+                    partial = parser.partial_string()
+                    if partial and partial[0] == "translation" and len(partial[1]) > sent:
+                        yield "translation_delta", partial[1][sent:]
+                        sent = len(partial[1])
+
+            BACKEND_SECONDS.labels("nim", f"{kind}_stream").observe(time.perf_counter() - started)
+            result = parser.fields
+            if "translation" not in result:
+                # Model did not produce parseable fields incrementally
+                result = json.loads(parser.text)
+            yield "result", (self._validated(result, text, kind), True)
+            return
+
+        except httpx.TimeoutException:
+            reason = "timeout"
+            logger.error("NIM LLM stream timed out")
+            self._breaker.record_failure()
+        except httpx.HTTPError as e:
+            reason = "http_error"
+            logger.error(f"NIM LLM stream error: {e}")
+            self._breaker.record_failure()
+        except Exception as e:
+            logger.error(f"NIM LLM stream error: {e}")
+        ERRORS.labels("nim").inc()
+
+        if "translation" in parser.fields:
+            FALLBACKS.labels("nim", f"{reason}_partial").inc()
+            # Keep what already reached the client rather than contradict it
+            yield "result", (self._validated(parser.fields, text, kind), False)
+        else:
+            result = self._fallback(kind, text, source_lang, target_lang, reason)
+            if not sent:
+                yield "translation_delta", result["translation"]
+            yield "translation", result["translation"]
+            yield "result", (result, False)
 
     async def _check_nim(self) -> bool:
         """Check if NIM endpoint is reachable."""
@@ -175,6 +675,38 @@ class NIMTranslator:
         except Exception:
             return False
 
+    def _fallback(
+        self, kind: str, text: str, source_lang: str, target_lang: str, reason: str
+    ) -> dict:
+        """Result when NIM is unavailable: terms come from the local lexicon,
+        not from the canned mock."""
+        FALLBACKS.labels("nim", reason).inc()
+        result = self._mock(kind, text, source_lang, target_lang)
+        if "medical_terms" in result:
+            result = {
+                **result,
+                "medical_terms": [dict(t) for t in extract_terms(text, source_lang)],
+                "flags": [],
+            }
+        return result
+
+    def _mock(self, kind: str, text: str, source_lang: str, target_lang: str) -> dict:
+        """Mock result for one kind of call."""
+        if kind == "full":
+            return self._mock_translate(text, source_lang, target_lang)
+        # The two halves of split mode must describe the same mock response,
+        # whichever of them runs first
+        key = (text, source_lang, target_lang)
+        mock = self._mock_recent.pop(key, None)
+        if mock is None:
+            mock = self._mock_translate(text, source_lang, target_lang)
+        self._mock_recent[key] = mock
+        while len(self._mock_recent) > 64:
+            self._mock_recent.popitem(last=False)
+        if kind == "enrichment":
+            return self._validated(mock, text, kind)
+        return self._validated({"translation": mock["translation"]}, text, kind)
+
     def _mock_translate(self, text: str, source_lang: str, target_lang: str) -> dict:
         """Generate a mock translation for demo mode."""
         # Check if we have a specific mock for this language
@@ -198,4 +730,6 @@ class NIMTranslator:
         }
 
     async def close(self):
+        if self._monitor_task is not None:
+            self._monitor_task.cancel()
         await self._client.aclose()
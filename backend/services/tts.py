@@ -3,12 +3,25 @@
 from __future__ import annotations
 
 import base64
+import functools
 import io
 import logging
 import struct
+import time
 import wave
+from collections import OrderedDict
+from typing import AsyncGenerator
 
-from backend.config import MOCK_MODE, RIVA_TTS_ENDPOINT
+from backend.config import (
+    MOCK_MODE,
+    RIVA_TTS_ENDPOINT,
+    RIVA_TTS_MAX_CONCURRENCY,
+    TTS_CACHE_MAX_BYTES,
+)
+from backend.services.executor import ServiceExecutor
+from backend.services.metrics import BACKEND_SECONDS, ERRORS, FALLBACKS
+from backend.services.mock_latency import mock_delay
+from backend.services.riva_client import RIVA_CHANNELS, prebuild, synthesis_params
 
 logger = logging.getLogger(__name__)
 
@@ -21,72 +34,243 @@ except ImportError:
     logger.warning("nvidia-riva-client not installed — TTS will use mock mode")
 
 
-def _generate_silence_wav(duration_ms: int = 500, sample_rate: int = 22050) -> bytes:
-    """Generate a silent WAV file for mock mode."""
-    num_samples = int(sample_rate * duration_ms / 1000)
+# Output rate of synthesized speech unless a caller asks for another
+TTS_SAMPLE_RATE = 22050
+
+# Mock online synthesis: silence delivered in chunks of this length
+_MOCK_CHUNK_MS = 200
+
+
+def pcm_to_wav(pcm: bytes, sample_rate: int) -> bytes:
+    """Wrap raw 16-bit mono PCM in a WAV container."""
     buf = io.BytesIO()
     with wave.open(buf, "wb") as wf:
         wf.setnchannels(1)
         wf.setsampwidth(2)
         wf.setframerate(sample_rate)
-        wf.writeframes(b"\x00\x00" * num_samples)
+        wf.writeframes(pcm)
     return buf.getvalue()
 
 
+def wav_to_pcm(wav: bytes) -> bytes:
+    """Raw PCM frames of a WAV file."""
+    with wave.open(io.BytesIO(wav), "rb") as wf:
+        return wf.readframes(wf.getnframes())
+
+
+@functools.lru_cache(maxsize=8)
+def _generate_silence_wav(duration_ms: int = 500, sample_rate: int = TTS_SAMPLE_RATE) -> bytes:
+    """Generate a silent WAV file for mock mode."""
+    num_samples = int(sample_rate * duration_ms / 1000)
+    return pcm_to_wav(b"\x00\x00" * num_samples, sample_rate)
+
+
+class AudioCache:
+    """Byte-bounded in-memory LRU of synthesized WAV audio.
+
+    Keyed on (text, language, sample_rate, voice). Only synthesized speech
+    of translations is held, never patient audio, and only in memory.
+    """
+
+    def __init__(self, max_bytes: int = TTS_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple, bytes] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: tuple) -> bytes | None:
+        audio = self._entries.get(key)
+        if audio is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return audio
+
+    def put(self, key: tuple, audio: bytes) -> None:
+        if len(audio) > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= len(old)
+        self._entries[key] = audio
+        self._bytes += len(audio)
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+            self.evictions += 1
+
+    def __contains__(self, key: tuple) -> bool:
+        return key in self._entries
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
 class RivaTTS:
     """Text-to-speech via NVIDIA Riva."""
 
     def __init__(self, language_code: str = "en-US"):
         self.language_code = language_code
-        self._auth = None
-        self._service = None
+        self._services = None
+        self._executor = ServiceExecutor("riva-tts", RIVA_TTS_MAX_CONCURRENCY)
+        self._cache = AudioCache()
 
         if RIVA_AVAILABLE and not MOCK_MODE:
             try:
-                self._auth = riva.client.Auth(
-                    uri=RIVA_TTS_ENDPOINT, use_ssl=False
+                self._services = RIVA_CHANNELS.services(
+                    RIVA_TTS_ENDPOINT, riva.client.SpeechSynthesisService
                 )
-                self._service = riva.client.SpeechSynthesisService(self._auth)
+                prebuild(tts_rate=TTS_SAMPLE_RATE)
                 logger.info(f"Riva TTS connected at {RIVA_TTS_ENDPOINT}")
             except Exception as e:
                 logger.error(f"Failed to connect to Riva TTS: {e}")
-                self._service = None
+                self._services = None
 
     @property
     def is_available(self) -> bool:
-        return self._service is not None
+        return self._services is not None
+
+    @property
+    def executor(self) -> ServiceExecutor:
+        return self._executor
+
+    @property
+    def cache(self) -> AudioCache:
+        return self._cache
+
+    def is_cached(
+        self, text: str, language_code: str | None = None, sample_rate: int = TTS_SAMPLE_RATE
+    ) -> bool:
+        """Whether synthesizing ``text`` would be served from the cache."""
+        return (text, language_code or self.language_code, sample_rate, None) in self._cache
 
     async def synthesize(
-        self, text: str, language_code: str | None = None, sample_rate: int = 22050
+        self, text: str, language_code: str | None = None, sample_rate: int = TTS_SAMPLE_RATE
     ) -> str:
         """Synthesize speech from text.
 
         Returns base64-encoded WAV audio.
         """
+        wav_bytes = await self.synthesize_wav(text, language_code, sample_rate)
+        return base64.b64encode(wav_bytes).decode("utf-8")
+
+    async def synthesize_wav(
+        self, text: str, language_code: str | None = None, sample_rate: int = TTS_SAMPLE_RATE
+    ) -> bytes:
+        """Synthesize speech from text.
+
+        Returns raw WAV bytes (for binary WebSocket frames).
+        """
         lang = language_code or self.language_code
 
         if not self.is_available or MOCK_MODE:
-            wav_bytes = _generate_silence_wav(duration_ms=1000, sample_rate=sample_rate)
-            return base64.b64encode(wav_bytes).decode("utf-8")
+            await mock_delay("tts")
+            return _generate_silence_wav(duration_ms=1000, sample_rate=sample_rate)
+
+        key = (text, lang, sample_rate, None)  # None: default voice for language
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
 
         try:
-            resp = self._service.synthesize(
-                text,
-                voice_name=None,  # Use default voice for language
-                language_code=lang,
-                encoding=riva.client.AudioEncoding.LINEAR_PCM,
-                sample_rate_hz=sample_rate,
+            started = time.perf_counter()
+            resp = await self._executor.run(
+                next(self._services).synthesize, text, **synthesis_params(lang, sample_rate)
+            )
+            BACKEND_SECONDS.labels("riva_tts", "synthesize").observe(
+                time.perf_counter() - started
             )
-            # Wrap raw PCM in WAV
-            buf = io.BytesIO()
-            with wave.open(buf, "wb") as wf:
-                wf.setnchannels(1)
-                wf.setsampwidth(2)
-                wf.setframerate(sample_rate)
-                wf.writeframes(resp.audio)
-            return base64.b64encode(buf.getvalue()).decode("utf-8")
+            wav_bytes = pcm_to_wav(resp.audio, sample_rate)
+            self._cache.put(key, wav_bytes)
+            return wav_bytes
 
         except Exception as e:
+            ERRORS.labels("riva_tts").inc()
+            FALLBACKS.labels("riva_tts", "error").inc()
             logger.error(f"Riva TTS error: {e}")
-            wav_bytes = _generate_silence_wav()
-            return base64.b64encode(wav_bytes).decode("utf-8")
+            return _generate_silence_wav(sample_rate=sample_rate)
+
+    async def synthesize_online(
+        self, text: str, language_code: str | None = None, sample_rate: int = TTS_SAMPLE_RATE
+    ) -> AsyncGenerator[bytes, None]:
+        """Synthesize speech with Riva online synthesis.
+
+        Yields raw 16-bit mono PCM chunks as Riva produces them, so playback
+        can start before the rest of the sentence is synthesized. Cached
+        audio comes out as a single chunk; a complete stream is cached.
+        """
+        lang = language_code or self.language_code
+
+        if not self.is_available or MOCK_MODE:
+            await mock_delay("tts")
+            pcm = wav_to_pcm(_generate_silence_wav(duration_ms=1000, sample_rate=sample_rate))
+            step = sample_rate * _MOCK_CHUNK_MS // 1000 * 2
+            for offset in range(0, len(pcm), step):
+                yield pcm[offset:offset + step]
+            return
+
+        key = (text, lang, sample_rate, None)
+        cached = self._cache.get(key)
+        if cached is not None:
+            yield wav_to_pcm(cached)
+            return
+
+        chunks: list[bytes] = []
+        responses = None
+        started = time.perf_counter()
+        try:
+            service = next(self._services)
+            responses = await self._executor.run(
+                lambda: iter(
+                    service.synthesize_online(text, **synthesis_params(lang, sample_rate))
+                )
+            )
+            while True:
+                # One blocking read per chunk, off the event loop
+                resp = await self._executor.run(next, responses, None)
+                if resp is None:
+                    break
+                if resp.audio:
+                    chunks.append(resp.audio)
+                    yield resp.audio
+        except Exception as e:
+            ERRORS.labels("riva_tts").inc()
+            logger.error(f"Riva TTS online synthesis error: {e}")
+            if not chunks:
+                FALLBACKS.labels("riva_tts", "error").inc()
+                yield wav_to_pcm(_generate_silence_wav(sample_rate=sample_rate))
+            return
+        finally:
+            # Stops the server-side stream if the consumer went away early
+            cancel = getattr(responses, "cancel", None)
+            if cancel is not None:
+                cancel()
+        BACKEND_SECONDS.labels("riva_tts", "synthesize_online").observe(
+            time.perf_counter() - started
+        )
+        self._cache.put(key, pcm_to_wav(b"".join(chunks), sample_rate))
+
+    async def warm_up(
+        self, phrases: dict[str, list[str]], sample_rate: int = TTS_SAMPLE_RATE
+    ) -> int:
+        """Pre-synthesize ``{language: [phrase, ...]}`` into the cache."""
+        count = 0
+        for lang, texts in phrases.items():
+            for text in texts:
+                if text and (text, lang, sample_rate, None) not in self._cache:
+                    await self.synthesize_wav(text, lang, sample_rate)
+                    count += 1
+        return count
+
+    def close(self):
+        self._executor.shutdown()
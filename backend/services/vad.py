@@ -0,0 +1,149 @@
+"""Energy-based voice activity detection and utterance endpointing."""
+
+from __future__ import annotations
+
+import numpy as np
+
+from backend.config import (
+    VAD_END_SILENCE_MS,
+    VAD_ENERGY_THRESHOLD_DB,
+    VAD_FRAME_MS,
+    VAD_MAX_UTTERANCE_MS,
+    VAD_MIN_SPEECH_MS,
+    VAD_NOISE_MARGIN_DB,
+    VAD_PRE_ROLL_MS,
+)
+
+_INT16_FULL_SCALE = 32768.0
+
+
+def frame_energy_db(pcm: np.ndarray, frame_len: int) -> np.ndarray:
+    """Per-frame RMS energy in dBFS for 16-bit mono PCM samples.
+
+    Trailing samples that do not fill a whole frame are ignored.
+    """
+    n_frames = len(pcm) // frame_len
+    if n_frames == 0:
+        return np.empty(0, dtype=np.float32)
+    frames = pcm[: n_frames * frame_len].reshape(n_frames, frame_len).astype(np.float32)
+    rms = np.sqrt(np.mean(frames * frames, axis=1)) / _INT16_FULL_SCALE
+    return 20.0 * np.log10(np.maximum(rms, 1e-10))
+
+
+class UtteranceBuffer:
+    """Per-connection audio accumulator that emits one utterance per pause.
+
+    Silent chunks are never buffered (only a short pre-roll is kept so word
+    onsets are not clipped). Once speech starts, chunks accumulate until the
+    trailing silence exceeds ``end_silence_ms`` or the utterance hits
+    ``max_utterance_ms``, and the whole utterance is returned for ASR.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        frame_ms: int = VAD_FRAME_MS,
+        threshold_db: float = VAD_ENERGY_THRESHOLD_DB,
+        noise_margin_db: float = VAD_NOISE_MARGIN_DB,
+        end_silence_ms: int = VAD_END_SILENCE_MS,
+        min_speech_ms: int = VAD_MIN_SPEECH_MS,
+        max_utterance_ms: int = VAD_MAX_UTTERANCE_MS,
+        pre_roll_ms: int = VAD_PRE_ROLL_MS,
+    ):
+        self.sample_rate = sample_rate
+        self.frame_ms = frame_ms
+        self.frame_len = max(1, sample_rate * frame_ms // 1000)
+        self.threshold_db = threshold_db
+        self.noise_margin_db = noise_margin_db
+        self.end_silence_ms = end_silence_ms
+        self.min_speech_ms = min_speech_ms
+        self.max_utterance_ms = max_utterance_ms
+        self._pre_roll_bytes = sample_rate * pre_roll_ms // 1000 * 2
+
+        self._noise_floor_db: float | None = None
+        self._pre_roll = bytearray()
+        self._chunks: list[bytes] = []
+        self._in_speech = False
+        self._speech_ms = 0
+        self._trailing_silence_ms = 0
+        self._utterance_ms = 0
+
+    @property
+    def in_speech(self) -> bool:
+        return self._in_speech
+
+    def _threshold(self) -> float:
+        if self._noise_floor_db is None:
+            return self.threshold_db
+        return max(self.threshold_db, self._noise_floor_db + self.noise_margin_db)
+
+    def _update_noise_floor(self, energies: np.ndarray) -> None:
+        level = float(np.median(energies))
+        if self._noise_floor_db is None:
+            self._noise_floor_db = level
+        else:
+            self._noise_floor_db = 0.9 * self._noise_floor_db + 0.1 * level
+
+    def push(self, pcm: bytes) -> bytes | None:
+        """Add a chunk of 16-bit PCM. Returns a complete utterance when one ends."""
+        samples = np.frombuffer(pcm, dtype=np.int16, count=len(pcm) // 2)
+        energies = frame_energy_db(samples, self.frame_len)
+        chunk_ms = len(samples) * 1000 // self.sample_rate
+        if energies.size == 0:
+            if self._in_speech:
+                self._chunks.append(pcm)
+            return None
+
+        speech = energies > self._threshold()
+        n_speech = int(np.count_nonzero(speech))
+
+        if not self._in_speech:
+            if n_speech == 0:
+                # Silence: keep a short pre-roll and skip the chunk entirely
+                self._update_noise_floor(energies)
+                self._pre_roll += pcm
+                if len(self._pre_roll) > self._pre_roll_bytes:
+                    del self._pre_roll[: len(self._pre_roll) - self._pre_roll_bytes]
+                return None
+            self._in_speech = True
+            if self._pre_roll:
+                self._chunks.append(bytes(self._pre_roll))
+                self._utterance_ms += len(self._pre_roll) * 500 // self.sample_rate
+                self._pre_roll.clear()
+
+        self._chunks.append(pcm)
+        self._utterance_ms += chunk_ms
+        self._speech_ms += n_speech * self.frame_ms
+        if n_speech:
+            last_speech = int(np.flatnonzero(speech)[-1])
+            self._trailing_silence_ms = (len(speech) - 1 - last_speech) * self.frame_ms
+        else:
+            self._trailing_silence_ms += len(speech) * self.frame_ms
+
+        if (
+            self._trailing_silence_ms >= self.end_silence_ms
+            or self._utterance_ms >= self.max_utterance_ms
+        ):
+            return self.flush()
+        return None
+
+    def flush(self) -> bytes | None:
+        """End the current utterance now (pause, speaker switch, disconnect)."""
+        utterance = b"".join(self._chunks)
+        long_enough = self._speech_ms >= self.min_speech_ms
+        self._chunks.clear()
+        self._in_speech = False
+        self._speech_ms = 0
+        self._trailing_silence_ms = 0
+        self._utterance_ms = 0
+        if not utterance or not long_enough:
+            return None
+        return utterance
+
+    def reset(self) -> None:
+        self._chunks.clear()
+        self._pre_roll.clear()
+        self._in_speech = False
+        self._speech_ms = 0
+        self._trailing_silence_ms = 0
+        self._utterance_ms = 0
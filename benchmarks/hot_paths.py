@@ -0,0 +1,287 @@
+"""Microbenchmarks for the functions that run on every exchange.
+
+Each case runs a fixed workload (long sessions, 10-second TTS buffers,
+large term lists) and reports throughput, peak memory allocated per call
+(tracemalloc) and a scaling exponent: the case is also timed at a quarter
+of its size, and ``log4(t(n) / t(n/4))`` is ~1 for linear work and ~2 for
+quadratic, whatever the machine.
+
+Results are compared against ``benchmarks/baselines/hot_paths.json``; the
+run fails if throughput drops, allocations grow or scaling worsens past the
+tolerances. Refresh the baseline after an intended change:
+
+    python -m benchmarks.hot_paths
+    python -m benchmarks.hot_paths --update-baseline
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import math
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from backend.services.medical_ner import build_clinical_summary, validate_and_normalize
+from backend.services.session_manager import Session, TranslationExchange
+from backend.services.tts import pcm_to_wav
+
+BASELINE_PATH = Path(__file__).parent / "baselines" / "hot_paths.json"
+
+TTS_SAMPLE_RATE = 22050
+
+_TERMS = [
+    ("chest pain", "symptom", "dolor en el pecho"),
+    ("shortness of breath", "symptom", "falta de aire"),
+    ("diabetes", "condition", "diabetes"),
+    ("metformin", "medication", "metformina"),
+    ("penicillin allergy", "allergy", "alérgica a la penicilina"),
+    ("BP 180/110", "vital_sign", "presión 180/110"),
+    ("500 mg", "dosage", "500 mg"),
+    ("since last night", "onset", "desde anoche"),
+    ("8/10", "severity", "ocho de diez"),
+    ("CPR", "procedure", "RCP"),
+]
+
+
+def raw_terms(n: int) -> list[dict]:
+    """LLM-shaped term dicts, with some categories needing normalization."""
+    rng = random.Random(n)
+    out = []
+    for i in range(n):
+        term, category, original = _TERMS[i % len(_TERMS)]
+        if rng.random() < 0.2:
+            category = f" {category.upper()} "
+        out.append({"term": f"{term} {i}", "category": category, "original": original})
+    return out
+
+
+def long_session(exchanges: int, terms_per_exchange: int = 5) -> Session:
+    session = Session(
+        session_id="bench", source_lang="es-US", target_lang="en-US", mode="conversation"
+    )
+    for i in range(exchanges):
+        session.exchanges.append(TranslationExchange(
+            speaker="patient" if i % 2 == 0 else "provider",
+            original="Me duele mucho el pecho desde anoche y me cuesta respirar",
+            translation="My chest hurts a lot since last night and it is hard to breathe",
+            medical_terms=validate_and_normalize(raw_terms(terms_per_exchange)),
+            flags=[],
+            urgency="high",
+        ))
+    return session
+
+
+def tts_pcm(seconds: float) -> bytes:
+    return random.Random(0).randbytes(int(TTS_SAMPLE_RATE * seconds) * 2)
+
+
+def translation_message(audio_seconds: float, terms: int) -> dict:
+    """A translation_result as the pipeline sends it, with inline audio."""
+    wav = pcm_to_wav(tts_pcm(audio_seconds), TTS_SAMPLE_RATE)
+    return {
+        "type": "translation_result",
+        "exchange_id": 42,
+        "original": "Me duele mucho el pecho desde anoche",
+        "translation": "My chest hurts a lot since last night",
+        "medical_terms": validate_and_normalize(raw_terms(terms)),
+        "flags": ["'pecho' may refer to chest or breast"],
+        "urgency": "high",
+        "audio": base64.b64encode(wav).decode("utf-8"),
+    }
+
+
+def nim_content(terms: int) -> str:
+    """The JSON string the model returns for a full translation call."""
+    return json.dumps({
+        "translation": "My chest hurts a lot since last night and it is hard to breathe",
+        "medical_terms": raw_terms(terms),
+        "flags": [],
+        "urgency": "high",
+    }, ensure_ascii=False)
+
+
+# ── Cases ────────────────────────────────────────────────────────────────────
+
+
+@dataclass
+class Case:
+    name: str
+    size: int
+    unit: str
+    # size -> zero-argument workload; setup cost is outside the timing
+    make: Callable[[int], Callable[[], object]]
+
+
+def _case_all_medical_terms(n: int):
+    session = long_session(n)
+    return lambda: session.all_medical_terms
+
+
+def _case_clinical_summary(n: int):
+    terms = long_session(n).all_medical_terms
+    return lambda: build_clinical_summary(terms)
+
+
+def _case_validate(n: int):
+    terms = raw_terms(n)
+    return lambda: validate_and_normalize(terms)
+
+
+def _case_wav(n: int):
+    pcm = tts_pcm(n / 1000)
+    return lambda: pcm_to_wav(pcm, TTS_SAMPLE_RATE)
+
+
+def _case_b64encode(n: int):
+    wav = pcm_to_wav(tts_pcm(n / 1000), TTS_SAMPLE_RATE)
+    return lambda: base64.b64encode(wav).decode("utf-8")
+
+
+def _case_b64decode(n: int):
+    # Inbound 16 kHz microphone audio, as audio_chunk payloads
+    payload = base64.b64encode(bytes(16000 * 2 * n // 1000)).decode()
+    return lambda: base64.b64decode(payload)
+
+
+def _case_json_loads(n: int):
+    content = nim_content(n)
+    return lambda: json.loads(content)
+
+
+def _case_send_json(n: int):
+    message = translation_message(n / 1000, terms=20)
+    # Serialized exactly as Starlette's WebSocket.send_json does
+    return lambda: json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+
+CASES = [
+    Case("session_all_medical_terms", 400, "exchanges", _case_all_medical_terms),
+    Case("build_clinical_summary", 400, "exchanges", _case_clinical_summary),
+    Case("validate_and_normalize", 2000, "terms", _case_validate),
+    Case("tts_pcm_to_wav", 10_000, "audio ms", _case_wav),
+    Case("audio_b64encode", 10_000, "audio ms", _case_b64encode),
+    Case("audio_b64decode", 10_000, "audio ms", _case_b64decode),
+    Case("nim_json_loads", 500, "terms", _case_json_loads),
+    Case("result_send_json", 10_000, "audio ms", _case_send_json),
+]
+
+
+# ── Measurement ──────────────────────────────────────────────────────────────
+
+
+def time_per_call(fn: Callable[[], object], min_time: float, rounds: int = 5) -> float:
+    """Best-of-``rounds`` seconds per call, each round lasting ~``min_time``."""
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            break
+        loops *= 2 if elapsed == 0 else max(2, math.ceil(min_time / elapsed))
+    best = elapsed / loops
+    for _ in range(rounds - 1):
+        started = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        best = min(best, (time.perf_counter() - started) / loops)
+    return best
+
+
+def peak_allocation(fn: Callable[[], object]) -> int:
+    """Peak bytes allocated during one call (results are kept alive)."""
+    tracemalloc.start()
+    try:
+        result = fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak
+
+
+def run_case(case: Case, min_time: float) -> dict:
+    fn = case.make(case.size)
+    seconds = time_per_call(fn, min_time)
+    quarter = time_per_call(case.make(max(1, case.size // 4)), min_time)
+    return {
+        "size": case.size,
+        "unit": case.unit,
+        "us_per_call": round(seconds * 1e6, 2),
+        "calls_per_s": round(1 / seconds, 1),
+        "peak_kib": round(peak_allocation(fn) / 1024, 1),
+        "scaling": round(math.log(seconds / quarter, 4), 2),
+    }
+
+
+def regressions(results: dict, baseline: dict, args: argparse.Namespace) -> list[str]:
+    problems = []
+    for name, r in results.items():
+        b = baseline.get("cases", {}).get(name)
+        if b is None:
+            continue
+        if r["calls_per_s"] < b["calls_per_s"] * (1 - args.tolerance):
+            problems.append(
+                f"{name}: {r['calls_per_s']:,.0f} calls/s vs baseline {b['calls_per_s']:,.0f}"
+            )
+        if r["peak_kib"] > b["peak_kib"] * (1 + args.alloc_tolerance) + 16:
+            problems.append(f"{name}: peak {r['peak_kib']} KiB vs baseline {b['peak_kib']} KiB")
+        if r["scaling"] > max(1.0, b["scaling"]) + args.scaling_tolerance:
+            problems.append(
+                f"{name}: scaling exponent {r['scaling']} vs baseline {b['scaling']}"
+            )
+    return problems
+
+
+def main(args: argparse.Namespace) -> int:
+    selected = [c for c in CASES if not args.cases or c.name in args.cases]
+    results = {}
+    print(f"{'case':<28}{'size':>14}  {'us/call':>10}  {'calls/s':>11}  {'peak KiB':>9}  {'scaling':>7}")
+    for case in selected:
+        r = results[case.name] = run_case(case, args.min_time)
+        print(
+            f"{case.name:<28}{f'{case.size} {case.unit}':>14}  {r['us_per_call']:>10,.1f}  "
+            f"{r['calls_per_s']:>11,.0f}  {r['peak_kib']:>9,.1f}  {r['scaling']:>7.2f}"
+        )
+
+    if args.update_baseline:
+        BASELINE_PATH.parent.mkdir(exist_ok=True)
+        baseline = {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cases": results,
+        }
+        BASELINE_PATH.write_text(json.dumps(baseline, indent=2) + "\n")
+        print(f"Baseline written to {BASELINE_PATH}")
+        return 0
+
+    if not BASELINE_PATH.exists():
+        print(f"No baseline at {BASELINE_PATH}; run with --update-baseline")
+        return 0
+    problems = regressions(results, json.loads(BASELINE_PATH.read_text()), args)
+    for problem in problems:
+        print(f"REGRESSION {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("cases", nargs="*", help="case names (default: all)")
+    parser.add_argument("--min-time", type=float, default=0.1, help="seconds per timing round")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="allowed fractional throughput drop (machines differ)")
+    parser.add_argument("--alloc-tolerance", type=float, default=0.25,
+                        help="allowed fractional growth in peak allocation")
+    parser.add_argument("--scaling-tolerance", type=float, default=0.35,
+                        help="allowed rise of the scaling exponent above linear/baseline")
+    parser.add_argument("--update-baseline", action="store_true")
+    sys.exit(main(parser.parse_args()))
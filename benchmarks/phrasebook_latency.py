@@ -0,0 +1,73 @@
+"""Phrasebook fast path vs. the LLM translation path.
+
+Times matching + lookup of every phrasebook phrase against a full
+``NIMTranslator.translate`` call for the same text. The translation cache is
+disabled so every LLM call is real. Needs a reachable NIM endpoint for
+meaningful LLM numbers; with MOCK_MODE=true the LLM path is the mock.
+
+    python -m benchmarks.phrasebook_latency --source en-US --target es-US
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+os.environ.setdefault("TRANSLATION_CACHE_SIZE", "0")
+
+from backend.services.phrasebook import Phrasebook  # noqa: E402
+from backend.services.translator import NIMTranslator  # noqa: E402
+
+
+def _summary(name: str, samples_ms: list[float]) -> str:
+    samples_ms = sorted(samples_ms)
+    p95 = samples_ms[min(len(samples_ms) - 1, int(len(samples_ms) * 0.95))]
+    return (
+        f"{name:<12} n={len(samples_ms):<5} "
+        f"p50={statistics.median(samples_ms):9.3f} ms  "
+        f"p95={p95:9.3f} ms  max={samples_ms[-1]:9.3f} ms"
+    )
+
+
+async def main(source: str, target: str, rounds: int, llm_rounds: int) -> None:
+    phrasebook = Phrasebook.load()
+    texts = [p["original"] for p in phrasebook.for_pair(source, target)]
+    if not texts:
+        raise SystemExit(f"No phrases for {source} -> {target}")
+
+    fast: list[float] = []
+    for _ in range(rounds):
+        for text in texts:
+            started = time.perf_counter()
+            phrase = phrasebook.match(text, source)
+            phrase.result(target)
+            fast.append((time.perf_counter() - started) * 1000)
+
+    translator = NIMTranslator()
+    llm: list[float] = []
+    try:
+        for _ in range(llm_rounds):
+            for text in texts:
+                started = time.perf_counter()
+                await translator.translate(text, source, target)
+                llm.append((time.perf_counter() - started) * 1000)
+    finally:
+        await translator.close()
+
+    print(f"{len(texts)} phrases, {source} -> {target}")
+    print(_summary("phrasebook", fast))
+    print(_summary("llm", llm))
+    print(f"speedup (p50): {statistics.median(llm) / statistics.median(fast):,.0f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--source", default="en-US")
+    parser.add_argument("--target", default="es-US")
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--llm-rounds", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.source, args.target, args.rounds, args.llm_rounds))
@@ -0,0 +1,176 @@
+"""Soak test for SessionManager eviction under thousands of sessions.
+
+Simulates hours of traffic on a fake clock. Sessions arrive at a fixed
+rate, exchange for a while, and then either end normally or are abandoned
+(the phone drops mid-call and never sends end_session). The background
+eviction pass runs on its usual interval. Reports peak live sessions,
+estimated vs. traced memory, eviction counts by reason and the cost of an
+eviction pass. Exits 1 if the session count or memory cap is ever exceeded
+after a pass, or if anything is left once every TTL has passed.
+
+    python -m benchmarks.session_soak --sessions 5000 --max-sessions 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+from backend.services.medical_ner import validate_and_normalize
+from backend.services.session_manager import SessionManager, TranslationExchange
+
+ORIGINALS = [
+    "Me duele mucho el pecho desde anoche y me cuesta respirar cuando camino",
+    "Soy alérgica a la penicilina y tomo metformina dos veces al día",
+    "Are you allergic to any medications?",
+    "On a scale of 1 to 10, how bad is the pain?",
+]
+TERMS = [
+    {"term": "chest pain", "category": "symptom", "original": "dolor en el pecho"},
+    {"term": "dyspnea", "category": "symptom", "original": "me cuesta respirar"},
+    {"term": "penicillin allergy", "category": "allergy", "original": "alérgica a la penicilina"},
+    {"term": "metformin", "category": "medication", "original": "metformina"},
+]
+
+
+def make_exchange(rng: random.Random, now: float) -> TranslationExchange:
+    # Fresh strings per exchange, as real transcripts would be
+    original = rng.choice(ORIGINALS) + f" ({rng.random():.6f})"
+    return TranslationExchange(
+        speaker=rng.choice(("patient", "provider")),
+        original=original,
+        translation=original[::-1],
+        medical_terms=validate_and_normalize(rng.sample(TERMS, rng.randint(0, 3))),
+        flags=[],
+        urgency="medium",
+        timestamp=now,
+    )
+
+
+def main(args: argparse.Namespace) -> int:
+    # Cap evictions are expected under tight caps and counted in the report
+    logging.getLogger("backend.services.session_manager").setLevel(logging.ERROR)
+    rng = random.Random(args.seed)
+    clock = [0.0]
+    manager = SessionManager(
+        idle_timeout=args.idle_timeout,
+        ended_ttl=args.ttl,
+        max_sessions=args.max_sessions,
+        max_memory_bytes=int(args.max_memory_mb * 1024 * 1024),
+        clock=lambda: clock[0],
+    )
+    # session_id -> exchanges left; abandoned sessions stop talking at 0
+    live: dict[str, int] = {}
+    abandoned: set[str] = set()
+
+    tracemalloc.start()
+    traced_base = tracemalloc.get_traced_memory()[0]
+
+    created = 0
+    abandoned_total = 0
+    exchanges = 0
+    peak_sessions = 0
+    peak_estimate = 0
+    traced_at_peak = 0
+    pass_ms: list[float] = []
+    violations: list[str] = []
+    arrival_credit = 0.0
+    drain_until = None
+
+    while True:
+        clock[0] += 1.0
+        now = clock[0]
+
+        arrival_credit += args.rate
+        while arrival_credit >= 1 and created < args.sessions:
+            arrival_credit -= 1
+            session = manager.create_session("es-US", "en-US")
+            live[session.session_id] = rng.randint(args.min_exchanges, args.max_exchanges)
+            if rng.random() < args.abandon_rate:
+                abandoned.add(session.session_id)
+                abandoned_total += 1
+            created += 1
+
+        for sid in list(live):
+            if rng.random() > args.talk_prob:
+                continue
+            if live[sid] > 0:
+                if manager.add_exchange(sid, make_exchange(rng, now)) is not None:
+                    exchanges += 1
+                live[sid] -= 1
+                if rng.random() < 0.5:
+                    manager.switch_speaker(sid)
+            else:
+                if sid not in abandoned:
+                    manager.end_session(sid)
+                abandoned.discard(sid)
+                del live[sid]
+
+        if now % args.interval == 0:
+            started = time.perf_counter()
+            manager.evict()
+            pass_ms.append((time.perf_counter() - started) * 1000)
+            stats = manager.stats()
+            if stats["sessions"] > args.max_sessions:
+                violations.append(f"t={now:.0f}s: {stats['sessions']} sessions > cap")
+            if stats["memory_bytes"] > manager.max_memory_bytes:
+                violations.append(f"t={now:.0f}s: {stats['memory_bytes']} bytes > cap")
+
+        stats = manager.stats()
+        peak_sessions = max(peak_sessions, stats["sessions"])
+        if stats["memory_bytes"] > peak_estimate:
+            peak_estimate = stats["memory_bytes"]
+            traced_at_peak = tracemalloc.get_traced_memory()[0] - traced_base
+
+        if created >= args.sessions and not live and drain_until is None:
+            # Long enough for idle sessions to be ended and every TTL to pass
+            drain_until = now + args.idle_timeout + args.ttl + 2 * args.interval
+        if drain_until is not None and now >= drain_until:
+            break
+
+    tracemalloc.stop()
+    stats = manager.stats()
+    if stats["sessions"]:
+        violations.append(f"{stats['sessions']} sessions left after every TTL passed")
+
+    print(
+        f"{created} sessions ({abandoned_total} abandoned), "
+        f"{exchanges} exchanges over {clock[0] / 3600:.1f} simulated hours"
+    )
+    print(f"peak live sessions: {peak_sessions} (cap {args.max_sessions})")
+    print(
+        f"peak transcript memory: {peak_estimate / 2**20:.1f} MiB estimated, "
+        f"{traced_at_peak / 2**20:.1f} MiB traced incl. harness "
+        f"(cap {args.max_memory_mb} MiB)"
+    )
+    print(f"evicted: {stats['evicted']}")
+    print(
+        f"eviction pass: mean={statistics.fmean(pass_ms):.2f} ms  "
+        f"max={max(pass_ms):.2f} ms over {len(pass_ms)} passes"
+    )
+    for violation in violations[:10]:
+        print(f"VIOLATION {violation}")
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=5000)
+    parser.add_argument("--rate", type=float, default=0.5, help="new sessions per second")
+    parser.add_argument("--min-exchanges", type=int, default=5)
+    parser.add_argument("--max-exchanges", type=int, default=60)
+    parser.add_argument("--talk-prob", type=float, default=0.1,
+                        help="chance per second that a live session takes a turn")
+    parser.add_argument("--abandon-rate", type=float, default=0.2)
+    parser.add_argument("--idle-timeout", type=float, default=600)
+    parser.add_argument("--ttl", type=float, default=900)
+    parser.add_argument("--max-sessions", type=int, default=1000)
+    parser.add_argument("--max-memory-mb", type=float, default=64)
+    parser.add_argument("--interval", type=int, default=30, help="eviction interval, seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,424 @@
+"""End-to-end WebSocket load test for ``/ws/translate``.
+
+Opens N concurrent conversations. Each one alternates a patient (speaking
+``audio_chunk`` audio, or typing) and a provider (typing, partly
+phrasebook phrases) with ``switch_speaker`` between turns, and waits for
+each exchange to finish before thinking and taking the next turn. Reports
+p50/p95/p99 time-to-transcript, time-to-translation and time-to-audio,
+measured from the end of the utterance (last audio chunk or text sent).
+
+Runs fully offline against a MOCK_MODE server. ``--spawn`` starts one with
+a mock latency profile (see ``backend/services/mock_latency.py``), so
+pipeline and scheduling regressions show up in CI-style runs:
+
+    python -m benchmarks.ws_load --spawn --profile gb10 --connections 20 --turns 10
+    python -m benchmarks.ws_load --url ws://gb10:3000/ws/translate --connections 8
+
+Exits non-zero on errors, timeouts or a breached ``--slo`` (e.g.
+``--slo audio.p95=1500``).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+
+import httpx
+import numpy as np
+import websockets
+
+METRICS = ("transcript", "translation", "audio")
+
+SAMPLE_RATE = 16000
+CHUNK_MS = 100
+
+PATIENT = ("es-US", "en-US")
+PROVIDER = ("en-US", "es-US")
+
+PATIENT_LINES = [
+    "Me duele mucho el pecho desde anoche",
+    "Soy alérgica a la penicilina",
+    "Tengo diabetes y tomo metformina dos veces al día",
+    "Me caí de la escalera y me duele la pierna izquierda",
+    "Tengo fiebre y tos desde hace tres días",
+]
+PROVIDER_LINES = [
+    # Phrasebook phrases (no LLM call) ...
+    "Are you allergic to any medications?",
+    "Where does it hurt?",
+    "On a scale of 1 to 10, how bad is the pain?",
+    # ... and free text
+    "Okay, I am going to check your blood pressure now.",
+    "Has this ever happened to you before?",
+    "Did you hit your head when you fell?",
+]
+
+# What the spawned mock server "hears" in every audio utterance
+MOCK_TRANSCRIPT = "Me duele mucho el pecho y me cuesta respirar"
+
+
+def speech_pcm(speech_ms: int, silence_ms: int) -> bytes:
+    """Voiced-sounding audio followed by enough silence for VAD to endpoint."""
+    t = np.arange(SAMPLE_RATE * speech_ms // 1000) / SAMPLE_RATE
+    # Harmonics of a 140 Hz voice with a 4 Hz syllable envelope, about -20 dBFS
+    voice = sum(np.sin(2 * np.pi * 140 * k * t) / k for k in range(1, 6))
+    envelope = 0.6 + 0.4 * np.sin(2 * np.pi * 4 * t)
+    speech = (voice * envelope * 0.1 * 32767 / 2).astype(np.int16)
+    silence = np.zeros(SAMPLE_RATE * silence_ms // 1000, dtype=np.int16)
+    return np.concatenate([speech, silence]).tobytes()
+
+
+def percentile(sorted_ms: list[float], p: float) -> float:
+    return sorted_ms[min(len(sorted_ms) - 1, int(len(sorted_ms) * p))]
+
+
+@dataclass
+class Results:
+    samples: dict[str, list[float]] = field(default_factory=lambda: {m: [] for m in METRICS})
+    exchanges: int = 0
+    audio_bytes: list[int] = field(default_factory=list)
+    empty: int = 0
+    timeouts: int = 0
+    errors: list[str] = field(default_factory=list)
+
+    def summary(self) -> dict:
+        out = {}
+        for metric, values in self.samples.items():
+            values = sorted(values)
+            out[metric] = {
+                "n": len(values),
+                **(
+                    {
+                        "p50": round(percentile(values, 0.50), 1),
+                        "p95": round(percentile(values, 0.95), 1),
+                        "p99": round(percentile(values, 0.99), 1),
+                        "max": round(values[-1], 1),
+                    }
+                    if values else {}
+                ),
+            }
+        return out
+
+
+class Conversation:
+    """One simulated EMT conversation over its own WebSocket."""
+
+    def __init__(self, index: int, args: argparse.Namespace, audio: bytes, results: Results):
+        self.index = index
+        self.args = args
+        self.audio = audio
+        self.results = results
+        self.rng = random.Random(args.seed * 1000 + index)
+        self.session_id: str | None = None
+        self.ws = None
+
+    async def run(self, http_base: str) -> None:
+        await asyncio.sleep(self.index * self.args.ramp_s / max(1, self.args.connections))
+        try:
+            async with httpx.AsyncClient(base_url=http_base, timeout=10) as client:
+                response = await client.post(
+                    "/api/session/start",
+                    json={"source_lang": PATIENT[0], "target_lang": PATIENT[1]},
+                )
+                response.raise_for_status()
+                self.session_id = response.json()["session_id"]
+
+            async with websockets.connect(self.args.url, max_size=None) as ws:
+                self.ws = ws
+                await ws.send(json.dumps({
+                    "type": "config",
+                    "session_id": self.session_id,
+                    "source_lang": PATIENT[0],
+                    "target_lang": PATIENT[1],
+                    "binary_audio": self.args.binary,
+                    "segmented_audio": self.args.segmented,
+                    "streaming_audio": self.args.streaming,
+                    **({"audio_codec": self.args.codec} if self.args.codec else {}),
+                    **({"audio_sample_rate": self.args.sample_rate} if self.args.sample_rate else {}),
+                }))
+                await self._expect("config_ack")
+
+                for turn in range(self.args.turns):
+                    if turn:
+                        await ws.send(json.dumps({"type": "switch_speaker"}))
+                        await self._expect("speaker_switched")
+                    await self._exchange(patient=turn % 2 == 0)
+                    think = self.args.think_ms * self.rng.uniform(0.5, 1.5) / 1000
+                    await asyncio.sleep(think)
+
+                await ws.send(json.dumps({"type": "end_session"}))
+                await self._expect("session_ended")
+        except asyncio.TimeoutError:
+            # Later replies could not be told apart from this exchange's
+            self.results.timeouts += 1
+        except Exception as e:
+            self.results.errors.append(f"conversation {self.index}: {type(e).__name__}: {e}")
+
+    async def _recv(self, deadline: float):
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            raise asyncio.TimeoutError
+        frame = await asyncio.wait_for(self.ws.recv(), remaining)
+        return frame if isinstance(frame, bytes) else json.loads(frame)
+
+    async def _expect(self, msg_type: str) -> dict:
+        deadline = time.perf_counter() + self.args.timeout
+        while True:
+            msg = await self._recv(deadline)
+            # Enrichments of earlier exchanges may arrive at any time
+            if isinstance(msg, dict) and msg.get("type") == msg_type:
+                return msg
+
+    async def _send_audio(self, source: str, target: str) -> None:
+        chunk_bytes = SAMPLE_RATE * 2 * CHUNK_MS // 1000
+        for offset in range(0, len(self.audio), chunk_bytes):
+            if offset and self.args.realtime:
+                await asyncio.sleep(CHUNK_MS / 1000)
+            await self.ws.send(json.dumps({
+                "type": "audio_chunk",
+                "session_id": self.session_id,
+                "source_lang": source,
+                "target_lang": target,
+                "audio": base64.b64encode(self.audio[offset : offset + chunk_bytes]).decode(),
+            }))
+
+    async def _exchange(self, patient: bool) -> None:
+        source, target = PATIENT if patient else PROVIDER
+        spoken = patient and self.rng.random() < self.args.audio_ratio
+        if spoken:
+            await self._send_audio(source, target)
+        else:
+            lines = PATIENT_LINES if patient else PROVIDER_LINES
+            await self.ws.send(json.dumps({
+                "type": "text_input",
+                "session_id": self.session_id,
+                "source_lang": source,
+                "target_lang": target,
+                "text": self.rng.choice(lines),
+            }))
+        started = time.perf_counter()
+        deadline = started + self.args.timeout
+
+        times: dict[str, float] = {}
+        awaiting_frame = None  # audio metric waiting for its binary frame
+        open_streams: set[int] = set()  # streamed audio not yet ended
+        audio_bytes = 0  # as received, base64 included
+        done = False
+        while not done or awaiting_frame or open_streams:
+            msg = await self._recv(deadline)
+            now = (time.perf_counter() - started) * 1000
+            if isinstance(msg, bytes):
+                audio_bytes += len(msg)
+                if awaiting_frame:
+                    times.setdefault(awaiting_frame, now)
+                    awaiting_frame = None
+                continue
+
+            msg_type = msg.get("type")
+            audio_bytes += len(msg.get("audio", ""))
+            if msg_type == "partial_transcript":
+                if msg.get("is_final") and msg.get("text"):
+                    times.setdefault("transcript", now)
+                elif not msg.get("text"):
+                    # Nothing recognized: no translation will follow
+                    self.results.empty += 1
+                    return
+            elif msg_type == "translation_partial":
+                times.setdefault("translation", now)
+            elif msg_type in ("audio_segment", "translation_result"):
+                if msg_type == "translation_result":
+                    times.setdefault("translation", now)
+                    done = True
+                if msg.get("audio_stream"):
+                    # First chunk (frame or message) is the audio time
+                    open_streams.add(msg["audio_id"])
+                    awaiting_frame = "audio" if "audio" not in times else None
+                elif "audio_id" in msg:
+                    awaiting_frame = "audio" if "audio" not in times else None
+                elif "audio" in msg or msg_type == "audio_segment":
+                    times.setdefault("audio", now)
+            elif msg_type == "audio_stream_chunk":
+                times.setdefault("audio", now)
+                awaiting_frame = None
+            elif msg_type == "audio_stream_end":
+                open_streams.discard(msg["audio_id"])
+
+        self.results.exchanges += 1
+        self.results.audio_bytes.append(audio_bytes)
+        for metric, ms in times.items():
+            self.results.samples[metric].append(ms)
+
+
+# ── Server ───────────────────────────────────────────────────────────────────
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def spawn_server(profile: str, seed: int) -> tuple[subprocess.Popen, str]:
+    """Start a MOCK_MODE server on a free local port; returns (process, ws url)."""
+    port = _free_port()
+    env = {
+        **os.environ,
+        "MOCK_MODE": "true",
+        "MOCK_LATENCY_PROFILE": profile,
+        "MOCK_LATENCY_SEED": str(seed),
+        "MOCK_ASR_TRANSCRIPT": os.environ.get("MOCK_ASR_TRANSCRIPT", MOCK_TRANSCRIPT),
+    }
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "backend.main:app",
+            "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning",
+        ],
+        env=env,
+    )
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+        for _ in range(300):
+            if process.poll() is not None:
+                raise SystemExit(f"Server exited with code {process.returncode}")
+            try:
+                if (await client.get("/api/health")).status_code == 200:
+                    return process, f"ws://127.0.0.1:{port}/ws/translate"
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.1)
+    process.terminate()
+    raise SystemExit("Server did not become healthy within 30 s")
+
+
+def _http_base(ws_url: str) -> str:
+    scheme, _, rest = ws_url.partition("://")
+    host = rest.split("/", 1)[0]
+    return f"{'https' if scheme == 'wss' else 'http'}://{host}"
+
+
+# ── Report ───────────────────────────────────────────────────────────────────
+
+
+def check_slos(summary: dict, slos: list[str]) -> list[str]:
+    """``metric.stat=ms`` budgets, e.g. ``audio.p95=1500``; returns breaches."""
+    breaches = []
+    for slo in slos:
+        name, _, limit = slo.partition("=")
+        metric, _, stat = name.partition(".")
+        if metric not in METRICS or stat not in ("p50", "p95", "p99", "max") or not limit:
+            raise SystemExit(f"Bad --slo {slo!r} (expected e.g. audio.p95=1500)")
+        value = summary[metric].get(stat)
+        if value is not None and value > float(limit):
+            breaches.append(f"{metric} {stat} {value:.1f} ms > {float(limit):.1f} ms")
+    return breaches
+
+
+def print_report(args: argparse.Namespace, results: Results, summary: dict, elapsed: float) -> None:
+    print(
+        f"{args.connections} connections x {args.turns} turns"
+        f"{f', profile {args.profile}' if args.spawn else ''}: "
+        f"{results.exchanges} exchanges in {elapsed:.1f} s "
+        f"({results.exchanges / elapsed:.1f}/s)"
+    )
+    for metric in METRICS:
+        stats = summary[metric]
+        if not stats["n"]:
+            print(f"time_to_{metric:<12} n=0")
+            continue
+        print(
+            f"time_to_{metric:<12} n={stats['n']:<5} "
+            f"p50={stats['p50']:8.1f} ms  p95={stats['p95']:8.1f} ms  "
+            f"p99={stats['p99']:8.1f} ms  max={stats['max']:8.1f} ms"
+        )
+    if results.audio_bytes:
+        print(
+            f"audio per exchange: mean={statistics.fmean(results.audio_bytes) / 1024:.1f} KiB  "
+            f"max={max(results.audio_bytes) / 1024:.1f} KiB"
+        )
+    print(f"empty={results.empty} timeouts={results.timeouts} errors={len(results.errors)}")
+    for error in results.errors[:5]:
+        print(f"  {error}")
+
+
+async def main(args: argparse.Namespace) -> int:
+    process = None
+    if args.spawn:
+        process, args.url = await spawn_server(args.profile, args.seed)
+    try:
+        results = Results()
+        audio = speech_pcm(args.speech_ms, args.silence_ms)
+        http_base = _http_base(args.url)
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            Conversation(i, args, audio, results).run(http_base)
+            for i in range(args.connections)
+        ))
+        elapsed = time.perf_counter() - started
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=10)
+
+    summary = results.summary()
+    print_report(args, results, summary, elapsed)
+    breaches = check_slos(summary, args.slo)
+    for breach in breaches:
+        print(f"SLO breached: {breach}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({
+                "connections": args.connections,
+                "turns": args.turns,
+                "profile": args.profile if args.spawn else None,
+                "elapsed_s": round(elapsed, 2),
+                "exchanges": results.exchanges,
+                "empty": results.empty,
+                "timeouts": results.timeouts,
+                "errors": results.errors,
+                "latency_ms": summary,
+                "audio_bytes_per_exchange": (
+                    round(statistics.fmean(results.audio_bytes)) if results.audio_bytes else None
+                ),
+                "slo_breaches": breaches,
+            }, f, indent=2)
+    return 1 if breaches or results.errors or results.timeouts else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="ws://localhost:3000/ws/translate")
+    parser.add_argument("--spawn", action="store_true",
+                        help="start a MOCK_MODE server on a free port and test it")
+    parser.add_argument("--profile", default="gb10",
+                        help="MOCK_LATENCY_PROFILE for --spawn (e.g. none, gb10, degraded)")
+    parser.add_argument("--connections", type=int, default=10)
+    parser.add_argument("--turns", type=int, default=6, help="exchanges per conversation")
+    parser.add_argument("--audio-ratio", type=float, default=0.7,
+                        help="share of patient turns spoken rather than typed")
+    parser.add_argument("--speech-ms", type=int, default=1500)
+    parser.add_argument("--silence-ms", type=int, default=600,
+                        help="trailing silence; match the server's VAD_END_SILENCE_MS so "
+                             "the last chunk is the one that ends the utterance")
+    parser.add_argument("--no-realtime", dest="realtime", action="store_false",
+                        help="send audio chunks as fast as possible")
+    parser.add_argument("--think-ms", type=float, default=500)
+    parser.add_argument("--ramp-s", type=float, default=1.0)
+    parser.add_argument("--timeout", type=float, default=30.0, help="per exchange, seconds")
+    parser.add_argument("--binary", action="store_true", help="binary audio frames")
+    parser.add_argument("--segmented", action="store_true", help="sentence-segmented audio")
+    parser.add_argument("--streaming", action="store_true", help="streamed PCM audio chunks")
+    parser.add_argument("--codec", choices=("wav", "mulaw", "opus"), help="requested audio codec")
+    parser.add_argument("--sample-rate", type=int, help="requested audio sample rate")
+    parser.add_argument("--slo", action="append", default=[], metavar="METRIC.STAT=MS")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--seed", type=int, default=0)
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -8,7 +8,7 @@ import { TranslationBubble } from "@/components/TranslationBubble";
 import { SessionTimer } from "@/components/SessionTimer";
 import { ConnectionStatus } from "@/components/ConnectionStatus";
 import { getWsClient } from "@/lib/websocket";
-import { playAudioBase64 } from "@/lib/audio";
+import { AudioQueue, audioMimeType, base64ToBlob } from "@/lib/audio";
 import type { Exchange } from "@/lib/utils";
 
 export default function SessionPage() {
@@ -28,6 +28,33 @@ export default function SessionPage() {
 
   const scrollRef = useRef<HTMLDivElement>(null);
   const ws = getWsClient();
+  // Sentence audio plays as it arrives; blobs are kept per exchange for replay
+  const playerRef = useRef(new AudioQueue());
+  const segmentsRef = useRef(new Map<number, Blob[]>());
+  const segmentAudioIdsRef = useRef(new Map<number, number>());
+
+  const addSegment = (exchangeId: number, blob: Blob) => {
+    const blobs = segmentsRef.current.get(exchangeId) ?? [];
+    blobs.push(blob);
+    segmentsRef.current.set(exchangeId, blobs);
+    playerRef.current.enqueue(blob);
+  };
+
+  const inLang = speaker === "patient" ? sourceLang : targetLang;
+  const outLang = speaker === "patient" ? targetLang : sourceLang;
+
+  // Binary PCM frames carry no metadata, so the server tracks the current
+  // session and direction from the config message.
+  useEffect(() => {
+    ws.configure({
+      type: "config",
+      session_id: sessionId,
+      source_lang: inLang,
+      target_lang: outLang,
+      binary_audio: true,
+      segmented_audio: true,
+    });
+  }, [sessionId, inLang, outLang]);
 
   useEffect(() => {
     ws.connect();
@@ -36,10 +63,16 @@ export default function SessionPage() {
         setConnected(true);
       } else if (msg.type === "partial_transcript") {
         setPartialText(msg.text);
+      } else if (msg.type === "translation_partial") {
+        // Translation is ready before medical terms/urgency; show it early
+        setPartialText(msg.translation);
       } else if (msg.type === "translation_result") {
         setPartialText("");
+        const segments = msg.exchange_id !== undefined ? segmentsRef.current.get(msg.exchange_id) : undefined;
+        if (msg.exchange_id !== undefined) segmentsRef.current.delete(msg.exchange_id);
         const exchange: Exchange = {
           id: `${Date.now()}-${Math.random()}`,
+          exchangeId: msg.exchange_id,
           speaker,
           original: msg.original,
           translation: msg.translation,
@@ -47,13 +80,40 @@ export default function SessionPage() {
           flags: msg.flags,
           urgency: msg.urgency,
           audio: msg.audio,
+          audioId: msg.audio_id,
+          audioBlobs: segments,
           timestamp: Date.now(),
         };
         setExchanges((prev) => [...prev, exchange]);
-        // Auto-play translation audio
+        // Auto-play translation audio (binary audio arrives in its own frame)
+        if (msg.audio) {
+          playerRef.current.enqueue(base64ToBlob(msg.audio, audioMimeType(msg.audio_format)));
+        }
+      } else if (msg.type === "translation_enrichment") {
+        setExchanges((prev) =>
+          prev.map((ex) =>
+            ex.exchangeId === msg.exchange_id
+              ? { ...ex, medical_terms: msg.medical_terms, flags: msg.flags, urgency: msg.urgency }
+              : ex
+          )
+        );
+      } else if (msg.type === "audio_segment") {
         if (msg.audio) {
-          playAudioBase64(msg.audio);
+          addSegment(msg.exchange_id, base64ToBlob(msg.audio, audioMimeType(msg.audio_format)));
+        } else if (msg.audio_id !== undefined) {
+          segmentAudioIdsRef.current.set(msg.audio_id, msg.exchange_id);
+        }
+      } else if (msg.type === "audio_data") {
+        const exchangeId = segmentAudioIdsRef.current.get(msg.audio_id);
+        if (exchangeId !== undefined) {
+          segmentAudioIdsRef.current.delete(msg.audio_id);
+          addSegment(exchangeId, msg.audio);
+          return;
         }
+        setExchanges((prev) =>
+          prev.map((ex) => (ex.audioId === msg.audio_id ? { ...ex, audioBlobs: [msg.audio] } : ex))
+        );
+        playerRef.current.enqueue(msg.audio);
       } else if (msg.type === "speaker_switched") {
         setSpeaker(msg.current_speaker as "patient" | "provider");
       } else if (msg.type === "session_ended") {
@@ -79,16 +139,14 @@ export default function SessionPage() {
   }, [exchanges, partialText]);
 
   const handleAudioChunk = useCallback(
-    (b64: string) => {
-      ws.send({
-        type: "audio_chunk",
-        audio: b64,
+    (pcm: ArrayBuffer) => {
+      ws.sendAudio(pcm, {
         session_id: sessionId,
-        source_lang: speaker === "patient" ? sourceLang : targetLang,
-        target_lang: speaker === "patient" ? targetLang : sourceLang,
+        source_lang: inLang,
+        target_lang: outLang,
       });
     },
-    [sessionId, sourceLang, targetLang, speaker]
+    [sessionId, inLang, outLang]
   );
 
   const switchSpeaker = () => {
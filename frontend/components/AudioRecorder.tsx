@@ -5,7 +5,7 @@ import { AudioRecorderUtil } from "@/lib/audio";
 import { WaveformVisualizer } from "./WaveformVisualizer";
 
 interface Props {
-  onAudioChunk: (b64: string) => void;
+  onAudioChunk: (pcm: ArrayBuffer) => void;
   disabled?: boolean;
 }
 
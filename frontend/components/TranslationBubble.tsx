@@ -3,7 +3,7 @@
 import { MedicalTermBadge } from "./MedicalTermBadge";
 import { AlertBanner } from "./AlertBanner";
 import type { Exchange } from "@/lib/utils";
-import { playAudioBase64 } from "@/lib/audio";
+import { AudioQueue, playAudioBase64 } from "@/lib/audio";
 
 export function TranslationBubble({ exchange }: { exchange: Exchange }) {
   const isPatient = exchange.speaker === "patient";
@@ -45,9 +45,13 @@ export function TranslationBubble({ exchange }: { exchange: Exchange }) {
         ))}
 
         {/* Audio replay */}
-        {exchange.audio && (
+        {(exchange.audio || exchange.audioBlobs?.length) && (
           <button
-            onClick={() => playAudioBase64(exchange.audio!)}
+            onClick={() =>
+              exchange.audioBlobs?.length
+                ? new AudioQueue().enqueue(...exchange.audioBlobs)
+                : playAudioBase64(exchange.audio!)
+            }
             className="mt-2 flex items-center gap-1 text-xs text-primary hover:text-blue-800 touch-target"
           >
             🔊 Replay
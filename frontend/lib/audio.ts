@@ -6,7 +6,7 @@ export class AudioRecorderUtil {
   private processor: ScriptProcessorNode | null = null;
   private source: MediaStreamAudioSourceNode | null = null;
   private _recording = false;
-  private onChunk: ((b64: string) => void) | null = null;
+  private onChunk: ((pcm: ArrayBuffer) => void) | null = null;
   private analyser: AnalyserNode | null = null;
 
   get recording(): boolean {
@@ -17,7 +17,7 @@ export class AudioRecorderUtil {
     return this.analyser;
   }
 
-  async start(onChunk: (b64: string) => void): Promise<void> {
+  async start(onChunk: (pcm: ArrayBuffer) => void): Promise<void> {
     this.onChunk = onChunk;
 
     try {
@@ -51,14 +51,7 @@ export class AudioRecorderUtil {
           const s = Math.max(-1, Math.min(1, float32[i]));
           pcm16[i] = s < 0 ? s * 0x8000 : s * 0x7fff;
         }
-        // Base64 encode
-        const bytes = new Uint8Array(pcm16.buffer);
-        let binary = "";
-        for (let i = 0; i < bytes.byteLength; i++) {
-          binary += String.fromCharCode(bytes[i]);
-        }
-        const b64 = btoa(binary);
-        this.onChunk?.(b64);
+        this.onChunk?.(pcm16.buffer);
       };
 
       this._recording = true;
@@ -90,16 +83,66 @@ export class AudioRecorderUtil {
   }
 }
 
-export function playAudioBase64(b64: string): HTMLAudioElement {
-  const binary = atob(b64);
-  const bytes = new Uint8Array(binary.length);
-  for (let i = 0; i < binary.length; i++) {
-    bytes[i] = binary.charCodeAt(i);
+export function pcmToBase64(pcm: ArrayBuffer): string {
+  const bytes = new Uint8Array(pcm);
+  let binary = "";
+  for (let i = 0; i < bytes.byteLength; i++) {
+    binary += String.fromCharCode(bytes[i]);
   }
-  const blob = new Blob([bytes], { type: "audio/wav" });
+  return btoa(binary);
+}
+
+export function playAudioBlob(blob: Blob): HTMLAudioElement {
   const url = URL.createObjectURL(blob);
   const audio = new Audio(url);
   audio.play().catch(() => {});
   audio.onended = () => URL.revokeObjectURL(url);
   return audio;
 }
+
+/** MIME type for a server ``audio_format`` (wav, wav_mulaw, ogg_opus). */
+export function audioMimeType(format?: string): string {
+  return format === "ogg_opus" ? "audio/ogg" : "audio/wav";
+}
+
+export function base64ToBlob(b64: string, type = "audio/wav"): Blob {
+  const binary = atob(b64);
+  const bytes = new Uint8Array(binary.length);
+  for (let i = 0; i < binary.length; i++) {
+    bytes[i] = binary.charCodeAt(i);
+  }
+  return new Blob([bytes], { type });
+}
+
+export function playAudioBase64(b64: string): HTMLAudioElement {
+  return playAudioBlob(base64ToBlob(b64));
+}
+
+/** Plays audio segments back to back, in the order they were queued. */
+export class AudioQueue {
+  private queue: Blob[] = [];
+  private playing = false;
+
+  enqueue(...blobs: Blob[]): void {
+    this.queue.push(...blobs);
+    if (!this.playing) this.playNext();
+  }
+
+  private playNext(): void {
+    const next = this.queue.shift();
+    if (!next) {
+      this.playing = false;
+      return;
+    }
+    this.playing = true;
+    const url = URL.createObjectURL(next);
+    const audio = new Audio(url);
+    const done = () => {
+      URL.revokeObjectURL(url);
+      this.playNext();
+    };
+    audio.onended = done;
+    audio.onerror = done;
+    audio.play().catch(done);
+  }
+}
@@ -37,10 +37,12 @@ export interface TranslationResult {
   flags: string[];
   urgency: string;
   audio?: string;
+  audio_id?: number;
 }
 
 export interface Exchange {
   id: string;
+  exchangeId?: number;
   speaker: "patient" | "provider";
   original: string;
   translation: string;
@@ -48,6 +50,8 @@ export interface Exchange {
   flags: string[];
   urgency: string;
   audio?: string;
+  audioId?: number;
+  audioBlobs?: Blob[];
   timestamp: number;
 }
 
@@ -70,6 +74,7 @@ export interface SessionSummary {
     procedures: string[];
   };
   flags: string[];
+  urgency?: "low" | "medium" | "high" | "critical" | null;
   mode: string;
 }
 
@@ -1,18 +1,48 @@
 "use client";
 
 import { getWsUrl } from "./utils";
+import { pcmToBase64 } from "./audio";
+
+export type ConfigMessage = {
+  type: "config";
+  source_lang: string;
+  target_lang: string;
+  session_id?: string;
+  asr_mode?: "streaming" | "offline";
+  binary_audio?: boolean;
+  segmented_audio?: boolean;
+  streaming_audio?: boolean;
+  // Slow links: "poor" selects compressed audio; or pick codec/rate directly
+  link_quality?: "good" | "fair" | "poor";
+  audio_codec?: "wav" | "mulaw" | "opus";
+  audio_sample_rate?: number;
+};
 
 export type WsMessage =
-  | { type: "config"; source_lang: string; target_lang: string; session_id?: string }
+  | ConfigMessage
   | { type: "audio_chunk"; audio: string; session_id: string; source_lang: string; target_lang: string }
   | { type: "text_input"; text: string; session_id: string; source_lang: string; target_lang: string }
   | { type: "switch_speaker" }
   | { type: "end_session" };
 
 export type WsResponse =
-  | { type: "config_ack"; source_lang: string; target_lang: string }
+  | { type: "config_ack"; source_lang: string; target_lang: string; asr_mode?: "streaming" | "offline"; binary_audio?: boolean; segmented_audio?: boolean; streaming_audio?: boolean; audio_codec?: string; audio_sample_rate?: number }
   | { type: "partial_transcript"; text: string; is_final: boolean }
-  | { type: "translation_result"; original: string; translation: string; medical_terms: any[]; flags: string[]; urgency: string; audio?: string }
+  | { type: "translation_partial"; exchange_id: number; original: string; translation: string }
+  | { type: "translation_result"; exchange_id?: number; original: string; translation: string; medical_terms: any[]; flags: string[]; urgency: string; audio?: string; audio_id?: number; audio_format?: string; sample_rate?: number; channels?: number; audio_stream?: boolean; audio_segments?: number; phrase_id?: string; enrichment_pending?: boolean }
+  // Split mode: terms, flags and urgency for an exchange already shown
+  | { type: "translation_enrichment"; exchange_id: number; medical_terms: any[]; flags: string[]; urgency: string }
+  // One sentence of the translation, synthesized before the full result
+  | { type: "audio_segment"; exchange_id: number; index: number; text: string; audio?: string; audio_id?: number; audio_format?: string; sample_rate?: number; channels?: number; audio_stream?: boolean }
+  // Streaming audio: PCM chunks for a header's audio_id (or binary frames), then the end
+  | { type: "audio_stream_chunk"; audio_id: number; index: number; audio: string }
+  | { type: "audio_stream_end"; audio_id: number; chunks: number }
+  // Synthesized locally from a binary frame: [uint32 audio_id][audio bytes]
+  | { type: "audio_data"; audio_id: number; audio: Blob }
+  // Audio waiting for ASR is behind real time; stale audio was dropped or merged
+  | { type: "lag"; lag_ms: number; queued_audio_ms: number; catching_up: boolean; dropped_ms: number; merged: number }
+  // A backend stage failed; the server recovers on its own (e.g. reopens the ASR stream)
+  | { type: "error"; stage: string; message: string }
   | { type: "speaker_switched"; current_speaker: string }
   | { type: "session_ended"; summary: any };
 
@@ -23,6 +53,8 @@ export class MedIntererWs {
   private listeners: Set<Listener> = new Set();
   private reconnectTimer: ReturnType<typeof setTimeout> | null = null;
   private _connected = false;
+  private _binaryAudio = false;
+  private lastConfig: ConfigMessage | null = null;
 
   get connected(): boolean {
     return this._connected;
@@ -36,15 +68,28 @@ export class MedIntererWs {
 
     try {
       this.ws = new WebSocket(url);
+      this.ws.binaryType = "arraybuffer";
 
       this.ws.onopen = () => {
         this._connected = true;
+        this._binaryAudio = false;
         this.notify({ type: "config_ack", source_lang: "", target_lang: "" });
+        if (this.lastConfig) this.send(this.lastConfig);
       };
 
       this.ws.onmessage = (event) => {
+        if (event.data instanceof ArrayBuffer) {
+          if (event.data.byteLength < 4) return;
+          const audioId = new DataView(event.data).getUint32(0);
+          const audio = new Blob([event.data.slice(4)], { type: "audio/wav" });
+          this.notify({ type: "audio_data", audio_id: audioId, audio });
+          return;
+        }
         try {
           const msg = JSON.parse(event.data) as WsResponse;
+          if (msg.type === "config_ack" && msg.binary_audio !== undefined) {
+            this._binaryAudio = msg.binary_audio;
+          }
           this.notify(msg);
         } catch (e) {
           console.error("WS parse error:", e);
@@ -78,6 +123,22 @@ export class MedIntererWs {
     }
   }
 
+  /** Send (and remember, for reconnects) the connection config. */
+  configure(msg: ConfigMessage): void {
+    this.lastConfig = msg;
+    this.send(msg);
+  }
+
+  /** Send raw PCM as a binary frame once negotiated, else as base64 JSON. */
+  sendAudio(pcm: ArrayBuffer, meta: { session_id: string; source_lang: string; target_lang: string }): void {
+    if (this.ws?.readyState !== WebSocket.OPEN) return;
+    if (this._binaryAudio) {
+      this.ws.send(pcm);
+    } else {
+      this.send({ type: "audio_chunk", audio: pcmToBase64(pcm), ...meta });
+    }
+  }
+
   onMessage(listener: Listener): () => void {
     this.listeners.add(listener);
     return () => this.listeners.delete(listener);
@@ -0,0 +1,76 @@
+"""Split-mode enrichment: never left waiting, never ahead of first translations."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from backend.services import pipeline as pipeline_module
+from backend.services.pipeline import ConnectionPipeline
+from backend.services.scheduler import BACKGROUND, ROUTINE, ResourceScheduler, Scheduler
+from backend.services.session_store import create_session_store
+
+
+class FailingTranslator:
+    """Enrichment succeeds; the fast translation call fails."""
+
+    def __init__(self):
+        self.enriched = asyncio.Event()
+
+    async def enrich(self, text, source_lang, target_lang):
+        self.enriched.set()
+        return {"medical_terms": [], "flags": [], "urgency": "low"}
+
+    async def translate(self, *args, **kwargs):
+        await asyncio.sleep(0.05)
+        raise RuntimeError("NIM unavailable")
+
+    async def translate_stream(self, *args, **kwargs):
+        await asyncio.sleep(0.05)
+        raise RuntimeError("NIM unavailable")
+        yield
+
+
+@pytest.mark.asyncio
+async def test_enrichment_cancelled_when_translation_fails(monkeypatch):
+    monkeypatch.setattr(pipeline_module, "NIM_SPLIT_MODE", True)
+    translator = FailingTranslator()
+    pipeline = ConnectionPipeline(
+        None, None, translator, None, create_session_store(),
+        scheduler=Scheduler({"translate": 3}),
+    )
+    job = await pipeline._new_job(original="Me duele el pecho")
+
+    with pytest.raises(RuntimeError):
+        await pipeline._translate(job)
+    # The enrichment finished first and was waiting for a result that never comes
+    assert translator.enriched.is_set()
+    await asyncio.gather(job.enrichment, return_exceptions=True)
+
+    assert job.enrichment.cancelled()
+    assert pipeline._out_q.empty()
+
+
+@pytest.mark.asyncio
+async def test_background_waits_behind_routine():
+    scheduler = ResourceScheduler("translate", capacity=2, reserved=1)
+    order = []
+
+    async def use(priority, name):
+        async with scheduler.slot(priority):
+            order.append(name)
+            await asyncio.sleep(0.01)
+
+    await scheduler.acquire(ROUTINE)
+    tasks = [
+        asyncio.create_task(use(BACKGROUND, "enrichment")),
+        asyncio.create_task(use(ROUTINE, "translation")),
+    ]
+    await asyncio.sleep(0)
+    # Background shares the routine cap, so the reserved slot stays free
+    assert scheduler.in_flight == 1
+    scheduler.release(ROUTINE)
+    await asyncio.gather(*tasks)
+
+    assert order == ["translation", "enrichment"]
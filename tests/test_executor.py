@@ -0,0 +1,115 @@
+"""Blocking Riva calls run off the event loop, in parallel up to the limit."""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from backend.services import asr as asr_module
+from backend.services import tts as tts_module
+from backend.services.executor import ServiceExecutor
+
+DELAY = 0.5
+
+
+class SlowRivaASR:
+    """Stands in for ``riva.client.ASRService``: blocks like a gRPC call."""
+
+    def offline_recognize(self, audio_bytes, config):
+        time.sleep(DELAY)
+        alt = SimpleNamespace(transcript="where does it hurt", confidence=0.9)
+        return SimpleNamespace(results=[SimpleNamespace(alternatives=[alt])])
+
+
+class SlowRivaTTS:
+    """Stands in for ``riva.client.SpeechSynthesisService``."""
+
+    def synthesize(self, text, **params):
+        time.sleep(DELAY)
+        return SimpleNamespace(audio=b"\x00\x00" * 2205)
+
+
+@pytest.fixture
+def slow_riva(monkeypatch):
+    monkeypatch.setattr(asr_module, "MOCK_MODE", False)
+    monkeypatch.setattr(tts_module, "MOCK_MODE", False)
+    monkeypatch.setattr(asr_module, "recognition_config", lambda lang, rate: None)
+    monkeypatch.setattr(tts_module, "synthesis_params", lambda lang, rate: {})
+
+    asr = asr_module.RivaASR()
+    asr._services = itertools.cycle([SlowRivaASR()])
+    tts = tts_module.RivaTTS()
+    tts._services = itertools.cycle([SlowRivaTTS()])
+    yield asr, tts
+    asr.close()
+    tts.close()
+
+
+async def _ticks_during(coro) -> tuple[object, int]:
+    """Run ``coro`` while counting 10 ms event loop ticks."""
+    ticks = 0
+    done = False
+
+    async def ticker():
+        nonlocal ticks
+        while not done:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    try:
+        result = await coro
+    finally:
+        done = True
+        await task
+    return result, ticks
+
+
+@pytest.mark.asyncio
+async def test_two_sessions_recognize_in_parallel(slow_riva):
+    asr, _ = slow_riva
+    started = time.perf_counter()
+    results, ticks = await _ticks_during(asyncio.gather(
+        asr.recognize_pcm(b"\x00\x00" * 1600, language_code="en"),
+        asr.recognize_pcm(b"\x00\x00" * 1600, language_code="es"),
+    ))
+    elapsed = time.perf_counter() - started
+
+    assert [r["text"] for r in results] == ["where does it hurt"] * 2
+    assert elapsed < DELAY * 1.5
+    # The loop kept serving other sockets while Riva blocked
+    assert ticks >= DELAY / 0.01 / 2
+
+
+@pytest.mark.asyncio
+async def test_asr_and_tts_overlap(slow_riva):
+    asr, tts = slow_riva
+    started = time.perf_counter()
+    transcript, wav = await asyncio.gather(
+        asr.recognize_pcm(b"\x00\x00" * 1600),
+        tts.synthesize_wav("Where does it hurt?", "en"),
+    )
+    elapsed = time.perf_counter() - started
+
+    assert transcript["text"] == "where does it hurt"
+    assert wav.startswith(b"RIFF")
+    assert elapsed < DELAY * 1.5
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_queues_extra_calls():
+    executor = ServiceExecutor("test", max_concurrency=2)
+    try:
+        started = time.perf_counter()
+        await asyncio.gather(*(executor.run(time.sleep, DELAY / 2) for _ in range(3)))
+        elapsed = time.perf_counter() - started
+    finally:
+        executor.shutdown()
+
+    # Two run together, the third waits for a free slot
+    assert DELAY <= elapsed < DELAY * 1.5
+    assert executor.in_flight == 0 and executor.waiting == 0
@@ -0,0 +1,125 @@
+"""GPU telemetry sampler, against the fake backend and without NVML."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from backend.services import gpu_telemetry as telemetry_module
+from backend.services.gpu_telemetry import FakeGPUBackend, GPUTelemetry, select_backend
+
+
+class BrokenBackend:
+    name = "broken"
+
+    def read(self):
+        raise RuntimeError("NVML Shutdown")
+
+    def close(self):
+        pass
+
+
+async def _sampled(monitor: GPUTelemetry, samples: int = 3) -> None:
+    monitor.start()
+    try:
+        for _ in range(200):
+            if monitor.stats()["samples"] + monitor.stats()["errors"] >= samples:
+                return
+            await asyncio.sleep(0.01)
+        raise AssertionError("sampler made no progress")
+    finally:
+        await monitor.stop()
+
+
+@pytest.mark.asyncio
+async def test_fake_backend_snapshot():
+    monitor = GPUTelemetry(FakeGPUBackend(memory_total_mb=128 * 1024, seed=7), interval=0.01)
+    await _sampled(monitor)
+
+    latest = monitor.latest
+    snapshot = monitor.snapshot()
+    assert snapshot["available"] is True
+    assert snapshot["backend"] == "fake"
+    assert snapshot["usage_percent"] == latest.usage_percent
+    assert 0 <= snapshot["usage_percent"] <= 100
+    assert snapshot["memory_total_gb"] == 128.0
+    assert snapshot["memory_used_gb"] == round(latest.memory_used_mb / 1024, 1)
+    assert 0 < snapshot["memory_used_gb"] <= 128.0
+    assert snapshot["temperature_c"] == latest.temperature_c
+    assert snapshot["power_w"] == latest.power_w
+
+    history = monitor.history()
+    assert len(history) == monitor.stats()["samples"] >= 3
+    assert history[-1]["usage_percent"] == latest.usage_percent
+    assert monitor.stats()["errors"] == 0
+
+
+@pytest.mark.asyncio
+async def test_history_is_bounded():
+    monitor = GPUTelemetry(FakeGPUBackend(seed=1), interval=0.001, history=4)
+    for _ in range(10):
+        await monitor.sample()
+    assert len(monitor.history()) == 4
+
+
+def test_no_nvml_and_no_nvidia_smi(monkeypatch):
+    monkeypatch.setattr(telemetry_module, "NVML_AVAILABLE", False)
+    monkeypatch.setattr(telemetry_module.shutil, "which", lambda name: None)
+
+    assert select_backend("auto") is None
+    assert select_backend("nvml") is None
+    assert isinstance(select_backend("fake"), FakeGPUBackend)
+
+
+def test_nvml_init_failure_falls_back(monkeypatch):
+    class NoDriver:
+        def __init__(self):
+            raise RuntimeError("NVML Shared Library Not Found")
+
+    monkeypatch.setattr(telemetry_module, "NVML_AVAILABLE", True)
+    monkeypatch.setattr(telemetry_module, "NVMLBackend", NoDriver)
+    monkeypatch.setattr(telemetry_module.shutil, "which", lambda name: None)
+
+    assert select_backend("auto") is None
+
+
+@pytest.mark.asyncio
+async def test_without_backend_reports_unavailable():
+    monitor = GPUTelemetry(None)
+    monitor.start()
+    await monitor.stop()
+
+    snapshot = monitor.snapshot()
+    assert snapshot["available"] is False
+    assert snapshot["backend"] is None
+    assert monitor.stats()["samples"] == 0
+
+
+@pytest.mark.asyncio
+async def test_read_errors_are_counted_and_reported():
+    monitor = GPUTelemetry(BrokenBackend(), interval=0.01)
+    await _sampled(monitor)
+
+    snapshot = monitor.snapshot()
+    assert snapshot["available"] is False
+    assert snapshot["error"] == "NVML Shutdown"
+    assert monitor.stats()["errors"] >= 3
+
+
+@pytest.mark.asyncio
+async def test_health_and_gpu_endpoints(monkeypatch):
+    from backend import main
+
+    monitor = GPUTelemetry(FakeGPUBackend(seed=3), interval=0.01)
+    await monitor.sample()
+    monkeypatch.setattr(main, "gpu_telemetry", monitor)
+
+    health = await main.health()
+    assert health["gpu"]["available"] is True
+    assert health["gpu"]["usage_percent"] == monitor.latest.usage_percent
+
+    gpu = await main.gpu()
+    assert gpu["backend"] == "fake"
+    assert gpu["latest"] == health["gpu"] | {"age_s": gpu["latest"]["age_s"]}
+    assert len(gpu["history"]) == 1
@@ -0,0 +1,32 @@
+"""Local lexicon extraction of the common Spanish chief-complaint forms."""
+
+from __future__ import annotations
+
+import pytest
+
+from backend.services.medical_ner import extract_terms
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Me duele el pecho", {"Chest pain"}),
+        ("Me duele mucho el pecho desde anoche", {"Chest pain"}),
+        (
+            "Me duele mucho el pecho desde anoche y me cuesta respirar cuando camino",
+            {"Chest pain", "Shortness of breath"},
+        ),
+        ("Tengo dolor en el pecho y me falta el aire", {"Chest pain", "Shortness of breath"}),
+        ("Me caí de la escalera y me duele la pierna izquierda", {"Leg pain"}),
+        ("Me duelen los oídos", {"Ear pain"}),
+    ],
+)
+def test_spanish_pain_frames(text, expected):
+    terms = extract_terms(text, "es-US")
+    assert {t["term"] for t in terms} == expected
+    assert all(t["category"] == "symptom" for t in terms)
+
+
+def test_original_is_the_source_span():
+    (term,) = extract_terms("Me duele mucho el pecho desde anoche", "es-US")
+    assert term["original"] == "Me duele mucho el pecho"
@@ -0,0 +1,53 @@
+"""A phrasebook hit must mean what was typed; anything else goes to the LLM."""
+
+from __future__ import annotations
+
+import pytest
+
+from backend.services.phrasebook import Phrasebook, tokens
+
+
+@pytest.fixture(scope="module")
+def phrasebook():
+    return Phrasebook.load()
+
+
+@pytest.mark.parametrize(
+    "text, lang, phrase_id",
+    [
+        ("on a scale of 1 to 10 how bad is the pain", "en-US", "pain_scale"),
+        ("Please, are you allergic to any medications?", "en-US", "allergies"),
+        ("Por favor, ¿es alérgico a algún medicamento?", "es-US", "allergies"),
+        ("क्या आपको किसी दवा से एलर्जी है", "hi-IN", "allergies"),
+        ("您对什么药物过敏吗", "zh-CN", "allergies"),
+    ],
+)
+def test_close_match(phrasebook, text, lang, phrase_id):
+    assert phrasebook.match(text, lang).id == phrase_id
+
+
+@pytest.mark.parametrize(
+    "text, lang",
+    [
+        # Negations the phrase lacks
+        ("Are you not allergic to any medications?", "en-US"),
+        ("¿No es alérgico a algún medicamento?", "es-US"),
+        ("N'êtes-vous allergique à des médicaments ?", "fr-FR"),
+        ("क्या आपको किसी दवा से एलर्जी नहीं है?", "hi-IN"),
+        ("您对什么药物不过敏吗", "zh-CN"),
+        # Words the stored translation would drop
+        ("On a scale of 1 to 10, how bad is the chest pain?", "en-US"),
+    ],
+)
+def test_different_meaning_is_not_matched(phrasebook, text, lang):
+    assert phrasebook.match(text, lang) is None
+
+
+def test_every_phrase_matches_itself(phrasebook):
+    for phrase in (phrasebook.get(p["id"]) for p in phrasebook.for_pair("en-US", "es-US")):
+        for lang, text in phrase.text.items():
+            assert phrasebook.match(text, lang) is phrase
+
+
+def test_devanagari_words_stay_whole():
+    assert tokens("क्या आपको एलर्जी है?") == {"क्या", "आपको", "एलर्जी", "है"}
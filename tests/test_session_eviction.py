@@ -0,0 +1,120 @@
+"""Session eviction: idle timeout, ended-session TTL and the caps."""
+
+from __future__ import annotations
+
+import pytest
+
+from backend.services.session_manager import SessionManager, TranslationExchange
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def _exchange(text: str = "me duele el pecho") -> TranslationExchange:
+    return TranslationExchange(
+        speaker="patient",
+        original=text,
+        translation="my chest hurts",
+        medical_terms=[],
+        flags=[],
+        urgency="routine",
+    )
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def test_idle_session_is_ended_and_purged(clock):
+    manager = SessionManager(idle_timeout=60, ended_ttl=300, clock=clock)
+    idle = manager.create_session("es", "en")
+    busy = manager.create_session("es", "en")
+    manager.add_exchange(idle.session_id, _exchange())
+
+    clock.advance(45)
+    manager.add_exchange(busy.session_id, _exchange())
+    clock.advance(30)
+
+    assert manager.evict() == 1
+    assert not idle.active and idle.ended_at == clock.now
+    assert idle.exchanges == [] and idle.exchange_bytes == 0
+    assert busy.active and busy.exchange_count == 1
+    assert manager.memory_bytes == busy.exchange_bytes
+    assert manager.stats()["evicted"] == {"idle": 1}
+
+    # Still listed until the ended TTL runs out, then dropped
+    assert manager.get_session(idle.session_id) is idle
+    clock.advance(301)
+    manager.evict()
+    assert manager.get_session(idle.session_id) is None
+    assert manager.stats()["evicted"]["ended_ttl"] == 1
+
+
+def test_ended_session_dropped_after_ttl(clock):
+    manager = SessionManager(idle_timeout=3600, ended_ttl=300, clock=clock)
+    ended = manager.create_session("es", "en")
+    manager.add_exchange(ended.session_id, _exchange())
+    manager.end_session(ended.session_id)
+    assert manager.memory_bytes == 0
+
+    clock.advance(299)
+    assert manager.evict() == 0
+    assert manager.get_session(ended.session_id) is ended
+
+    clock.advance(2)
+    assert manager.evict() == 1
+    assert manager.get_session(ended.session_id) is None
+    assert manager.stats()["evicted"] == {"ended_ttl": 1}
+
+
+def test_session_cap_drops_oldest_ended_first(clock):
+    manager = SessionManager(idle_timeout=3600, ended_ttl=3600, max_sessions=3, clock=clock)
+    oldest = manager.create_session("es", "en")
+    clock.advance(1)
+    ended = manager.create_session("es", "en")
+    clock.advance(1)
+    newer = manager.create_session("es", "en")
+    manager.end_session(ended.session_id)
+
+    # At the cap: the ended session goes even though an older active one exists
+    clock.advance(1)
+    fresh = manager.create_session("es", "en")
+    assert manager.get_session(ended.session_id) is None
+    assert {s.session_id for s in (oldest, newer, fresh)} == {
+        s["session_id"] for s in manager.get_active_sessions()
+    }
+
+    # With only active sessions left, the least recently active one goes
+    clock.advance(1)
+    manager.add_exchange(oldest.session_id, _exchange())
+    clock.advance(1)
+    manager.create_session("es", "en")
+    assert manager.get_session(newer.session_id) is None
+    assert manager.get_session(oldest.session_id) is oldest
+    assert manager.get_session(fresh.session_id) is fresh
+    assert manager.stats()["evicted"] == {"max_sessions": 2}
+
+
+def test_memory_cap_drops_least_recently_active(clock):
+    manager = SessionManager(idle_timeout=3600, ended_ttl=3600, clock=clock)
+    first = manager.create_session("es", "en")
+    second = manager.create_session("es", "en")
+    manager.add_exchange(first.session_id, _exchange())
+    manager.add_exchange(second.session_id, _exchange("tengo fiebre"))
+    manager.max_memory_bytes = first.exchange_bytes + second.exchange_bytes - 1
+
+    # Dropping one is enough; the least recently active goes
+    assert manager.evict() == 1
+    assert manager.get_session(first.session_id) is None
+    assert manager.get_session(second.session_id) is second
+    assert manager.memory_bytes == second.exchange_bytes
+    assert manager.stats()["evicted"] == {"max_memory": 1}
@@ -0,0 +1,59 @@
+"""Shared session store: awaitable from the event loop, off the loop."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import shutil
+import threading
+
+import pytest
+
+from backend.serve import start_session_store
+from backend.services.session_manager import TranslationExchange
+from backend.services.session_store import AsyncSessionStore, SharedSessionStore
+
+
+@pytest.fixture
+def shared_store(monkeypatch):
+    for name in ("SESSION_STORE", "SESSION_STORE_SOCKET", "SESSION_STORE_AUTHKEY"):
+        monkeypatch.delenv(name, raising=False)
+    process, socket_dir = start_session_store()
+    try:
+        yield SharedSessionStore(
+            os.environ["SESSION_STORE_SOCKET"], os.environ["SESSION_STORE_AUTHKEY"].encode()
+        )
+    finally:
+        for name in ("SESSION_STORE", "SESSION_STORE_SOCKET", "SESSION_STORE_AUTHKEY"):
+            os.environ.pop(name, None)
+        process.terminate()
+        process.join(timeout=5)
+        shutil.rmtree(socket_dir, ignore_errors=True)
+
+
+@pytest.mark.asyncio
+async def test_shared_calls_run_off_the_event_loop(shared_store):
+    sessions = AsyncSessionStore(shared_store)
+    loop_thread = threading.get_ident()
+    callers = []
+    original = shared_store._proxy.add_exchange
+
+    def add_exchange(*args):
+        callers.append(threading.get_ident())
+        return original(*args)
+
+    shared_store._proxy.add_exchange = add_exchange
+
+    session = await sessions.create_session("es-US", "en-US")
+    indexes = await asyncio.gather(*(
+        sessions.add_exchange(
+            session.session_id,
+            TranslationExchange("patient", f"hola {i}", f"hi {i}", [], [], "low"),
+        )
+        for i in range(4)
+    ))
+
+    assert sorted(indexes) == [0, 1, 2, 3]
+    assert callers and loop_thread not in callers
+    speaker, recent = await sessions.turn_context(session.session_id)
+    assert speaker == "patient" and recent == ["low"] * 3
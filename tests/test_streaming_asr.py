@@ -0,0 +1,105 @@
+"""Streaming ASR: recovery after a failed stream, and speaker attribution."""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from backend.services import asr as asr_module
+from backend.services.pipeline import ConnectionPipeline
+from backend.services.session_manager import SessionManager
+
+PCM = b"\x00\x00" * 1600
+
+
+def _final(text: str):
+    alt = SimpleNamespace(transcript=text, confidence=0.9, words=[])
+    return SimpleNamespace(results=[SimpleNamespace(alternatives=[alt], is_final=True)])
+
+
+class FakeStreamingRiva:
+    """``streaming_response_generator`` of ``riva.client.ASRService``.
+
+    The first ``fail`` streams raise; later ones send one final when their
+    audio ends, after ``release`` is set.
+    """
+
+    def __init__(self, fail: int = 0):
+        self.fail = fail
+        self.opened = 0
+        self.release = threading.Event()
+        self.release.set()
+
+    def streaming_response_generator(self, audio_chunks, streaming_config):
+        self.opened += 1
+        if self.opened <= self.fail:
+            raise RuntimeError("stream reset by Riva")
+        for _ in audio_chunks:
+            pass
+        self.release.wait(5)
+        yield _final("me duele el pecho")
+
+
+@pytest.fixture
+def streaming_pipeline(monkeypatch):
+    monkeypatch.setattr(asr_module, "MOCK_MODE", False)
+    monkeypatch.setattr(asr_module, "streaming_config", lambda lang, rate: None)
+
+    def make(riva: FakeStreamingRiva, sessions: SessionManager | None = None):
+        asr = asr_module.RivaASR()
+        asr._services = itertools.cycle([riva])
+        pipeline = ConnectionPipeline(None, asr, None, None, sessions or SessionManager())
+        pipeline.asr_streaming = True
+        return pipeline
+    return make
+
+
+async def _next_message(pipeline: ConnectionPipeline, msg_type: str) -> dict:
+    while True:
+        message = await asyncio.wait_for(pipeline._out_q.get(), 2)
+        if isinstance(message, dict) and message["type"] == msg_type:
+            return message
+
+
+@pytest.mark.asyncio
+async def test_audio_after_stream_failure_is_recognized(streaming_pipeline):
+    riva = FakeStreamingRiva(fail=1)
+    pipeline = streaming_pipeline(riva)
+
+    await pipeline._handle_audio(PCM)
+    error = await _next_message(pipeline, "error")
+    assert error["stage"] == "asr"
+
+    await pipeline._handle_audio(PCM)
+    await pipeline._close_stream()
+    job = await asyncio.wait_for(pipeline._asr_q.get(), 2)
+
+    assert riva.opened == 2
+    assert job.original == "me duele el pecho"
+    await pipeline._shutdown()
+
+
+@pytest.mark.asyncio
+async def test_trailing_final_keeps_the_previous_speaker(streaming_pipeline):
+    sessions = SessionManager()
+    session = sessions.create_session("es-US", "en-US")
+    riva = FakeStreamingRiva()
+    riva.release.clear()
+    pipeline = streaming_pipeline(riva, sessions)
+    pipeline.session_id = session.session_id
+
+    await pipeline._handle_audio(PCM)
+    await pipeline._handle_switch_speaker()
+    assert (await _next_message(pipeline, "speaker_switched"))["current_speaker"] == "provider"
+
+    # The patient's final arrives after the switch
+    riva.release.set()
+    job = await asyncio.wait_for(pipeline._asr_q.get(), 2)
+
+    assert job.original == "me duele el pecho"
+    assert job.speaker == "patient"
+    await pipeline._shutdown()
@@ -0,0 +1,68 @@
+"""Streamed TTS holds the shared TTS slot only while Riva synthesizes."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from backend.services.pipeline import ConnectionPipeline
+from backend.services.scheduler import Scheduler
+from backend.services.session_store import create_session_store
+
+
+class FakeTTS:
+    def __init__(self, cached: bool = False):
+        self.cached = cached
+        self.done = asyncio.Event()
+
+    def is_cached(self, text, language_code=None, sample_rate=None):
+        return self.cached
+
+    async def synthesize_online(self, text, language_code=None, sample_rate=None):
+        for _ in range(10):
+            await asyncio.sleep(0)
+            yield b"\x00\x00" * 320
+        self.done.set()
+
+
+def _pipeline(tts: FakeTTS, scheduler: Scheduler) -> ConnectionPipeline:
+    # queue_size=1: the out queue holds 4 messages and nothing drains it,
+    # like a client on a stalled link
+    return ConnectionPipeline(
+        None, None, None, tts, create_session_store(), scheduler=scheduler, queue_size=1
+    )
+
+
+@pytest.mark.asyncio
+async def test_slow_client_does_not_hold_the_tts_slot():
+    tts = FakeTTS()
+    scheduler = Scheduler({"tts": 1})
+    pipeline = _pipeline(tts, scheduler)
+    pipeline.streaming_audio = True
+    job = await pipeline._new_job()
+
+    stream = asyncio.create_task(pipeline._stream_audio({"type": "audio_segment"}, job, "Hola"))
+    await asyncio.wait_for(tts.done.wait(), 1)
+    await asyncio.sleep(0)
+
+    # Synthesis finished and released the slot; sending is still blocked
+    assert not stream.done()
+    assert scheduler.stats()["tts"]["in_flight"] == 0
+    async with scheduler.slot("tts", "routine"):
+        pass
+
+    stream.cancel()
+    await asyncio.gather(stream, return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_cache_hit_takes_no_slot():
+    scheduler = Scheduler({"tts": 1})
+    pipeline = _pipeline(FakeTTS(cached=True), scheduler)
+    job = await pipeline._new_job()
+
+    async with scheduler.slot("tts", "critical"):
+        # Every slot is taken, yet the cached clip is not held up
+        async with pipeline._tts_slot(job, "Hola", 22050):
+            pass
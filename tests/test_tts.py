@@ -0,0 +1,31 @@
+"""TTS fallbacks keep the sample rate the client negotiated."""
+
+from __future__ import annotations
+
+import io
+import itertools
+import wave
+
+import pytest
+
+from backend.services import tts as tts_module
+
+
+class FailingRivaTTS:
+    def synthesize(self, text, **params):
+        raise RuntimeError("Riva TTS unavailable")
+
+
+@pytest.mark.asyncio
+async def test_error_fallback_uses_requested_rate(monkeypatch):
+    monkeypatch.setattr(tts_module, "MOCK_MODE", False)
+    monkeypatch.setattr(tts_module, "synthesis_params", lambda lang, rate: {})
+    tts = tts_module.RivaTTS()
+    tts._services = itertools.cycle([FailingRivaTTS()])
+    try:
+        wav = await tts.synthesize_wav("Where does it hurt?", "en-US", sample_rate=8000)
+    finally:
+        tts.close()
+
+    with wave.open(io.BytesIO(wav), "rb") as wf:
+        assert wf.getframerate() == 8000